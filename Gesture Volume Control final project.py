@@ -1,11 +1,21 @@
 import cv2
-import mediapipe as mp
-import pyautogui
 import streamlit as st
-import numpy as np
+import os
 import time
-import plotly.graph_objects as go
-import pandas as pd
+from contextlib import closing
+from gesture_core.charts import distance_chart
+from gesture_core.classifier import app_classifier
+from gesture_core.features import INDEX_TIP, THUMB_TIP, hand_features
+from gesture_core.history import HistoryBuffer
+from gesture_core.metrics import MetricsRegistry
+from gesture_core.overlay import MetricsOverlay
+from gesture_core.pipeline import GesturePipeline, build_hands, register_metrics
+from gesture_core.profiles import AdaptiveCaptureController, format_event
+from gesture_core.recorder import SessionRecorder
+from gesture_core.render import RenderScheduler
+from gesture_core.sources import open_source
+from gesture_core.tracking import DualHandControl
+from gesture_core.volume import KeyStepBackend, VolumeActuator
 
 # ============ STREAMLIT CONFIG ============
 st.set_page_config(page_title="Gesture Volume Control", layout="wide", initial_sidebar_state="collapsed")
@@ -48,123 +58,74 @@ h1, h2, h3 { color: #667eea !important; text-shadow: 0 0 10px rgba(102, 126, 234
 
 # ============ SESSION STATE ============
 for key, default in {
-    "logged_in": False, "username": "", "cap": None,
-    "running": False, "paused": False, "last_volume_action": 0.0,
-    "distance_history": [], "volume_history": [],
+    "logged_in": False, "username": "", "cap": None, "capture_profiles": None,
+    "running": False, "paused": False, "key_actuator": None,
+    "history": None, "history_seconds": 60,
+    "video_hz": 15, "metrics_hz": 5, "chart_hz": 2,
     "total_gestures": 0, "min_dist": 25, "max_dist": 160,
-    "detection_conf": 0.6, "tracking_conf": 0.5,
+    "detection_conf": 0.6, "tracking_conf": 0.5, "roi_tracking": False, "two_hands": False,
+    "record_session": False, "recorder": None,
     "current_dist": 0, "current_vol": 0, "current_fps": 0
 }.items():
     if key not in st.session_state:
         st.session_state[key] = default
 
+if st.session_state.history is None:
+    # preallocated distance/volume ring, sized for history_seconds at 30 FPS
+    st.session_state.history = HistoryBuffer.for_duration(st.session_state.history_seconds, fps=30)
+
+if "classifier" not in st.session_state:
+    # the original 80/40 px rule until GESTURE_TEMPLATES names a file saved by `python -m gesture_core.classifier`
+    st.session_state.classifier = app_classifier(os.environ.get("GESTURE_TEMPLATES"), rule="thresholds")
+
+GESTURE_LABELS = {"open": "🖐 Open", "closed": "✊ Closed", "pinched": "🤏 Pinched"}
+
+# p90 camera-loop time (read to last widget update) the capture profile ladder aims for
+CAPTURE_TARGET_MS = 50
+
+if "overlay" not in st.session_state:
+    st.session_state.overlay = MetricsOverlay()
+
 
 # ============ UTILITY FUNCTIONS ============
-def get_hand_state(hand_landmarks, img_shape):
-    """Detect hand gesture: Open, Closed, or Pinched"""
-    h, w, _ = img_shape
-    thumb = hand_landmarks.landmark[4]
-    index = hand_landmarks.landmark[8]
-    middle = hand_landmarks.landmark[12]
-
-    thumb_index_dist = np.hypot(index.x - thumb.x, index.y - thumb.y) * w
-    thumb_middle_dist = np.hypot(middle.x - thumb.x, middle.y - thumb.y) * w
-
-    if thumb_index_dist > 80 and thumb_middle_dist > 80:
-        return "🖐 Open"
-    elif thumb_index_dist < 40:
-        return "🤏 Pinched"
-    else:
-        return "✊ Closed"
+def get_hand_state(features, img_shape):
+    """Detect hand gesture: Open, Closed, or Pinched (pixel thresholds, or template match with GESTURE_TEMPLATES)"""
+    gesture = st.session_state.classifier.classify_one(features.points, img_shape)
+    return GESTURE_LABELS.get(gesture, gesture.title())
 
 
 def open_camera():
-    """Initialize camera capture"""
-    cap = cv2.VideoCapture(0)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    """Initialize camera capture; resolution / FPS follow the adaptive profile ladder"""
+    cap = open_source()
     if cap.isOpened():
         st.session_state.cap = cap
+        st.session_state.capture_profiles = AdaptiveCaptureController(
+            cap, target_ms=CAPTURE_TARGET_MS, on_change=lambda event: print(format_event(event)))
         return True
     return False
 
 
-def send_volume_action(dist, min_dist, max_dist):
-    """Send volume control commands based on distance"""
-    now = time.time()
-    if dist < min_dist:
-        action = "volumedown"
-    elif dist > max_dist:
-        action = "volumeup"
-    else:
-        return
+def get_key_actuator():
+    """Volume key worker; it tracks the estimated level and presses keys on its own thread"""
+    if st.session_state.key_actuator is None:
+        st.session_state.key_actuator = VolumeActuator(KeyStepBackend(step=2.0), min_change=2.0).start()
+    return st.session_state.key_actuator
 
-    if (now - st.session_state.last_volume_action) > 0.12:
-        try:
-            pyautogui.press(action)
-            st.session_state.total_gestures += 1
-        except:
-            pass
-        st.session_state.last_volume_action = now
+
+def stop_key_actuator():
+    if st.session_state.key_actuator is not None:
+        st.session_state.key_actuator.stop()
+        st.session_state.key_actuator = None
 
 
 def draw_overlay(frame, dist, pct, fps, gesture):
-    """Draw metrics overlay on video frame"""
-    h, w, _ = frame.shape
-    overlay = frame.copy()
-    cv2.rectangle(overlay, (10, 10), (260, 150), (0, 0, 0), -1)
-    frame = cv2.addWeighted(overlay, 0.7, frame, 0.3, 0)
-
-    cv2.putText(frame, f"Distance: {dist}px", (20, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (102, 126, 234), 2)
-    cv2.putText(frame, f"Volume: {int(pct)}%", (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (240, 147, 251), 2)
-    cv2.putText(frame, f"FPS: {int(fps)}", (20, 85), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (56, 239, 125), 2)
-    cv2.putText(frame, f"Gesture: {gesture}", (20, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 199, 0), 2)
-
-    # Draw volume bar on right side
-    bar_width, bar_height = 30, h - 80
-    bar_x, bar_y = w - 45, 80
-    cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), (50, 50, 50), -1)
-    fill_height = int((pct / 100) * bar_height)
-    cv2.rectangle(frame, (bar_x, bar_y + bar_height - fill_height), (bar_x + bar_width, bar_y + bar_height),
-                  (102, 126, 234), -1)
-    cv2.putText(frame, f"{int(pct)}%", (bar_x + 35, bar_y + bar_height - fill_height + 10), cv2.FONT_HERSHEY_SIMPLEX,
-                0.5, (255, 255, 255), 2)
-
-    return frame
+    """Draw metrics overlay on video frame (in place, only inside the panel and bar regions)"""
+    return st.session_state.overlay.draw(frame, dist, pct, fps, gesture)
 
 
 def create_combined_chart():
     """Create analytics chart"""
-    if not st.session_state.distance_history and not st.session_state.volume_history:
-        return None
-
-    fig = go.Figure()
-
-    if st.session_state.distance_history:
-        fig.add_trace(go.Scatter(
-            x=list(range(len(st.session_state.distance_history))),
-            y=st.session_state.distance_history,
-            mode='lines',
-            name='Distance',
-            line=dict(color='#667eea', width=2),
-            fill='tozeroy',
-            fillcolor='rgba(102, 126, 234, 0.2)'
-        ))
-        fig.add_hline(y=st.session_state.min_dist, line_dash="dash", line_color="#f093fb", annotation_text="Min")
-        fig.add_hline(y=st.session_state.max_dist, line_dash="dash", line_color="#38ef7d", annotation_text="Max")
-
-    fig.update_layout(
-        title='Live Distance Monitor',
-        xaxis_title='Time',
-        yaxis_title='Distance (px)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#ffffff'),
-        height=300,
-        margin=dict(l=0, r=0, t=30, b=0)
-    )
-
-    return fig
+    return distance_chart(st.session_state.history, st.session_state.min_dist, st.session_state.max_dist)
 
 
 def do_login(username, password):
@@ -177,6 +138,22 @@ def do_login(username, password):
     return False
 
 
+def start_recording():
+    """Open a landmark recording for this session (sessions/<user>-<time>.gvcrec)"""
+    if st.session_state.recorder is None:
+        os.makedirs("sessions", exist_ok=True)
+        name = f"{st.session_state.username}-{time.strftime('%Y%m%d-%H%M%S')}.gvcrec"
+        st.session_state.recorder = SessionRecorder(os.path.join("sessions", name))
+    return st.session_state.recorder
+
+
+def stop_recording():
+    """Flush and close the landmark recording"""
+    if st.session_state.recorder is not None:
+        st.session_state.recorder.close()
+        st.session_state.recorder = None
+
+
 def do_logout():
     """Logout and cleanup"""
     st.session_state.logged_in = False
@@ -185,6 +162,8 @@ def do_logout():
     if st.session_state.cap:
         st.session_state.cap.release()
     st.session_state.cap = None
+    stop_recording()
+    stop_key_actuator()
 
 
 # ============ LOGIN PAGE ============
@@ -243,8 +222,8 @@ with col3:
         if st.session_state.cap:
             st.session_state.cap.release()
         st.session_state.cap = None
-        st.session_state.distance_history = []
-        st.session_state.volume_history = []
+        st.session_state.history.clear()
+        stop_recording()
         st.rerun()
 
 with col4:
@@ -313,77 +292,139 @@ with st.expander("⚙ Advanced Settings", expanded=False):
         st.markdown("📏 Distance Calibration**")
         min_dist = st.number_input("Min Distance (px)", 10, 100, int(st.session_state.min_dist))
         max_dist = st.number_input("Max Distance (px)", 100, 300, int(st.session_state.max_dist))
+        history_seconds = st.number_input("History Window (s)", 5, 600, int(st.session_state.history_seconds))
         if st.button("Apply Calibration"):
             st.session_state.min_dist = min_dist
             st.session_state.max_dist = max_dist
+            if history_seconds != st.session_state.history_seconds:
+                st.session_state.history_seconds = history_seconds
+                st.session_state.history = HistoryBuffer.for_duration(history_seconds, fps=30)
             st.success("✓ Calibration updated!")
 
     with col_s2:
         st.markdown("🎯 Detection Settings**")
         det_conf = st.slider("Detection Confidence", 0.5, 0.9, float(st.session_state.detection_conf), 0.05)
         track_conf = st.slider("Tracking Confidence", 0.4, 0.8, float(st.session_state.tracking_conf), 0.05)
+        roi_tracking = st.checkbox("ROI Tracking (crop around the hand)", value=st.session_state.roi_tracking,
+                                   help="Off by default: crops redo palm detection; enable only if "
+                                        "replay_bench --roi-compare shows a speed-up on this machine")
+        two_hands = st.checkbox("Two Hands (left: volume, right: pinch to mute)", value=st.session_state.two_hands)
+        record_session = st.checkbox("Record Session (landmarks to sessions/)", value=st.session_state.record_session)
+        video_hz = st.slider("Video Refresh (Hz)", 1, 30, int(st.session_state.video_hz))
+        metrics_hz = st.slider("Metrics Refresh (Hz)", 1, 15, int(st.session_state.metrics_hz))
+        chart_hz = st.slider("Chart Refresh (Hz)", 1, 10, int(st.session_state.chart_hz))
         if st.button("Apply Settings"):
             st.session_state.detection_conf = det_conf
             st.session_state.tracking_conf = track_conf
+            st.session_state.roi_tracking = roi_tracking
+            st.session_state.two_hands = two_hands
+            st.session_state.record_session = record_session
+            if not record_session:
+                stop_recording()
+            st.session_state.video_hz = video_hz
+            st.session_state.metrics_hz = metrics_hz
+            st.session_state.chart_hz = chart_hz
             st.success("✓ Settings updated!")
 
 # ============ CAMERA LOOP ============
+METRICS_SNAPSHOT = os.environ.get("GESTURE_METRICS_SNAPSHOT", "metrics_snapshot.json")
+import mediapipe as mp  # imported here so the login page renders without it
 mp_hands = mp.solutions.hands
 mp_draw = mp.solutions.drawing_utils
 
 if st.session_state.running and st.session_state.cap and not st.session_state.paused:
     cap = st.session_state.cap
-    with mp_hands.Hands(max_num_hands=1, min_detection_confidence=st.session_state.detection_conf,
-                        min_tracking_confidence=st.session_state.tracking_conf) as hands:
+    two_hands = st.session_state.two_hands
+    # the ROI crop follows a single hand, so it is off in two-hand mode
+    roi_tracking = st.session_state.roi_tracking and not two_hands
+    # crops go to the tracker's own static-image Hands, full frames to Hands; closing the detector closes both
+    detector = build_hands(max_num_hands=2 if two_hands else 1, min_detection_confidence=st.session_state.detection_conf,
+                           min_tracking_confidence=st.session_state.tracking_conf, roi=roi_tracking)
+    with closing(detector):
+        # stable per-hand ids, so each hand keeps its control when MediaPipe reorders them
+        dual_control = DualHandControl(min_dist=st.session_state.min_dist,
+                                       max_dist=st.session_state.max_dist) if two_hands else None
+        # read, detect and hand the volume to the key worker; raw landmarks (no smoothing), the key
+        # actuator's 2% step is the only dead band. The camera outlives this run, so no pipeline.close()
+        pipeline = GesturePipeline(cap, detector, get_key_actuator(), st.session_state.min_dist,
+                                   st.session_state.max_dist, smoothing=False, dual_control=dual_control, live=True)
+        recorder = start_recording() if st.session_state.record_session else None
         prev_time, fps = time.time(), 0.0
+        # inference runs every frame; each widget refreshes at its own rate, only on change
+        render = RenderScheduler(default_hz=st.session_state.metrics_hz,
+                                 video=st.session_state.video_hz, chart=st.session_state.chart_hz)
+
+        # same metrics as the Flask /metrics route, written to METRICS_SNAPSHOT every 5 s
+        metrics = MetricsRegistry()
+        pipeline.attach(register_metrics(pipeline, metrics))
+        ui_hist = metrics.histogram("video_render_ms", "Streamlit video refresh time")
+        metrics.counter("volume_writes_total", "Volume key presses sent",
+                        fn=lambda: st.session_state.total_gestures)
+        metrics.counter("mute_toggles_total", "Pinch-to-mute toggles in two-hand mode",
+                        fn=lambda: dual_control.toggles if dual_control else 0)
+        capture_profiles = st.session_state.capture_profiles
+        metrics.gauge("capture_profile_rung", "Current step on the capture ladder (0 = highest resolution)",
+                      fn=lambda: capture_profiles.index if capture_profiles else 0)
 
         while st.session_state.running and not st.session_state.paused:
-            ok, frame = cap.read()
-            if not ok:
+            loop_start = time.perf_counter()
+            result = pipeline.step()
+            if result is None:
                 video_placeholder.markdown("<div class='metric-card'>⚠ Waiting for camera feed...</div>",
                                            unsafe_allow_html=True)
                 time.sleep(0.1)
                 continue
+            # keys sent for gestures; the ~75 presses of the actuator's start-up sync are not counted
+            st.session_state.total_gestures = pipeline.actuator.backend.gesture_presses
 
-            frame = cv2.flip(frame, 1)
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = hands.process(rgb)
-
+            frame, results = result.frame, result.results
             dist, pct, hand_state = 0, 0, "—"
-
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS,
-                                           mp_draw.DrawingSpec(color=(102, 126, 234), thickness=2, circle_radius=1),
-                                           mp_draw.DrawingSpec(color=(240, 147, 251), thickness=2))
-
-                    thumb = hand_landmarks.landmark[4]
-                    index = hand_landmarks.landmark[8]
-                    h, w, _ = frame.shape
-                    tx, ty = int(thumb.x * w), int(thumb.y * h)
-                    ix, iy = int(index.x * w), int(index.y * h)
-
-                    cv2.line(frame, (tx, ty), (ix, iy), (102, 126, 234), 3)
-                    cv2.circle(frame, (tx, ty), 8, (240, 147, 251), -1)
-                    cv2.circle(frame, (ix, iy), 8, (56, 239, 125), -1)
-
-                    dist = int(np.hypot(ix - tx, iy - ty))
-                    pct = np.clip((dist - st.session_state.min_dist) / (
-                                st.session_state.max_dist - st.session_state.min_dist) * 100, 0, 100)
-
-                    send_volume_action(dist, st.session_state.min_dist, st.session_state.max_dist)
-                    hand_state = get_hand_state(hand_landmarks, frame.shape)
-
-                    cv2.putText(frame, f"{dist}px", (min(tx, ix) + 10, min(ty, iy) - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7,
-                                (255, 255, 255), 2)
-
-            st.session_state.distance_history.append(dist)
-            st.session_state.volume_history.append(pct)
-            if len(st.session_state.distance_history) > 100:
-                st.session_state.distance_history.pop(0)
-                st.session_state.volume_history.pop(0)
-
-            frame = draw_overlay(frame, dist, pct, fps, hand_state)
+            points, handedness = None, None
+
+            volume_landmarks = volume_handedness = None
+            if result.hands is not None:
+                # only the volume hand gets the full drawing below; the others are drawn with their role
+                control = result.control
+                for hand in result.hands:
+                    role = control["roles"][hand.id]
+                    if role == "volume":
+                        # the track's label, which stays put when MediaPipe reorders the hands
+                        volume_landmarks, volume_handedness = hand.landmarks, hand.handedness
+                        continue
+                    mp_draw.draw_landmarks(frame, hand.landmarks, mp_hands.HAND_CONNECTIONS)
+                    wx, wy = hand_features(hand.landmarks, frame.shape).xy(0)
+                    label = "muted" if role == "mute" and control["muted"] else role or "no control"
+                    cv2.putText(frame, f"#{hand.id} {label}", (wx - 30, wy + 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
+                                (240, 147, 251), 2)
+            elif results.multi_hand_landmarks:
+                volume_landmarks = results.multi_hand_landmarks[0]
+                if results.multi_handedness:
+                    volume_handedness = results.multi_handedness[0].classification[0].label
+
+            if result.features is not None:
+                mp_draw.draw_landmarks(frame, volume_landmarks, mp_hands.HAND_CONNECTIONS,
+                                       mp_draw.DrawingSpec(color=(102, 126, 234), thickness=2, circle_radius=1),
+                                       mp_draw.DrawingSpec(color=(240, 147, 251), thickness=2))
+
+                features = result.features
+                tx, ty = features.xy(THUMB_TIP)
+                ix, iy = features.xy(INDEX_TIP)
+
+                cv2.line(frame, (tx, ty), (ix, iy), (102, 126, 234), 3)
+                cv2.circle(frame, (tx, ty), 8, (240, 147, 251), -1)
+                cv2.circle(frame, (ix, iy), 8, (56, 239, 125), -1)
+
+                # GesturePipeline measured the pinch (640-wide pixels) and requested the volume
+                dist, pct = result.distance, result.percent
+                hand_state = get_hand_state(features, frame.shape)
+                points, handedness = features.points, volume_handedness
+
+                cv2.putText(frame, f"{dist}px", (min(tx, ix) + 10, min(ty, iy) - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7,
+                            (255, 255, 255), 2)
+
+            st.session_state.history.append(dist, pct)
+            if recorder is not None:
+                recorder.append(points, dist, pct, handedness)
 
             now = time.time()
             fps = 0.9 * fps + 0.1 * (1 / (now - prev_time)) if (now - prev_time) > 0 else fps
@@ -393,41 +434,53 @@ if st.session_state.running and st.session_state.cap and not st.session_state.pa
             st.session_state.current_vol = pct
             st.session_state.current_fps = fps
 
-            video_placeholder.image(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), use_container_width=True)
+            # the overlay is only drawn on frames that will actually be shown
+            if render.due("video"):
+                frame = draw_overlay(frame, dist, pct, fps, hand_state)
+                with ui_hist.time():
+                    render.update("video", None, lambda: video_placeholder.image(
+                        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), use_container_width=True))
 
-            distance_metric.markdown(
+            render.update("distance", dist, lambda: distance_metric.markdown(
                 f"<div class='metric-card'><div class='metric-label'>Distance</div><div class='metric-value'>{dist}</div></div>",
-                unsafe_allow_html=True)
-            volume_metric.markdown(
+                unsafe_allow_html=True))
+            render.update("volume", int(pct), lambda: volume_metric.markdown(
                 f"<div class='metric-card'><div class='metric-label'>Volume</div><div class='metric-value'>{int(pct)}%</div></div>",
-                unsafe_allow_html=True)
-            fps_metric.markdown(
-                f"<div class='metric-card'><div class='metric-label'>FPS</div><div class='metric-value'>{int(fps)}</div></div>",
-                unsafe_allow_html=True)
-            gestures_metric.markdown(
+                unsafe_allow_html=True))
+            render.update("fps", (int(fps), int(render.rate("video"))), lambda: fps_metric.markdown(
+                f"<div class='metric-card'><div class='metric-label'>FPS (Inference / UI)</div><div class='metric-value'>{int(fps)} / {int(render.rate('video'))}</div></div>",
+                unsafe_allow_html=True))
+            render.update("gestures", st.session_state.total_gestures, lambda: gestures_metric.markdown(
                 f"<div class='metric-card'><div class='metric-label'>Gestures</div><div class='metric-value'>{st.session_state.total_gestures}</div></div>",
-                unsafe_allow_html=True)
+                unsafe_allow_html=True))
 
-            gesture_box.markdown(f"""
+            render.update("gesture_box", hand_state, lambda: gesture_box.markdown(f"""
             <div style='text-align: center; padding: 15px;'>
                 <div class="gesture-badge {'gesture-active' if hand_state == '🖐 Open' else 'gesture-inactive'}">🖐 Open</div>
                 <div class="gesture-badge {'gesture-active' if hand_state == '✊ Closed' else 'gesture-inactive'}">✊ Closed</div>
                 <div class="gesture-badge {'gesture-active' if hand_state == '🤏 Pinched' else 'gesture-inactive'}">🤏 Pinched</div>
             </div>
-            """, unsafe_allow_html=True)
+            """, unsafe_allow_html=True))
 
-            volume_vis.markdown(f"""
+            render.update("volume_bar", int(pct), lambda: volume_vis.markdown(f"""
             <div style='padding: 10px;'>
                 <div class='progress-bar-container'>
                     <div class='progress-bar-fill' style='width: {pct}%;'></div>
                 </div>
                 <div style='text-align: center; margin-top: 10px; font-size: 1.5rem; font-weight: 800; color: #f093fb;'>{int(pct)}%</div>
             </div>
-            """, unsafe_allow_html=True)
-
-            chart = create_combined_chart()
-            if chart:
-                chart_placeholder.plotly_chart(chart, use_container_width=True, config={'displayModeBar': False})
+            """, unsafe_allow_html=True))
+
+            if render.due("chart"):
+                chart = create_combined_chart()
+                if chart:
+                    render.update("chart", None, lambda: chart_placeholder.plotly_chart(
+                        chart, use_container_width=True, config={'displayModeBar': False}))
+
+            if capture_profiles is not None:
+                # frame work plus widget updates; the camera read itself is not counted
+                capture_profiles.observe((time.perf_counter() - loop_start) * 1000 - result.read_ms)
+            metrics.maybe_write_snapshot(METRICS_SNAPSHOT, interval=5.0)
 
 elif st.session_state.paused:
     video_placeholder.markdown(
@@ -0,0 +1 @@
+"""Camera-less benchmarks; run them from the repository root with python -m."""
@@ -0,0 +1,95 @@
+"""Accuracy and batch throughput of the gesture classifier.
+
+    python -m benchmarks.classifier_bench --frames 200000 --out classifier.json
+    python -m benchmarks.classifier_bench open=sessions/open2.gvcrec pinched=sessions/pinch2.gvcrec
+
+Without recordings the test set comes from gesture_core.synthetic, with a
+different seed and more jitter than the default templates. That is a
+synthetic self-consistency check: templates and test hands come from the
+same generator, so the score says the matchers work, not how well real
+hands are recognized. For that, pass label=path recorder sessions
+(gesture_core.recorder) of each gesture. Every hand frame becomes a test
+hand with that label. Use sessions that are not in --templates, or the
+score is inflated the same way. The two old get_hand_state() heuristics
+(pixel thresholds and finger counting, still the apps' default without
+GESTURE_TEMPLATES) are scored on the same hands for comparison. Recorded landmarks are taken as from a 640x480 frame.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from gesture_core.classifier import HeuristicClassifier, default_classifier
+from gesture_core.recorder import open_session
+from gesture_core.synthetic import GESTURES, synthetic_hands
+
+IMG_SHAPE = (480, 640)
+
+
+def score(name, classify, points, labels):
+    start = time.perf_counter()
+    predicted = classify(points)
+    elapsed = time.perf_counter() - start
+    per_class = {g: round(float((predicted[labels == i] == i).mean()), 4) for i, g in enumerate(GESTURES)}
+    return {
+        "name": name,
+        "accuracy": round(float((predicted == labels).mean()), 4),
+        "per_class": per_class,
+        "frames_per_s": round(len(points) / elapsed),
+    }
+
+
+def recorded_hands(items):
+    """(points, label ids) from label=path recorder sessions."""
+    points, labels = [], []
+    for item in items:
+        label, sep, path = item.partition("=")
+        if not sep or label not in GESTURES:
+            raise SystemExit(f"expected label=path with label one of {', '.join(GESTURES)}, got {item!r}")
+        records = open_session(path)
+        hands = np.asarray(records["landmarks"][records["hand"]])
+        points.append(hands)
+        labels.append(np.full(len(hands), GESTURES.index(label)))
+    return np.concatenate(points), np.concatenate(labels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recordings", nargs="*", help="label=path recorder sessions to test on instead of synthetic hands")
+    parser.add_argument("--frames", type=int, default=100000, help="synthetic test hands to classify")
+    parser.add_argument("--noise", type=float, default=0.08, help="landmark jitter of the test hands (palm units)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--templates", help="template .npz to use instead of the synthetic defaults")
+    parser.add_argument("--out", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    if args.recordings:
+        points, labels = recorded_hands(args.recordings)
+        test_set = f"{len(points)} recorded hands from {len(args.recordings)} session(s)"
+    else:
+        points, labels = synthetic_hands(args.frames, seed=args.seed, noise=args.noise, img_shape=IMG_SHAPE)
+        test_set = (f"{args.frames} synthetic hands, noise {args.noise} "
+                    "(self-consistency check: same generator as the default templates)")
+    results = [
+        score("threshold (80/40 px)", HeuristicClassifier("thresholds", IMG_SHAPE).classify, points, labels),
+        score("finger count", HeuristicClassifier("fingers", IMG_SHAPE).classify, points, labels),
+    ]
+    for method in ("centroid", "knn"):
+        clf = default_classifier(method, templates=args.templates)
+        results.append(score(f"{method} ({len(clf)} templates)", clf.classify, points, labels))
+
+    print(test_set)
+    print(f"{'method':28}{'accuracy':>10}{'frames/s':>12}  per class")
+    for r in results:
+        classes = " ".join(f"{g}={v:.3f}" for g, v in r["per_class"].items())
+        print(f"{r['name']:28}{r['accuracy']:>10.4f}{r['frames_per_s']:>12}  {classes}")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"test_set": test_set, "recordings": args.recordings, "frames": int(len(points)),
+                       "noise": None if args.recordings else args.noise, "results": results}, f, indent=2)
+        print(f"saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Camera-loop stall caused by volume key presses: inline pyautogui vs the actuator thread.
+
+    python -m benchmarks.keystroke_bench --frames 300 --pause 0.1
+
+Simulates a 30 FPS loop following a hand that sweeps the volume up and
+down. The key sender is a fake that sleeps like pyautogui does (PAUSE
+seconds after every call), so no keys reach the desktop.
+
+  inline   the old send_volume_action(): one press per frame while the
+           distance is outside min/max, throttled to one every 0.12 s,
+           called from the loop
+  actuator the target percentage goes to VolumeActuator(KeyStepBackend),
+           which sends the needed steps in one batch on its own thread
+
+Reports the time the loop spent inside the volume call per frame, and how
+far the estimated level ended from the final target. The actuator's
+one-off start-up sync() runs before the sweep and is not counted.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from gesture_core.volume import KeyStepBackend, VolumeActuator
+
+MIN_DIST, MAX_DIST = 25, 160
+
+
+class FakeKeys:
+    """Stands in for pyautogui.press: sleeps pause per call and counts presses."""
+
+    def __init__(self, pause=0.1):
+        self.pause = pause
+        self.calls = 0
+        self.presses = {"volumeup": 0, "volumedown": 0}
+
+    def __call__(self, key, presses=1):
+        self.calls += 1
+        self.presses[key] += presses
+        time.sleep(self.pause)
+
+
+def hand_sweep(frames, seed=0):
+    """Thumb-index distance going down and up twice, with jitter."""
+    t = np.linspace(0, 2 * np.pi * 2, frames)
+    rng = np.random.default_rng(seed)
+    return (92 + 85 * np.sin(t) + rng.normal(0, 3, frames)).astype(int)
+
+
+def run_inline(distances, keys, fps):
+    """The old loop: pyautogui.press() straight from the camera thread."""
+    stalls, last_action, level = [], 0.0, 50.0
+    for dist in distances:
+        start = time.perf_counter()
+        action = "volumedown" if dist < MIN_DIST else "volumeup" if dist > MAX_DIST else None
+        if action and start - last_action > 0.12:
+            keys(action)
+            level = min(max(level + (2 if action == "volumeup" else -2), 0), 100)
+            last_action = start
+        stalls.append((time.perf_counter() - start) * 1000)
+        time.sleep(max(0.0, 1 / fps - (time.perf_counter() - start)))
+    return stalls, level
+
+
+def run_actuator(distances, keys, fps):
+    backend = KeyStepBackend(send_keys=keys)
+    actuator = VolumeActuator(backend, min_change=2.0).start()
+    actuator.synced.wait()
+    keys.calls, keys.presses = 0, {"volumeup": 0, "volumedown": 0}
+    stalls = []
+    for dist in distances:
+        start = time.perf_counter()
+        pct = float(np.clip((dist - MIN_DIST) / (MAX_DIST - MIN_DIST) * 100, 0, 100))
+        actuator.request(pct)
+        stalls.append((time.perf_counter() - start) * 1000)
+        time.sleep(max(0.0, 1 / fps - (time.perf_counter() - start)))
+    time.sleep(keys.pause * 2 + 0.1)  # let the last batch land
+    actuator.stop()
+    return stalls, backend.level
+
+
+def summarize(name, stalls, keys, level, target, elapsed):
+    arr = np.asarray(stalls)
+    return {
+        "mode": name,
+        "stall_mean_ms": round(float(arr.mean()), 3),
+        "stall_p95_ms": round(float(np.percentile(arr, 95)), 3),
+        "stall_max_ms": round(float(arr.max()), 3),
+        "stall_total_ms": round(float(arr.sum()), 1),
+        "stall_per_step_ms": round(float(arr.sum()) / max(sum(keys.presses.values()), 1), 3),
+        "key_calls": keys.calls,
+        "presses": sum(keys.presses.values()),
+        "loop_fps": round(len(stalls) / elapsed, 1),
+        "final_error_pct": round(abs(level - target), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--pause", type=float, default=0.1, help="seconds the fake sender blocks per call (pyautogui.PAUSE)")
+    parser.add_argument("--out", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    distances = hand_sweep(args.frames)
+    target = float(np.clip((distances[-1] - MIN_DIST) / (MAX_DIST - MIN_DIST) * 100, 0, 100))
+    results = []
+    for name, runner in (("inline", run_inline), ("actuator", run_actuator)):
+        keys = FakeKeys(args.pause)
+        start = time.perf_counter()
+        stalls, level = runner(distances, keys, args.fps)
+        results.append(summarize(name, stalls, keys, level, target, time.perf_counter() - start))
+
+    print(f"{args.frames} frames at {args.fps:g} FPS, {args.pause * 1000:g} ms per key call")
+    print(f"{'mode':10}{'mean ms':>9}{'p95 ms':>9}{'max ms':>9}{'per step':>10}{'calls':>7}{'presses':>9}{'FPS':>7}{'error %':>9}")
+    for r in results:
+        print(f"{r['mode']:10}{r['stall_mean_ms']:>9}{r['stall_p95_ms']:>9}{r['stall_max_ms']:>9}"
+              f"{r['stall_per_step_ms']:>10}{r['key_calls']:>7}{r['presses']:>9}{r['loop_fps']:>7}{r['final_error_pct']:>9}")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"frames": args.frames, "fps": args.fps, "pause": args.pause, "results": results}, f, indent=2)
+        print(f"saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""Per-frame function microbenchmarks with a regression check against a baseline.
+
+    python -m benchmarks.micro_bench --out micro_baseline.json        # record a baseline
+    python -m benchmarks.micro_bench --baseline micro_baseline.json   # exits 1 on a regression
+
+Times the pure functions every camera frame goes through, on fixed seeded
+inputs (synthetic landmark sets, a 640x480 frame, a full history buffer),
+so no camera, MediaPipe or Streamlit is needed:
+
+  get_hand_state            the apps' default classifier (80/40 px rule) on one hand
+  classify_templates        GestureClassifier.classify_one (kNN), used with
+                            GESTURE_TEMPLATES
+  draw_overlay              MetricsOverlay.draw (final project)
+  draw_volume_bar_on_frame  overlay.draw_volume_bar (milestone 4)
+  create_combined_chart     charts.distance_chart on 60 s of history (needs plotly)
+  distance_to_percent       features.distance_to_percent, the volume
+                            mapping every app and the daemon use
+
+Cases are timed in --repeat interleaved rounds, one batch of about --time
+seconds per case per round, together with a fixed reference workload
+(small numpy calls and Python arithmetic). ops/s is the median over the
+rounds. relative is each round's ops/s divided by the reference's in
+the same round, so the whole machine getting faster or slower (frequency
+scaling, other load) cancels out. noise is the relative standard error of
+that median, estimated from the spread of the ratio over the rounds. Allocations come from tracemalloc (numpy
+buffers included). peak_bytes is the largest transient allocation of a
+single call, and retained_bytes is how much memory --alloc-ops calls left
+behind per call (should be 0).
+
+A case regresses when its median relative speed drops by more than
+--threshold or by more than 3x the combined noise of both runs, whichever
+is larger, or
+when its peak allocation grows by more than --threshold. A case that was
+measured in the baseline but is skipped now (a missing dependency) also
+fails the check. Baselines are only comparable on the same machine.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from gesture_core.charts import distance_chart
+from gesture_core.classifier import app_classifier, default_classifier
+from gesture_core.history import HistoryBuffer
+from gesture_core.overlay import MetricsOverlay, draw_volume_bar
+from gesture_core.features import distance_to_percent
+from gesture_core.synthetic import synthetic_hands
+
+MIN_DIST, MAX_DIST = 25, 160
+
+
+def cycle(n):
+    """An index that walks 0..n-1 forever, so cases rotate through fixed inputs."""
+    state = {"i": -1}
+
+    def step():
+        state["i"] = (state["i"] + 1) % n
+        return state["i"]
+    return step
+
+
+# ----------------- CASES -----------------
+# each builder does its setup untimed and returns the zero-argument call to time
+def case_get_hand_state():
+    classifier = app_classifier()
+    points, _ = synthetic_hands(256, seed=1)
+    nxt = cycle(len(points))
+    return lambda: classifier.classify_one(points[nxt()])
+
+
+def case_classify_templates():
+    classifier = default_classifier()
+    points, _ = synthetic_hands(256, seed=1)
+    nxt = cycle(len(points))
+    return lambda: classifier.classify_one(points[nxt()])
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)
+
+
+def case_draw_overlay():
+    overlay, frame = MetricsOverlay(), _frame()
+    dists = np.random.default_rng(2).integers(0, 200, 64)
+    gestures = ("🖐 Open", "✊ Closed", "🤏 Pinched", "—")
+    nxt = cycle(len(dists))
+
+    def call():
+        i = nxt()
+        d = int(dists[i])
+        return overlay.draw(frame, d, distance_to_percent(d), 28.0 + i % 3, gestures[i % 4])
+    return call
+
+
+def case_draw_volume_bar_on_frame():
+    frame = _frame()
+    pcts = np.random.default_rng(3).uniform(0, 100, 64)
+    nxt = cycle(len(pcts))
+    return lambda: draw_volume_bar(frame, float(pcts[nxt()]))
+
+
+def case_create_combined_chart():
+    import plotly  # noqa: F401  (skip the case when plotly is missing)
+    history = HistoryBuffer.for_duration(60, fps=30)
+    dists = np.random.default_rng(4).uniform(0, 200, history.capacity)
+    for i, d in enumerate(dists):
+        history.append(d, distance_to_percent(d), timestamp=i / 30)
+    return lambda: distance_chart(history, MIN_DIST, MAX_DIST)
+
+
+def case_distance_to_percent():
+    dists = np.random.default_rng(5).integers(0, 200, 256).tolist()
+    nxt = cycle(len(dists))
+    return lambda: distance_to_percent(dists[nxt()])
+
+
+_REFERENCE_ARRAY = np.linspace(0, 1, 256)
+
+
+def reference_work():
+    """Fixed mix of small numpy calls and Python arithmetic, timed next to every case."""
+    total = 0.0
+    for i in range(100):
+        total += i * 0.5
+    return float(np.clip(_REFERENCE_ARRAY, 0.2, 0.8).sum()) + total
+
+
+CASES = {
+    "get_hand_state": case_get_hand_state,
+    "classify_templates": case_classify_templates,
+    "draw_overlay": case_draw_overlay,
+    "draw_volume_bar_on_frame": case_draw_volume_bar_on_frame,
+    "create_combined_chart": case_create_combined_chart,
+    "distance_to_percent": case_distance_to_percent,
+}
+
+
+# ----------------- MEASUREMENT -----------------
+def timed_batch(fn, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return number / (time.perf_counter() - start)
+
+
+def batch_size(fn, seconds):
+    """Calls that take about seconds."""
+    fn()  # warm caches (overlay layers, lazy imports)
+    number, elapsed = 1, 0.0
+    while elapsed < seconds / 10:
+        number *= 2
+        elapsed = number / timed_batch(fn, number)
+    return max(1, int(number * seconds / elapsed))
+
+
+def ops_per_second(fns, seconds, repeat):
+    """{name: (median ops/s, median ops/s relative to reference_work, noise, batch)}."""
+    fns = dict(fns, reference=reference_work)
+    numbers = dict((name, batch_size(fn, seconds)) for name, fn in fns.items())
+    rates = dict((name, []) for name in fns)
+    for _ in range(repeat):
+        for name, fn in fns.items():
+            rates[name].append(timed_batch(fn, numbers[name]))
+    reference = np.asarray(rates.pop("reference"))
+    out = {}
+    for name, values in rates.items():
+        relative = np.asarray(values) / reference
+        median = float(np.median(relative))
+        # MAD -> standard deviation -> standard error of the median
+        spread = 1.4826 * float(np.median(np.abs(relative - median)))
+        noise = 1.2533 * spread / np.sqrt(len(relative)) / median
+        out[name] = (float(np.median(values)), median, noise, numbers[name])
+    return out
+
+
+def allocations(fn, ops):
+    fn()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        peak = 0
+        for _ in range(ops):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, max(after - before, 0) / ops
+
+
+def run_cases(names, args):
+    fns, results = {}, {}
+    for name in names:
+        try:
+            fns[name] = CASES[name]()
+        except ImportError as e:
+            results[name] = {"name": name, "skipped": f"missing dependency: {e.name}"}
+    for name, (rate, relative, noise, number) in ops_per_second(fns, args.time, args.repeat).items():
+        peak, retained = allocations(fns[name], args.alloc_ops)
+        results[name] = {"name": name, "ops_per_s": round(rate, 1), "us_per_op": round(1e6 / rate, 3),
+                         "relative": round(relative, 5), "noise": round(noise, 4), "batch": number,
+                         "peak_bytes": int(peak), "retained_bytes": round(retained, 1)}
+    return [results[name] for name in names]
+
+
+def compare(results, baseline, threshold, min_bytes=1024, noise_factor=3.0):
+    """Regression messages for results that are worse than baseline beyond threshold and noise."""
+    base = dict((r["name"], r) for r in baseline["results"] if "skipped" not in r)
+    regressions = []
+    for r in results:
+        old = base.get(r["name"])
+        if old is None:
+            continue
+        if "skipped" in r:
+            regressions.append(f"{r['name']}: measured in the baseline, {r['skipped']} now")
+            continue
+        # baselines from before the reference workload compare raw ops/s and count as noiseless
+        key = "relative" if "relative" in old else "ops_per_s"
+        r["ops_change"] = round(r[key] / old[key] - 1, 3)
+        noise = float(np.hypot(r["noise"], old.get("noise", 0.0)))
+        r["allowed"] = round(max(threshold, noise_factor * noise), 3)
+        if r["ops_change"] < -r["allowed"]:
+            regressions.append(f"{r['name']}: {r['ops_per_s']:.0f} ops/s vs {old['ops_per_s']:.0f} "
+                               f"({r['ops_change']:+.1%}, allowed -{r['allowed']:.0%})")
+        # small absolute growth (a few temporaries) is noise, not a regression
+        grown = r["peak_bytes"] - old["peak_bytes"]
+        if grown > min_bytes and r["peak_bytes"] > old["peak_bytes"] * (1 + threshold):
+            regressions.append(f"{r['name']}: peak allocation {r['peak_bytes']} B vs {old['peak_bytes']} B")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cases", nargs="*", help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--time", type=float, default=0.1, help="seconds per timed batch")
+    parser.add_argument("--repeat", type=int, default=21, help="interleaved rounds (the median is kept)")
+    parser.add_argument("--alloc-ops", type=int, default=200, help="calls traced for allocations")
+    parser.add_argument("--baseline", help="compare with this earlier --out file")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown / allocation growth (0.15 = 15%%)")
+    parser.add_argument("--out", help="write the results to this JSON file (usable as a baseline)")
+    args = parser.parse_args()
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case {', '.join(unknown)}")
+
+    results = run_cases(list(args.cases or CASES), args)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+    print(f"{'case':26}{'ops/s':>12}{'us/op':>10}{'noise':>8}{'peak B':>10}{'kept B':>8}"
+          + (f"{'change':>9}{'allowed':>9}" if args.baseline else ""))
+    for r in results:
+        if "skipped" in r:
+            print(f"{r['name']:26}  skipped ({r['skipped']})")
+            continue
+        change = f"{r['ops_change']:>+9.1%}{-r['allowed']:>+9.0%}" if "ops_change" in r else ""
+        print(f"{r['name']:26}{r['ops_per_s']:>12.0f}{r['us_per_op']:>10}{r['noise']:>8.1%}{r['peak_bytes']:>10}"
+              f"{r['retained_bytes']:>8}{change}")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+                       "args": vars(args), "results": results}, f, indent=2)
+        print(f"saved {args.out}")
+    if regressions:
+        print(f"{len(regressions)} regression(s):")
+        for line in regressions:
+            print("  " + line)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
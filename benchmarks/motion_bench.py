@@ -0,0 +1,122 @@
+"""Idle CPU and wake-up latency with and without the motion gate.
+
+    python -m benchmarks.motion_bench --idle 8 --active 3 --cycles 2
+
+Plays a synthetic kiosk scene at a fixed FPS: a static, noisy background
+for --idle seconds, then a bright "hand" that moves across it for --active
+seconds, repeated --cycles times. The detector is a stand-in that burns
+--cost ms of CPU per call (like hands.process) and reports a hand while
+the blob is in view. The same scene runs ungated and behind MotionGate.
+
+Reports process CPU percent during the idle and active phases (the idle
+phase includes the gate's hold time after the hand leaves), how many
+inferences ran, and the wake-up latency from the hand entering the scene
+to the first frame with a detected hand.
+"""
+import argparse
+import json
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from gesture_core.motion import MotionGate
+
+
+class BusyDetector:
+    """Burns cost_ms of CPU, then 'detects' the bright blob the scene draws."""
+
+    def __init__(self, cost_ms=15.0):
+        self.cost_ms = cost_ms
+        self.calls = 0
+
+    def process(self, rgb):
+        self.calls += 1
+        end = time.process_time() + self.cost_ms / 1000
+        while time.process_time() < end:
+            pass
+        hand = rgb[::8, ::8].max() >= 250
+        return SimpleNamespace(multi_hand_landmarks=[object()] if hand else None, multi_handedness=None)
+
+
+def scene(width, height, seed=0):
+    rng = np.random.default_rng(seed)
+    background = rng.integers(40, 200, (height, width, 3), dtype=np.uint8)
+    background = cv2.GaussianBlur(background, (0, 0), 8)
+
+    def frame(hand_x=None):
+        # sensor noise on every frame, so "static" is never bit-identical
+        noise = rng.integers(-4, 5, background.shape, dtype=np.int16)
+        img = np.clip(background.astype(np.int16) + noise, 0, 249).astype(np.uint8)
+        if hand_x is not None:
+            cv2.circle(img, (int(hand_x), height // 2), height // 6, (255, 255, 255), -1)
+        return img
+    return frame
+
+
+def run(detector, make_frame, args):
+    phases = {"idle": [0.0, 0.0], "active": [0.0, 0.0]}  # wall, cpu
+    wake = []
+    frames = int(args.fps * (args.idle + args.active))
+    for _ in range(args.cycles):
+        entered, detected = None, False
+        for i in range(frames):
+            t = i / args.fps
+            phase = "idle" if t < args.idle else "active"
+            hand_x = None
+            if phase == "active":
+                hand_x = args.width * (0.2 + 0.6 * ((t - args.idle) / args.active))
+            rgb = make_frame(hand_x)
+            start, cpu = time.perf_counter(), time.process_time()
+            if phase == "active" and entered is None:
+                entered = start
+            result = detector.process(rgb)
+            if result.multi_hand_landmarks and entered is not None and not detected:
+                wake.append((time.perf_counter() - entered) * 1000)
+                detected = True
+            time.sleep(max(0.0, 1 / args.fps - (time.perf_counter() - start)))
+            phases[phase][0] += time.perf_counter() - start
+            phases[phase][1] += time.process_time() - cpu
+    return {
+        "idle_cpu_percent": round(100 * phases["idle"][1] / phases["idle"][0], 1),
+        "active_cpu_percent": round(100 * phases["active"][1] / phases["active"][0], 1),
+        "wake_latency_ms": round(float(np.mean(wake)), 1) if wake else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--idle", type=float, default=8.0, help="seconds of empty scene per cycle")
+    parser.add_argument("--active", type=float, default=3.0, help="seconds with a moving hand per cycle")
+    parser.add_argument("--cycles", type=int, default=2)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--cost", type=float, default=15.0, help="CPU ms per stand-in inference")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--out", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    for name in ("ungated", "gated"):
+        inner = BusyDetector(args.cost)
+        detector = MotionGate(inner) if name == "gated" else inner
+        results[name] = run(detector, scene(args.width, args.height), args)
+        results[name]["inferences"] = inner.calls
+        if name == "gated":
+            results[name]["gate"] = detector.metrics()["gate"]
+
+    print(f"{args.cycles} x ({args.idle:g}s idle + {args.active:g}s hand) at {args.fps:g} FPS, {args.cost:g} ms inference")
+    print(f"{'mode':9}{'idle CPU %':>12}{'active CPU %':>14}{'inferences':>12}{'wake ms':>9}")
+    for name, r in results.items():
+        print(f"{name:9}{r['idle_cpu_percent']:>12}{r['active_cpu_percent']:>14}{r['inferences']:>12}{str(r['wake_latency_ms']):>9}")
+    gate = results["gated"]["gate"]
+    print(f"gate: {gate['skipped']} skipped, {gate['probes']} probes, {gate['wakeups']} wake-ups, {gate['gate_ms']} ms per check")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Per-frame cost and ID stability of multi-hand tracking from 1 to 4 hands.
+
+    python -m benchmarks.multihand_bench --frames 2000 --max-hands 4
+    python -m benchmarks.multihand_bench --source two_hands.mp4   # inference measured on a recording
+
+Each hand is a synthetic landmark set (gesture_core.synthetic) moving along
+its own lane of the frame. Every frame, the hands come out as
+MediaPipe-style results in a shuffled order, like hands.process returns
+them. A --flip share of handedness labels is wrong, and a --miss share of
+detections is dropped.
+
+Measured per frame (wall time on this machine):
+  track    HandTracker.update: landmark copy, centroid matching, One-Euro
+  control  DualHandControl.update: features and control per hand
+  infer    hands.process with max_num_hands = 1..4 on the first
+           --infer-frames frames of --source (default: GESTURE_SOURCE or
+           the webcam). Its cost follows how many hands are actually in
+           view, so record the hands you want to measure.
+Without mediapipe or a source, the inference column is a model instead
+(marked *): the palm detector once per frame (--palm-ms) plus the landmark
+model once per hand (--hand-ms).
+
+"switches" counts frames where a ground-truth hand came back under a
+different tracker id than before. That is the number that has to stay at 0
+for each hand to keep its control.
+"""
+import argparse
+import json
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from gesture_core.sources import open_source
+from gesture_core.synthetic import synthetic_hands
+from gesture_core.tracking import DualHandControl, HandTracker
+
+
+class Landmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+def hand_result(points):
+    return SimpleNamespace(landmark=[Landmark(*p) for p in points.tolist()])
+
+
+def handedness(label, score=0.95):
+    return SimpleNamespace(classification=[SimpleNamespace(label=label, score=score, index=0)])
+
+
+def make_scene(n_hands, frames, seed=0):
+    """(frames, n_hands, 21, 3) landmark trajectories, one horizontal lane per hand."""
+    rng = np.random.default_rng(seed)
+    shapes, _ = synthetic_hands(n_hands, seed=seed)
+    # each hand keeps its shape, centred on its own origin; the jitter changes every frame
+    shapes[..., :2] -= shapes[..., :2].mean(axis=1, keepdims=True)
+    jitter = rng.normal(0, 0.002, (frames,) + shapes.shape).astype(np.float32)
+    t = np.arange(frames)[:, None] / 30.0
+    lanes = (np.arange(n_hands) + 0.5) / n_hands
+    cx = lanes + 0.35 / n_hands * np.sin(2 * np.pi * 0.4 * t + np.arange(n_hands))
+    cy = 0.55 + 0.2 * np.sin(2 * np.pi * 0.25 * t + 2 * np.arange(n_hands))
+    scene = shapes[None] * np.float32([0.6, 0.6, 1]) + jitter
+    scene[..., 0] += cx[..., None]
+    scene[..., 1] += cy[..., None]
+    return scene.astype(np.float32)
+
+
+def measure_inference(args):
+    """{max_num_hands: (mean ms, p95 ms, hands found per frame)} from real hands.process, or None."""
+    try:
+        import mediapipe as mp
+    except ImportError:
+        return None
+    cap = open_source(args.source)
+    images = []
+    while cap.isOpened() and len(images) < args.infer_frames:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        images.append(cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+    cap.release()
+    if not images:
+        return None
+
+    measured = {}
+    for n in range(1, args.max_hands + 1):
+        with mp.solutions.hands.Hands(max_num_hands=n, min_detection_confidence=0.7) as hands:
+            hands.process(images[0])  # graph start-up is not per-frame cost
+            times, found = [], 0
+            for rgb in images:
+                start = time.perf_counter()
+                result = hands.process(rgb)
+                times.append((time.perf_counter() - start) * 1000)
+                found += len(result.multi_hand_landmarks or [])
+        measured[n] = (float(np.mean(times)), float(np.percentile(times, 95)), found / len(images))
+    return measured
+
+
+def run(n_hands, args, measured=None):
+    rng = np.random.default_rng(args.seed + n_hands)
+    scene = make_scene(n_hands, args.frames, args.seed)
+    labels = ["Left" if k % 2 == 0 else "Right" for k in range(n_hands)]
+    tracker = HandTracker()
+    control = DualHandControl({"Left": "volume", "Right": "mute"})
+    track_ms, control_ms = [], []
+    last_id, switches = [None] * n_hands, 0
+
+    for f in range(args.frames):
+        order = [k for k in rng.permutation(n_hands) if rng.random() >= args.miss]
+        hands = [hand_result(scene[f, k]) for k in order]
+        flipped = rng.random(len(order)) < args.flip
+        names = [("Right" if labels[k] == "Left" else "Left") if flip else labels[k] for k, flip in zip(order, flipped)]
+        results = SimpleNamespace(multi_hand_landmarks=hands or None,
+                                  multi_handedness=[handedness(name) for name in names] or None)
+        owner = dict((id(h), k) for h, k in zip(hands, order))
+
+        start = time.perf_counter()
+        visible = tracker.update(results, now=f / 30.0)
+        mid = time.perf_counter()
+        control.update(visible, (args.height, args.width), tracker.tracks)
+        end = time.perf_counter()
+        track_ms.append((mid - start) * 1000)
+        control_ms.append((end - mid) * 1000)
+
+        for track in visible:
+            k = owner[id(track.landmarks)]
+            if last_id[k] is not None and last_id[k] != track.id:
+                switches += 1
+            last_id[k] = track.id
+
+    track, ctrl = float(np.mean(track_ms)), float(np.mean(control_ms))
+    inference = {"inference_ms": round(args.palm_ms + args.hand_ms * n_hands, 1), "inference_measured": False}
+    if measured is not None:
+        mean, p95, found = measured[n_hands]
+        inference = {"inference_ms": round(mean, 2), "inference_p95_ms": round(p95, 2),
+                     "hands_found": round(found, 2), "inference_measured": True}
+    return dict(inference, **{
+        "hands": n_hands,
+        "track_ms": round(track, 3),
+        "track_p95_ms": round(float(np.percentile(track_ms, 95)), 3),
+        "control_ms": round(ctrl, 3),
+        "per_hand_us": round((track + ctrl) * 1000 / n_hands, 1),
+        "id_switches": switches,
+        "ids_created": tracker.created,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--max-hands", type=int, default=4)
+    parser.add_argument("--flip", type=float, default=0.05, help="share of detections with the wrong handedness")
+    parser.add_argument("--miss", type=float, default=0.03, help="share of detections dropped")
+    parser.add_argument("--source", help="recording for the measured inference column (default: GESTURE_SOURCE or 0)")
+    parser.add_argument("--infer-frames", type=int, default=200, help="frames of --source run through hands.process")
+    parser.add_argument("--palm-ms", type=float, default=8.0, help="modelled palm detector cost per frame")
+    parser.add_argument("--hand-ms", type=float, default=6.0, help="modelled landmark model cost per hand")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    measured = measure_inference(args)
+    results = [run(n, args, measured) for n in range(1, args.max_hands + 1)]
+
+    print(f"{args.frames} frames per run, {args.flip:.0%} wrong handedness, {args.miss:.0%} missed detections")
+    print(f"{'hands':>5}{'infer ms':>11}{'track ms':>10}{'p95':>8}{'control ms':>12}{'us/hand':>9}{'switches':>10}{'ids':>6}")
+    for r in results:
+        infer = f"{r['inference_ms']}" + ("" if r["inference_measured"] else "*")
+        print(f"{r['hands']:>5}{infer:>11}{r['track_ms']:>10}{r['track_p95_ms']:>8}"
+              f"{r['control_ms']:>12}{r['per_hand_us']:>9}{r['id_switches']:>10}{r['ids_created']:>6}")
+    if measured is None:
+        print("* modelled (no mediapipe or no frames from --source): --palm-ms + --hand-ms per hand")
+    else:
+        print(f"infer: hands.process on {args.infer_frames} frames at most of {args.source or 'the default source'}, "
+              "hands found per frame: " + ", ".join(f"{r['hands_found']}" for r in results))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+        print(f"saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Replay of the adaptive capture controller against a simulated camera under load.
+
+    python -m benchmarks.profile_bench --duration 90 --load 0:1,20:2.5,50:1
+
+Runs on virtual time, so a replay takes well under a second and gives the
+same event log every time for the same arguments. Frames come from
+SimulatedCamera, which changes size when the controller asks for another
+profile. The time to process a frame is modelled as
+
+    (--base-ms + --mpix-ms * megapixels) * load(t) * noise
+
+where --load is a list of start_second:multiplier steps (a second app
+grabbing the CPU, thermal throttling ...) and noise is log-normal. A frame
+takes max(1 / fps, processing time) of virtual time.
+
+Two runs are compared: the old fixed 640x480@30 capture, and the
+AdaptiveCaptureController starting from the same profile. Reports the
+share of frames over --target-ms, p90 latency, average megapixels per
+frame (image detail kept), processing CPU per second, the controller's
+event log and the time spent in each profile.
+"""
+import argparse
+import json
+
+import numpy as np
+
+from gesture_core.profiles import DEFAULT_LADDER, AdaptiveCaptureController, apply_profile, format_event
+from gesture_core.sources import SimulatedCamera
+
+
+def parse_load(text):
+    steps = []
+    for part in text.split(","):
+        start, factor = part.split(":")
+        steps.append((float(start), float(factor)))
+    return sorted(steps)
+
+
+def load_at(steps, t):
+    factor = 1.0
+    for start, value in steps:
+        if t >= start:
+            factor = value
+    return factor
+
+
+def replay(args, adaptive):
+    rng = np.random.default_rng(args.seed)
+    steps = parse_load(args.load)
+    cam = SimulatedCamera()
+    clock = {"t": 0.0}
+    controller = None
+    if adaptive:
+        controller = AdaptiveCaptureController(cam, target_ms=args.target_ms, window=args.window,
+                                               cooldown=args.cooldown, clock=lambda: clock["t"])
+    else:
+        apply_profile(cam, DEFAULT_LADDER[2])
+
+    latencies, pixels, busy, mismatched = [], [], 0.0, 0
+    time_in = {}
+    while clock["t"] < args.duration:
+        ok, frame = cam.read()
+        if frame.shape[:2] != (cam.height, cam.width):
+            mismatched += 1
+        mpix = frame.shape[0] * frame.shape[1] / 1e6
+        cost = (args.base_ms + args.mpix_ms * mpix) * load_at(steps, clock["t"]) * rng.lognormal(0, args.noise)
+        frame_s = max(1 / cam.fps, cost / 1000)
+        name = f"{cam.width}x{cam.height}@{cam.fps:g}"
+        time_in[name] = time_in.get(name, 0.0) + frame_s
+        latencies.append(cost)
+        pixels.append(mpix)
+        busy += cost
+        clock["t"] += frame_s
+        if controller is not None:
+            controller.observe(cost)
+
+    lat = np.asarray(latencies)
+    return {
+        "mode": "adaptive" if adaptive else "fixed",
+        "frames": len(lat),
+        "over_target": round(float(np.mean(lat > args.target_ms)), 3),
+        "p50_ms": round(float(np.percentile(lat, 50)), 1),
+        "p90_ms": round(float(np.percentile(lat, 90)), 1),
+        "mean_mpix": round(float(np.mean(pixels)), 3),
+        "cpu_ms_per_s": round(busy / args.duration, 1),
+        "mismatched_frames": mismatched,
+        "seconds_per_profile": {k: round(v, 1) for k, v in time_in.items()},
+        "events": controller.events if controller is not None else [],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=90.0, help="virtual seconds to replay")
+    parser.add_argument("--load", default="0:1,20:2.5,50:1", help="start_second:multiplier steps")
+    parser.add_argument("--target-ms", type=float, default=33.0)
+    parser.add_argument("--window", type=int, default=30, help="frames per controller decision")
+    parser.add_argument("--cooldown", type=float, default=2.0, help="seconds between profile changes")
+    parser.add_argument("--base-ms", type=float, default=6.0, help="per-frame cost independent of resolution")
+    parser.add_argument("--mpix-ms", type=float, default=25.0, help="cost per megapixel at load 1")
+    parser.add_argument("--noise", type=float, default=0.15, help="sigma of the log-normal cost noise")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = [replay(args, adaptive=False), replay(args, adaptive=True)]
+
+    print(f"{args.duration:g}s replay, load {args.load}, target p90 {args.target_ms:g} ms")
+    for event in results[1]["events"]:
+        print(f"  t={event['t']:7.2f}s  {format_event(event)}")
+    print(f"{'mode':10}{'frames':>8}{'over %':>8}{'p50 ms':>8}{'p90 ms':>8}{'Mpix':>7}{'CPU ms/s':>10}")
+    for r in results:
+        print(f"{r['mode']:10}{r['frames']:>8}{r['over_target'] * 100:>8.1f}{r['p50_ms']:>8}{r['p90_ms']:>8}"
+              f"{r['mean_mpix']:>7}{r['cpu_ms_per_s']:>10}")
+    print("adaptive time per profile:", ", ".join(f"{k} {v}s" for k, v in results[1]["seconds_per_profile"].items()))
+    if any(r["mismatched_frames"] for r in results):
+        print("warning: frames did not match the requested profile:", [r["mismatched_frames"] for r in results])
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+        print(f"saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Replay a recorded video or image sequence through the gesture pipeline.
+
+    python -m benchmarks.replay_bench recording.mp4 --out run.json
+    python -m benchmarks.replay_bench "frames/*.png" --out new.json --compare run.json
+    python -m benchmarks.replay_bench recording.mp4 --roi-compare
+
+Reports p50/p95/p99 per stage: read, preprocess (flip + cvtColor),
+inference (hands.process), draw_landmarks, overlay, encode and actuator.
+
+--roi-compare replays the recording twice, once with full frames and once
+with ROI-tracked inference, and prints the inference speed-up next to how
+far the ROI pinch distance is from the full-frame one on the same frames.
+"""
+import argparse
+import json
+import platform
+import time
+
+import cv2
+import numpy as np
+
+from gesture_core.features import INDEX_TIP, THUMB_TIP, hand_features
+from gesture_core.roi import RoiHandTracker
+from gesture_core.scheduler import InferenceScheduler
+from gesture_core.sources import open_source
+from gesture_core.timing import StageTimer
+from gesture_core.volume import MemoryBackend, VolumeActuator
+
+MIN_DIST, MAX_DIST = 10, 150
+STAGES = ["read", "preprocess", "inference", "draw_landmarks", "overlay", "encode", "actuator"]
+
+
+def draw_overlay(frame, thumb, index, pct):
+    (tx, ty), (ix, iy) = thumb, index
+    cv2.circle(frame, (tx, ty), 8, (255, 0, 0), -1)
+    cv2.circle(frame, (ix, iy), 8, (0, 255, 0), -1)
+    cv2.line(frame, (tx, ty), (ix, iy), (0, 0, 255), 3)
+    bar_x, bar_y, bar_w, bar_h = 40, 100, 25, 300
+    cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_w, bar_y + bar_h), (255, 255, 255), 2)
+    fill = int((pct / 100) * bar_h)
+    cv2.rectangle(frame, (bar_x, bar_y + bar_h - fill), (bar_x + bar_w, bar_y + bar_h), (0, 255, 0), -1)
+    cv2.putText(frame, f"{int(pct)}%", (bar_x - 5, bar_y + bar_h + 35),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+
+
+def run(source, max_frames=0, quality=90, actuator=None, roi=False, budget_ms=0, trace=None):
+    """Replay source; trace, when given, gets the pinch distance in pixels (None without a hand) per frame."""
+    import mediapipe as mp
+
+    mp_hands = mp.solutions.hands
+    mp_drawing = mp.solutions.drawing_utils
+    # build hosts have no audio device: time the same actuator against the in-memory backend
+    actuator = actuator or VolumeActuator(MemoryBackend()).start()
+    timer = StageTimer()
+    cap = open_source(source)
+    if not cap.isOpened():
+        raise SystemExit(f"could not open source: {source}")
+
+    frames = hand_frames = 0
+    started = time.perf_counter()
+    hands = mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.7)
+    tracker = RoiHandTracker(hands, min_confidence=0.7) if roi else None
+    # closing the tracker closes hands and its crop detector as well
+    with tracker or hands:
+        detector = tracker or hands
+        scheduler = InferenceScheduler(detector, budget_ms=budget_ms) if budget_ms else None
+        if scheduler is not None:
+            detector = scheduler
+        while not max_frames or frames < max_frames:
+            with timer.stage("read"):
+                ok, frame = cap.read()
+            if not ok:
+                break
+            frames += 1
+
+            with timer.stage("preprocess"):
+                frame = cv2.flip(frame, 1)
+                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            with timer.stage("inference"):
+                result = detector.process(rgb)
+            if trace is not None:
+                trace.append(None)
+
+            if result.multi_hand_landmarks:
+                hand_frames += 1
+                hand_landmarks = result.multi_hand_landmarks[0]
+                with timer.stage("draw_landmarks"):
+                    mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+
+                features = hand_features(hand_landmarks, frame.shape)
+                thumb_xy, index_xy = features.xy(THUMB_TIP), features.xy(INDEX_TIP)
+                distance = features.pinch
+                if trace is not None:
+                    trace[-1] = distance
+                pct = float(np.interp(np.clip(distance, MIN_DIST, MAX_DIST), [MIN_DIST, MAX_DIST], [0, 100]))
+
+                with timer.stage("overlay"):
+                    draw_overlay(frame, thumb_xy, index_xy, pct)
+                with timer.stage("actuator"):
+                    actuator.request(pct)
+
+            with timer.stage("encode"):
+                cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+            if scheduler is not None:
+                scheduler.frame_done()
+    cap.release()
+    actuator.stop()
+
+    elapsed = time.perf_counter() - started
+    info = {
+        "source": str(source),
+        "frames": frames,
+        "hand_frames": hand_frames,
+        "elapsed_s": round(elapsed, 3),
+        "fps": round(frames / elapsed, 2) if elapsed > 0 else 0.0,
+        "jpeg_quality": quality,
+        "roi_tracking": roi,
+        "budget_ms": budget_ms,
+        "volume_writes": actuator.writes,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    if scheduler is not None:
+        info["scheduler"] = scheduler.metrics()
+    if tracker is not None:
+        info["roi"] = tracker.metrics()
+    return timer, info
+
+
+def roi_compare(args):
+    """Full-frame vs ROI inference on the same recording: speed and pinch agreement."""
+    runs = {}
+    for name, roi in (("full", False), ("roi", True)):
+        trace = []
+        timer, info = run(args.source, args.max_frames, args.quality, roi=roi, trace=trace)
+        runs[name] = {"inference": timer.summary()["inference"], "info": info, "trace": trace}
+    full, roi = runs["full"], runs["roi"]
+    both = [(a, b) for a, b in zip(full["trace"], roi["trace"]) if a is not None and b is not None]
+    diff = np.abs([a - b for a, b in both]) if both else np.zeros(1)
+    report = {
+        "full_p50_ms": full["inference"]["p50_ms"], "full_p95_ms": full["inference"]["p95_ms"],
+        "roi_p50_ms": roi["inference"]["p50_ms"], "roi_p95_ms": roi["inference"]["p95_ms"],
+        "speedup_p50": round(full["inference"]["p50_ms"] / max(roi["inference"]["p50_ms"], 1e-9), 2),
+        "hand_frames_full": sum(d is not None for d in full["trace"]),
+        "hand_frames_roi": sum(d is not None for d in roi["trace"]),
+        "pinch_diff_mean_px": round(float(diff.mean()), 2),
+        "pinch_diff_p95_px": round(float(np.percentile(diff, 95)), 2),
+        "roi": roi["info"]["roi"],
+    }
+    print(f"inference p50/p95  full {report['full_p50_ms']:.2f}/{report['full_p95_ms']:.2f} ms  "
+          f"roi {report['roi_p50_ms']:.2f}/{report['roi_p95_ms']:.2f} ms  ({report['speedup_p50']}x at p50)")
+    print(f"hand found in {report['hand_frames_full']} / {report['hand_frames_roi']} frames (full / roi), "
+          f"pinch difference mean {report['pinch_diff_mean_px']} px, p95 {report['pinch_diff_p95_px']} px")
+    print(f"roi: {report['roi']['roi_ratio']:.0%} of frames on a crop, {report['roi']['pixel_ratio']:.0%} of pixels, "
+          f"{report['roi']['redetections']} redetections")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"saved {args.out}")
+
+
+def print_report(stages, baseline=None):
+    print(f"{'stage':<16}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'Δp95':>10}")
+    for name in STAGES:
+        if name not in stages:
+            continue
+        s = stages[name]
+        delta = ""
+        if baseline and name in baseline:
+            delta = f"{s['p95_ms'] - baseline[name]['p95_ms']:+.2f}"
+        print(f"{name:<16}{s['count']:>7}{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}{s['p99_ms']:>10.2f}{delta:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="video file, image folder, glob pattern or camera index")
+    parser.add_argument("--max-frames", type=int, default=0, help="stop after N frames (0 = whole recording)")
+    parser.add_argument("--quality", type=int, default=90, help="JPEG quality used for the encode stage")
+    parser.add_argument("--roi", action="store_true", help="use ROI-tracked inference instead of full frames")
+    parser.add_argument("--roi-compare", action="store_true", help="replay with full frames, then with ROI, and compare")
+    parser.add_argument("--budget", type=float, default=0, help="frame budget in ms for the inference scheduler (0 = off)")
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="earlier results JSON to diff p95 against")
+    args = parser.parse_args()
+    if args.roi_compare:
+        return roi_compare(args)
+
+    timer, info = run(args.source, args.max_frames, args.quality, roi=args.roi, budget_ms=args.budget)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f).get("stages", {})
+
+    print(f"{info['frames']} frames ({info['hand_frames']} with a hand) in {info['elapsed_s']}s, {info['fps']} FPS")
+    print_report(timer.summary(), baseline)
+    if args.out:
+        timer.save_json(args.out, **info)
+        print(f"saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Compare frame transport between processes: pickled Queue vs shared-memory ring.
+
+    python -m benchmarks.shm_bench --frames 600 --out shm.json
+
+A producer process generates 640x480 BGR frames; a consumer process runs a
+cheap stand-in for inference on each one and sends a (21, 3) landmark
+array back. Reports consumer throughput and capture-to-result latency.
+"""
+import argparse
+import json
+import multiprocessing
+import time
+
+import numpy as np
+
+from gesture_core.shm_ring import SharedFrameRing
+
+SHAPE = (480, 640, 3)
+
+
+def fake_inference(frame):
+    # touches the whole frame like a resize would, returns landmark-sized output
+    small = frame[::8, ::8]
+    return np.full((21, 3), small.mean(), dtype=np.float32)
+
+
+def _fill(frame, i):
+    frame[...] = i % 251
+
+
+# ----------------- QUEUE TRANSPORT -----------------
+def queue_producer(frames_q, n, fps):
+    frame = np.empty(SHAPE, dtype=np.uint8)
+    for i in range(1, n + 1):
+        _fill(frame, i)
+        frames_q.put((i, time.perf_counter(), frame))
+        if fps:
+            time.sleep(1 / fps)
+    frames_q.put(None)
+
+
+def queue_consumer(frames_q, results_q):
+    while True:
+        item = frames_q.get()
+        if item is None:
+            break
+        seq, captured, frame = item
+        results_q.put((seq, captured, fake_inference(frame)))
+    results_q.put(None)
+
+
+# ----------------- SHARED MEMORY TRANSPORT -----------------
+def shm_producer(name, slots, stamps, n, fps, done):
+    ring = SharedFrameRing.attach(name, slots=slots, shape=SHAPE)
+    for i in range(1, n + 1):
+        seq, view = ring.begin_write()
+        _fill(view, i)  # a camera would cap.read(view) here
+        stamps[seq % slots] = time.perf_counter()
+        ring.commit(seq)
+        if fps:
+            time.sleep(1 / fps)
+    done.set()
+    ring.close()
+
+
+def shm_consumer(name, slots, stamps, results_q, done):
+    ring = SharedFrameRing.attach(name, slots=slots, shape=SHAPE)
+    last_seq = 0
+    while True:
+        latest = ring.wait_latest(last_seq, timeout=0.05)
+        if latest is None:
+            if done.is_set() and ring.latest_seq == last_seq:
+                break
+            continue
+        seq, view = latest
+        captured = stamps[seq % slots]
+        landmarks = fake_inference(view)
+        if ring.still_valid(seq):
+            results_q.put((seq, captured, landmarks))
+        last_seq = seq
+    results_q.put(None)
+    ring.close()
+
+
+def collect(results_q):
+    """Return (latencies_ms, elapsed between first and last result)."""
+    latencies, first, last = [], None, None
+    while True:
+        item = results_q.get()
+        if item is None:
+            return latencies, (last - first) if latencies else 0.0
+        seq, captured, _ = item
+        last = time.perf_counter()
+        first = first or last
+        latencies.append((last - captured) * 1000)
+
+
+def summarize(name, n, latencies, elapsed):
+    # elapsed excludes process start-up, which dominates short runs
+    arr = np.asarray(latencies)
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99]) if arr.size else (0, 0, 0)
+    count = int(arr.size)
+    return {"transport": name, "frames_sent": n, "frames_processed": count,
+            "frames_dropped": n - count,
+            "fps": round(count / elapsed, 1) if elapsed else 0.0, "elapsed_s": round(elapsed, 3),
+            "latency_p50_ms": round(float(p50), 3), "latency_p95_ms": round(float(p95), 3),
+            "latency_p99_ms": round(float(p99), 3)}
+
+
+def run_queue(n, fps):
+    ctx = multiprocessing.get_context("spawn")
+    frames_q, results_q = ctx.Queue(maxsize=4), ctx.Queue()
+    procs = [ctx.Process(target=queue_producer, args=(frames_q, n, fps)),
+             ctx.Process(target=queue_consumer, args=(frames_q, results_q))]
+    for p in procs:
+        p.start()
+    latencies, elapsed = collect(results_q)
+    for p in procs:
+        p.join()
+    return summarize("queue", n, latencies, elapsed)
+
+
+def run_shm(n, fps, slots=4):
+    ctx = multiprocessing.get_context("spawn")
+    ring = SharedFrameRing(slots=slots, shape=SHAPE)
+    stamps = ctx.Array("d", slots, lock=False)
+    results_q, done = ctx.Queue(), ctx.Event()
+    procs = [ctx.Process(target=shm_consumer, args=(ring.name, slots, stamps, results_q, done)),
+             ctx.Process(target=shm_producer, args=(ring.name, slots, stamps, n, fps, done))]
+    for p in procs:
+        p.start()
+    latencies, elapsed = collect(results_q)
+    for p in procs:
+        p.join()
+    ring.close()
+    return summarize("shared_memory", n, latencies, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--fps", type=float, default=30, help="producer frame rate (0 = as fast as possible)")
+    parser.add_argument("--out", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = [run_queue(args.frames, args.fps), run_shm(args.frames, args.fps)]
+    for r in results:
+        print(f"{r['transport']:<14}{r['frames_processed']:>6} frames  {r['frames_dropped']:>5} dropped  {r['fps']:>8.1f} FPS  "
+              f"p50 {r['latency_p50_ms']:.2f} ms  p95 {r['latency_p95_ms']:.2f} ms")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"shape": SHAPE, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
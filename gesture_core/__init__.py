@@ -0,0 +1 @@
+"""Shared building blocks for the gesture volume control scripts."""
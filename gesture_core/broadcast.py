@@ -0,0 +1,162 @@
+import itertools
+import threading
+
+# assigned ids start with this; ids passed to subscribe() may not, so the two never clash
+AUTO_ID_PREFIX = "~"
+
+
+# ----------------- SUBSCRIPTION -----------------
+class Subscription:
+    """One viewer of a FrameBroadcaster; iterate it to receive payloads."""
+
+    def __init__(self, broadcaster, client_id, timeout):
+        self.broadcaster = broadcaster
+        self.client_id = client_id
+        self.timeout = timeout
+        self.closed = False
+        self.sent = 0
+        self.skipped = 0
+
+    def __iter__(self):
+        last_seq = 0
+        try:
+            while not self.closed:
+                latest = self.broadcaster.wait_for_newer(last_seq, self.timeout)
+                if latest is None:
+                    continue
+                seq, payload = latest
+                if last_seq:
+                    self.skipped += seq - last_seq - 1
+                last_seq = seq
+                self.sent += 1
+                yield payload
+        finally:
+            self.close()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.broadcaster.unsubscribe(self)
+
+
+# ----------------- BROADCASTER -----------------
+class FrameBroadcaster:
+    """Runs one producer thread and fans each payload out to every subscriber.
+
+    produce() is called in a loop while at least one subscriber is attached and
+    should return the encoded bytes for the next frame (or None to skip). Slow
+    subscribers never hold the producer back; they simply get the newest
+    payload when they ask for the next one. on_start/on_stop run when the
+    first viewer arrives and after the last one leaves. If produce() raises,
+    the error is printed and kept in last_error, every subscriber is
+    dropped (their iterators end) and on_stop runs; the next subscribe()
+    starts the producer again.
+    """
+
+    def __init__(self, produce, on_start=None, on_stop=None):
+        self.produce = produce
+        self.on_start = on_start
+        self.on_stop = on_stop
+        self.frames_produced = 0
+        self.last_error = None
+        self._cond = threading.Condition()
+        self._subscribers = {}
+        self._latest = None
+        self._seq = 0
+        self._ids = itertools.count(1)
+        self._thread = None
+        # serialises on_start/on_stop when a viewer arrives just as the last one left
+        self._lifecycle = threading.Lock()
+
+    @property
+    def subscriber_count(self):
+        with self._cond:
+            return len(self._subscribers)
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def subscribe(self, client_id=None, timeout=0.5):
+        """Attach a viewer; raises ValueError when client_id is already subscribed.
+
+        The caller needs the id to unsubscribe, so a duplicate is refused
+        rather than renamed. Without a client_id a unique one is assigned
+        (sub.client_id), from AUTO_ID_PREFIX ids that callers can't pass in.
+        """
+        with self._cond:
+            if client_id is None:
+                client_id = f"{AUTO_ID_PREFIX}{next(self._ids)}"
+            elif client_id.startswith(AUTO_ID_PREFIX):
+                raise ValueError(f"client ids starting with {AUTO_ID_PREFIX!r} are reserved")
+            elif client_id in self._subscribers:
+                raise ValueError(f"client id {client_id!r} is already subscribed")
+            sub = Subscription(self, client_id, timeout)
+            self._subscribers[client_id] = sub
+            if not self.running:
+                self._thread = threading.Thread(target=self._run, name="broadcaster", daemon=True)
+                self._thread.start()
+        return sub
+
+    def unsubscribe(self, sub_or_id):
+        client_id = getattr(sub_or_id, "client_id", sub_or_id)
+        with self._cond:
+            sub = self._subscribers.pop(client_id, None)
+            self._cond.notify_all()
+        if sub is not None:
+            sub.closed = True
+        return sub is not None
+
+    def stop_all(self):
+        with self._cond:
+            subs = list(self._subscribers.values())
+        for sub in subs:
+            sub.close()
+
+    def _drop_all(self):
+        with self._cond:
+            subs = list(self._subscribers.values())
+            self._subscribers.clear()
+            self._cond.notify_all()
+        for sub in subs:
+            sub.closed = True
+
+    def wait_for_newer(self, last_seq, timeout=None):
+        """Return (seq, payload) newer than last_seq, or None on timeout."""
+        with self._cond:
+            ready = self._cond.wait_for(lambda: self._seq > last_seq or not self._subscribers, timeout)
+            if not ready or self._seq <= last_seq:
+                return None
+            return self._seq, self._latest
+
+    def _run(self):
+        me = threading.current_thread()
+        with self._lifecycle:
+            try:
+                if self.on_start is not None:
+                    self.on_start()
+                while True:
+                    with self._cond:
+                        if not self._subscribers:
+                            self._thread = None
+                            break
+                    try:
+                        payload = self.produce()
+                    except Exception as e:
+                        self.last_error = e
+                        print("Frame producer error, stopping the broadcast:", repr(e))
+                        self._drop_all()
+                        break
+                    if payload is None:
+                        continue
+                    with self._cond:
+                        self._seq += 1
+                        self._latest = payload
+                        self.frames_produced += 1
+                        self._cond.notify_all()
+            finally:
+                with self._cond:
+                    if self._thread is me:
+                        self._thread = None
+                if self.on_stop is not None:
+                    self.on_stop()
@@ -0,0 +1,128 @@
+import threading
+import time
+
+
+# ----------------- LATEST-FRAME BUFFER -----------------
+class LatestFrameBuffer:
+    """Small ring of frame slots where readers always get the newest frame.
+
+    The writer never blocks: it overwrites the oldest slot. A reader asks for
+    anything newer than the last sequence number it saw, so frames that were
+    overwritten before being read are counted as dropped.
+    """
+
+    def __init__(self, size=2):
+        if size < 1:
+            raise ValueError("buffer size must be at least 1")
+        self.size = size
+        self._slots = [None] * size
+        self._seq = 0
+        self._cond = threading.Condition()
+        self.dropped = 0
+        self.consumed = 0
+
+    @property
+    def seq(self):
+        return self._seq
+
+    def put(self, frame, timestamp=None):
+        """Store a frame in the next slot and wake up waiting readers."""
+        if timestamp is None:
+            timestamp = time.time()
+        with self._cond:
+            self._seq += 1
+            self._slots[self._seq % self.size] = (self._seq, timestamp, frame)
+            self._cond.notify_all()
+        return self._seq
+
+    def get_latest(self, last_seq=0, timeout=None):
+        """Return (seq, timestamp, frame) newer than last_seq, or None on timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > last_seq, timeout):
+                return None
+            entry = self._slots[self._seq % self.size]
+            if last_seq:
+                self.dropped += entry[0] - last_seq - 1
+            self.consumed += 1
+            return entry
+
+
+# ----------------- CAPTURE THREAD -----------------
+class CaptureThread:
+    """Reads frames from a cv2.VideoCapture-like source on its own thread."""
+
+    def __init__(self, cap, buffer_size=2, retry_delay=0.01):
+        self.cap = cap
+        self.buffer = LatestFrameBuffer(buffer_size)
+        self.retry_delay = retry_delay
+        self.frames_read = 0
+        self.read_failures = 0
+        self.captured_at = None
+        self._last_seq = 0
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._running = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._running.is_set()
+
+    def start(self):
+        if self.running:
+            return self
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="capture", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def read_latest(self, last_seq=0, timeout=0.5):
+        return self.buffer.get_latest(last_seq, timeout)
+
+    def read(self, timeout=0.5):
+        """VideoCapture-style read of the newest frame not returned yet.
+
+        Lets the thread stand in for the camera (e.g. in GesturePipeline).
+        Returns (False, None) when no new frame arrives within timeout;
+        captured_at is the time.time() the returned frame was read.
+        """
+        latest = self.buffer.get_latest(self._last_seq, timeout)
+        if latest is None:
+            return False, None
+        self._last_seq, self.captured_at, frame = latest
+        return True, frame
+
+    def release(self):
+        self.stop()
+        self.cap.release()
+
+    def set(self, prop, value):
+        """Queue a capture property change; the reader thread applies it before its next read."""
+        with self._pending_lock:
+            self._pending[prop] = value
+        return True
+
+    def _apply_pending(self):
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for prop, value in pending.items():
+            self.cap.set(prop, value)
+
+    def _run(self):
+        while self._running.is_set():
+            if self._pending:
+                self._apply_pending()
+            success, frame = self.cap.read()
+            if not success:
+                self.read_failures += 1
+                # small sleep to avoid busy loop if camera fails
+                time.sleep(self.retry_delay)
+                continue
+            self.frames_read += 1
+            self.buffer.put(frame)
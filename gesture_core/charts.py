@@ -0,0 +1,40 @@
+"""Plotly figures for the dashboards, built from a HistoryBuffer.
+
+plotly is imported on the first call, so importing this module (and the
+benchmarks that time it) does not need plotly installed.
+"""
+
+
+def distance_chart(history, min_dist, max_dist):
+    """Live distance line (seconds before now on x) with the calibration limits; None when empty."""
+    if not len(history):
+        return None
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+
+    times = history.times()
+    fig.add_trace(go.Scatter(
+        x=times - times[-1],
+        y=history.ordered("distance"),
+        mode='lines',
+        name='Distance',
+        line=dict(color='#667eea', width=2),
+        fill='tozeroy',
+        fillcolor='rgba(102, 126, 234, 0.2)'
+    ))
+    fig.add_hline(y=min_dist, line_dash="dash", line_color="#f093fb", annotation_text="Min")
+    fig.add_hline(y=max_dist, line_dash="dash", line_color="#38ef7d", annotation_text="Max")
+
+    fig.update_layout(
+        title='Live Distance Monitor',
+        xaxis_title='Time (s)',
+        yaxis_title='Distance (px)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#ffffff'),
+        height=300,
+        margin=dict(l=0, r=0, t=30, b=0)
+    )
+
+    return fig
@@ -0,0 +1,246 @@
+"""Template-matching gesture classifier over normalized landmarks.
+
+    python -m gesture_core.classifier open=sessions/open.gvcrec pinched=sessions/pinch.gvcrec --out my_gestures.npz
+
+Landmarks are made independent of where the hand is, how large it appears
+and how it is tilted: translated to the wrist, rotated so the wrist ->
+middle knuckle axis points up and scaled by that palm length. Every step is
+an array operation over a (N, 21, 3) batch, so recorded sessions are
+scored in bulk instead of frame by frame.
+
+A classifier holds labelled templates and their per-class centroids. The
+"centroid" method picks the nearest centroid; "knn" takes a distance
+weighted vote of the k nearest templates. Templates come from the bundled
+synthetic dataset, from .npz files saved with save(), or from recordings
+made with gesture_core.recorder (one gesture per recording).
+
+Until templates from real hands exist, the apps keep their original
+get_hand_state() rules (HeuristicClassifier); app_classifier() switches to
+template matching once a template file is given.
+"""
+import argparse
+
+import numpy as np
+
+from gesture_core.features import MIDDLE_MCP, WRIST, compute_features, reference_pixels
+from gesture_core.recorder import open_session
+from gesture_core.synthetic import GESTURES, synthetic_hands
+
+
+# ----------------- NORMALIZATION -----------------
+def normalize_landmarks(points, img_shape=(480, 640)):
+    """(..., 21, 3) normalized landmarks -> (..., 42) position/scale/rotation-free features."""
+    h, w = img_shape[:2]
+    pts = np.asarray(points, dtype=np.float32)
+    xy = pts[..., :2] * np.array([w / h, 1.0], dtype=np.float32)  # square pixels
+    xy = xy - xy[..., WRIST:WRIST + 1, :]
+    axis = xy[..., MIDDLE_MCP, :]
+    palm = np.maximum(np.linalg.norm(axis, axis=-1), 1e-6)
+    # rotate so the palm axis points to -y (up in the image)
+    cos = -axis[..., 1] / palm
+    sin = -axis[..., 0] / palm
+    x = xy[..., 0] * cos[..., None] - xy[..., 1] * sin[..., None]
+    y = xy[..., 0] * sin[..., None] + xy[..., 1] * cos[..., None]
+    out = np.stack([x, y], axis=-1) / palm[..., None, None]
+    return out.reshape(out.shape[:-2] + (42,))
+
+
+# ----------------- CLASSIFIER -----------------
+class GestureClassifier:
+    """Nearest-centroid or k-nearest-template classifier over normalize_landmarks() vectors."""
+
+    def __init__(self, classes=GESTURES, method="knn", k=5, img_shape=(480, 640), chunk=4096):
+        if method not in ("knn", "centroid"):
+            raise ValueError(f"unknown method {method!r}")
+        self.classes = tuple(classes)
+        self.method = method
+        self.k = k
+        self.img_shape = img_shape
+        self.chunk = chunk
+        self.templates = np.zeros((0, 42), dtype=np.float32)
+        self.labels = np.zeros(0, dtype=np.int64)
+        self.centroids = np.zeros((len(self.classes), 42), dtype=np.float32)
+        self._template_sq = np.zeros(0, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _label_ids(self, labels):
+        ids = []
+        for label in labels:
+            if isinstance(label, str):
+                if label not in self.classes:
+                    self.classes += (label,)
+                label = self.classes.index(label)
+            ids.append(int(label))
+        return np.asarray(ids, dtype=np.int64)
+
+    def add_templates(self, points, labels):
+        """Add raw landmark templates (N, 21, 3) with class names or indices."""
+        feats = normalize_landmarks(points, self.img_shape)
+        labels = np.broadcast_to(np.asarray(labels), (len(feats),))
+        self.add_features(feats, self._label_ids(labels.tolist()))
+        return self
+
+    def add_features(self, feats, label_ids):
+        self.templates = np.concatenate([self.templates, np.asarray(feats, dtype=np.float32)])
+        self.labels = np.concatenate([self.labels, np.asarray(label_ids, dtype=np.int64)])
+        self._refresh()
+
+    def add_recording(self, path, label):
+        """Use every hand frame of a recorder session as a template of one gesture."""
+        records = open_session(path)
+        hand = records["hand"]
+        return self.add_templates(records["landmarks"][hand], label)
+
+    def _refresh(self):
+        counts = np.bincount(self.labels, minlength=len(self.classes)).astype(np.float32)
+        sums = np.zeros((len(self.classes), 42), dtype=np.float32)
+        np.add.at(sums, self.labels, self.templates)
+        self.centroids = sums / np.maximum(counts, 1)[:, None]
+        self._centroid_sq = (self.centroids ** 2).sum(axis=1)
+        self._template_sq = (self.templates ** 2).sum(axis=1)
+        self._present = counts > 0
+
+    # ----------------- PREDICTION -----------------
+    def _sq_dist(self, feats, refs, refs_sq):
+        # |a - b|^2 = |a|^2 - 2ab + |b|^2, as one matrix product per chunk
+        d = (feats ** 2).sum(axis=1)[:, None] - 2 * feats @ refs.T + refs_sq[None, :]
+        return np.maximum(d, 0, out=d)
+
+    def _classify_features(self, feats):
+        if self.method == "centroid":
+            d = self._sq_dist(feats, self.centroids, self._centroid_sq)
+            d[:, ~self._present] = np.inf
+            return d.argmin(axis=1)
+        k = min(self.k, len(self.labels))
+        d = self._sq_dist(feats, self.templates, self._template_sq)
+        nearest = np.argpartition(d, k - 1, axis=1)[:, :k]
+        weights = 1.0 / (np.sqrt(np.take_along_axis(d, nearest, axis=1)) + 1e-3)
+        votes = np.zeros((len(feats), len(self.classes)), dtype=np.float32)
+        rows = np.arange(len(feats))
+        nearest_labels = self.labels[nearest]
+        for j in range(k):
+            votes[rows, nearest_labels[:, j]] += weights[:, j]
+        return votes.argmax(axis=1)
+
+    def classify(self, points, img_shape=None):
+        """Class indices for a batch of raw landmarks shaped (N, 21, 3).
+
+        img_shape is the frame the landmarks were detected on (default: the
+        template frame size); it undoes the aspect ratio, so hands from a
+        16:9 capture compare correctly with 4:3 templates.
+        """
+        if not len(self.labels):
+            raise ValueError("classifier has no templates")
+        feats = normalize_landmarks(points, img_shape or self.img_shape).reshape(-1, 42)
+        out = np.empty(len(feats), dtype=np.int64)
+        for start in range(0, len(feats), self.chunk):
+            out[start:start + self.chunk] = self._classify_features(feats[start:start + self.chunk])
+        return out
+
+    def classify_one(self, points, img_shape=None):
+        """Class name for a single (21, 3) hand."""
+        return self.classes[int(self.classify(np.asarray(points)[None], img_shape)[0])]
+
+    def accuracy(self, points, labels):
+        return float((self.classify(points) == np.asarray(labels)).mean())
+
+    # ----------------- PERSISTENCE -----------------
+    def save(self, path):
+        np.savez_compressed(path, templates=self.templates, labels=self.labels,
+                            classes=np.array(self.classes), img_shape=np.array(self.img_shape[:2]))
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        data = np.load(path)
+        kwargs.setdefault("img_shape", tuple(int(v) for v in data["img_shape"]))
+        clf = cls(classes=[str(c) for c in data["classes"]], **kwargs)
+        clf.add_features(data["templates"], data["labels"])
+        return clf
+
+
+# ----------------- HEURISTICS -----------------
+OPEN, CLOSED, PINCHED = (GESTURES.index(g) for g in ("open", "closed", "pinched"))
+
+
+def threshold_rule(points, img_shape=(480, 640)):
+    """The final project's rule: thumb-index and thumb-middle over 80 px = open, thumb-index under 40 = pinched.
+
+    Distances are in pixels of a 640-wide frame (features.reference_pixels),
+    as they were at the 640x480 the rule was tuned on.
+    """
+    d = reference_pixels(compute_features(points, img_shape)["tip_distances"], img_shape)
+    out = np.full(len(d), CLOSED)
+    out[d[:, 0, 1] < 40] = PINCHED
+    out[(d[:, 0, 1] > 80) & (d[:, 0, 2] > 80)] = OPEN
+    return out
+
+
+def finger_count_rule(points, img_shape=(480, 640)):
+    """Milestone 4's rule: 5 open fingers = open, 0-1 = closed, anything else = pinched."""
+    count = compute_features(points, img_shape)["open_count"]
+    out = np.full(len(count), PINCHED)
+    out[count >= 5] = OPEN
+    out[count <= 1] = CLOSED
+    return out
+
+
+class HeuristicClassifier:
+    """One of the apps' original hand-state rules behind the GestureClassifier interface."""
+
+    RULES = {"thresholds": threshold_rule, "fingers": finger_count_rule}
+
+    def __init__(self, rule="thresholds", img_shape=(480, 640)):
+        if rule not in self.RULES:
+            raise ValueError(f"unknown rule {rule!r}")
+        self.rule = rule
+        self.classes = GESTURES
+        self.img_shape = img_shape
+
+    def classify(self, points, img_shape=None):
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 21, 3)
+        return self.RULES[self.rule](points, img_shape or self.img_shape)
+
+    def classify_one(self, points, img_shape=None):
+        return self.classes[int(self.classify(np.asarray(points)[None], img_shape)[0])]
+
+
+def app_classifier(templates=None, rule="thresholds", method="knn"):
+    """What an app classifies with: templates from a saved file, else its original rule."""
+    if templates:
+        return GestureClassifier.load(templates, method=method)
+    return HeuristicClassifier(rule)
+
+
+def default_classifier(method="knn", templates=None, n=600, seed=0):
+    """Classifier from a saved template file, or from the bundled synthetic hands without one."""
+    if templates:
+        return GestureClassifier.load(templates, method=method)
+    clf = GestureClassifier(method=method)
+    points, labels = synthetic_hands(n, seed=seed)
+    clf.add_templates(points, [GESTURES[i] for i in labels])
+    return clf
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recordings", nargs="+", help="label=path pairs, e.g. open=sessions/open.gvcrec")
+    parser.add_argument("--out", default="gesture_templates.npz")
+    parser.add_argument("--no-synthetic", action="store_true", help="only use the recorded templates")
+    args = parser.parse_args()
+
+    clf = GestureClassifier() if args.no_synthetic else default_classifier()
+    for item in args.recordings:
+        label, sep, path = item.partition("=")
+        if not sep:
+            parser.error(f"expected label=path, got {item!r}")
+        before = len(clf)
+        clf.add_recording(path, label)
+        print(f"{label}: {len(clf) - before} templates from {path}")
+    clf.save(args.out)
+    print(f"saved {len(clf)} templates, classes {clf.classes} -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import cv2
+
+DEFAULT_QUALITY = 90
+
+
+# ----------------- ENCODE STATS -----------------
+class EncodeStats:
+    """Per-variant encode time and output size, for sizing viewer bandwidth.
+
+    slowest_ms() is the encode time of the most expensive variant viewers
+    asked for in the last active_for seconds.
+    """
+
+    def __init__(self, on_record=None, active_for=2.0):
+        self.on_record = on_record  # called with (encode_ms, size) for every encode
+        self.active_for = active_for
+        self._lock = threading.Lock()
+        self._variants = {}
+
+    def record(self, key, encode_ms, size):
+        if self.on_record is not None:
+            self.on_record(encode_ms, size)
+        with self._lock:
+            v = self._variants.setdefault(key, {"frames": 0, "encode_ms": 0.0, "bytes": 0.0})
+            v["frames"] += 1
+            v["last"] = time.monotonic()
+            # EMA keeps the numbers live without storing history
+            a = 0.1 if v["frames"] > 1 else 1.0
+            v["encode_ms"] += a * (encode_ms - v["encode_ms"])
+            v["bytes"] += a * (size - v["bytes"])
+
+    def slowest_ms(self):
+        cutoff = time.monotonic() - self.active_for
+        with self._lock:
+            return max((v["encode_ms"] for v in self._variants.values() if v["last"] >= cutoff), default=0.0)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                f"{w or 'full'}@q{q}": {"frames": v["frames"], "encode_ms": round(v["encode_ms"], 2),
+                                        "bytes_per_frame": int(v["bytes"])}
+                for (w, q), v in self._variants.items()
+            }
+
+
+# ----------------- ENCODED FRAME -----------------
+def normalize_variant(width, quality, frame_width):
+    """Clamp a client's request so the set of cached variants stays small."""
+    q = DEFAULT_QUALITY if quality is None else min(max(int(quality), 10), 95)
+    if width is None or int(width) >= frame_width:
+        return None, q
+    w = max(int(width) // 32 * 32, 96)
+    return w, q
+
+
+class EncodedFrame:
+    """One processed frame plus its JPEG encodings, each made at most once.
+
+    Viewers ask for a (width, quality) variant; the first viewer to ask pays
+    for the encode and every other viewer of the same variant reuses the
+    bytes. Nothing is encoded unless somebody asks.
+    """
+
+    def __init__(self, frame, stats=None):
+        self.frame = frame
+        self.stats = stats
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def jpeg(self, width=None, quality=None):
+        key = normalize_variant(width, quality, self.frame.shape[1])
+        with self._lock:
+            data = self._cache.get(key)
+            if data is None:
+                data = self._encode(*key)
+                self._cache[key] = data
+        return data
+
+    def _encode(self, width, quality):
+        start = time.perf_counter()
+        img = self.frame
+        if width is not None:
+            h, w = img.shape[:2]
+            img = cv2.resize(img, (width, int(h * width / w)), interpolation=cv2.INTER_AREA)
+        ok, buffer = cv2.imencode('.jpg', img, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+        data = buffer.tobytes() if ok else b""
+        if self.stats is not None:
+            self.stats.record((width, quality), (time.perf_counter() - start) * 1000, len(data))
+        return data
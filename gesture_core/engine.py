@@ -0,0 +1,187 @@
+"""Run hand inference for several video sources in parallel processes.
+
+    python -m gesture_core.engine 0 kiosk2.mp4 rtsp://127.0.0.1:8554/cam3 --duration 30
+
+Each source gets its own worker process with its own Hands instance
+(optionally pinned to a CPU core), so throughput scales with cores instead
+of being capped by the GIL. Workers push small event dicts -- never frames --
+into one shared queue that the parent reads as a merged event stream.
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import time
+
+import numpy as np
+
+STATS_INTERVAL = 2.0
+# a live source (webcam, stream, looping file) gives up after this many failed reads in a row
+MAX_READ_FAILURES = 100
+RETRY_DELAY = 0.05
+
+
+# ----------------- WORKER -----------------
+def pin_to_core(core):
+    """Best effort CPU pinning; only supported where os.sched_setaffinity exists."""
+    if core is None or not hasattr(os, "sched_setaffinity"):
+        return False
+    try:
+        os.sched_setaffinity(0, {core})
+        return True
+    except OSError:
+        return False
+
+
+def _worker(source_id, source, core, events, stop, max_num_hands, loop):
+    # heavy imports happen in the child so the parent stays light
+    import cv2
+    import mediapipe as mp
+    from gesture_core.features import hand_features
+    from gesture_core.sources import is_live, open_source
+
+    pinned = pin_to_core(core)
+    cap = open_source(source, loop=loop)
+    if not cap.isOpened():
+        events.put({"type": "error", "source": source_id, "message": f"could not open {source}"})
+        return
+
+    live = is_live(cap)
+    latencies = []
+    frames = hands_seen = read_failures = failed_in_row = 0
+    window_start = time.perf_counter()
+    with mp.solutions.hands.Hands(max_num_hands=max_num_hands) as hands:
+        while not stop.is_set():
+            ok, frame = cap.read()
+            if not ok:
+                # a finite file has ended; a live source gets retried, up to a point
+                if not live:
+                    break
+                read_failures += 1
+                failed_in_row += 1
+                if failed_in_row >= MAX_READ_FAILURES:
+                    events.put({"type": "error", "source": source_id,
+                                "message": f"{failed_in_row} failed reads in a row from {source}"})
+                    break
+                stop.wait(RETRY_DELAY)
+                continue
+            failed_in_row = 0
+            start = time.perf_counter()
+            frame = cv2.flip(frame, 1)
+            result = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            frames += 1
+
+            event = {"type": "frame", "source": source_id, "seq": frames, "ts": time.time(), "hand": False}
+            if result.multi_hand_landmarks:
+                hands_seen += 1
+                features = hand_features(result.multi_hand_landmarks[0], frame.shape)
+                event.update(hand=True, pinch=features.pinch, pinch_norm=features.pinch_norm,
+                             open_count=features.open_count)
+            latencies.append((time.perf_counter() - start) * 1000)
+            event["latency_ms"] = latencies[-1]
+            events.put(event)
+
+            elapsed = time.perf_counter() - window_start
+            if elapsed >= STATS_INTERVAL:
+                events.put(_stats(source_id, latencies, elapsed, hands_seen, pinned, core))
+                latencies, hands_seen, window_start = [], 0, time.perf_counter()
+    cap.release()
+    events.put({"type": "done", "source": source_id, "frames": frames, "read_failures": read_failures})
+
+
+def _stats(source_id, latencies, elapsed, hands_seen, pinned, core):
+    arr = np.asarray(latencies)
+    p50, p95 = np.percentile(arr, [50, 95]) if arr.size else (0.0, 0.0)
+    return {
+        "type": "stats", "source": source_id, "ts": time.time(),
+        "fps": round(arr.size / elapsed, 2), "p50_ms": round(float(p50), 2), "p95_ms": round(float(p95), 2),
+        "hand_ratio": round(hands_seen / arr.size, 3) if arr.size else 0.0,
+        "core": core if pinned else None,
+    }
+
+
+# ----------------- ENGINE -----------------
+class MultiSourceEngine:
+    """Owns one inference process per source and merges their events."""
+
+    def __init__(self, sources, cores=None, max_num_hands=1, loop=False):
+        self.sources = list(sources)
+        if cores is None:
+            count = os.cpu_count() or 1
+            cores = [i % count for i in range(len(self.sources))]
+        self.cores = list(cores)
+        self.max_num_hands = max_num_hands
+        self.loop = loop
+        self.stats = {}
+        self._ctx = multiprocessing.get_context("spawn")
+        self._events = self._ctx.Queue(maxsize=1024)
+        self._stop = self._ctx.Event()
+        self._procs = []
+
+    def start(self):
+        for i, source in enumerate(self.sources):
+            core = self.cores[i] if i < len(self.cores) else None
+            proc = self._ctx.Process(target=_worker, name=f"gesture-worker-{i}", daemon=True,
+                                     args=(i, source, core, self._events, self._stop, self.max_num_hands, self.loop))
+            proc.start()
+            self._procs.append(proc)
+        return self
+
+    def events(self, timeout=0.5):
+        """Yield events from all sources until every worker has finished."""
+        running = set(range(len(self._procs)))
+        while running:
+            try:
+                event = self._events.get(timeout=timeout)
+            except queue.Empty:
+                running = {i for i in running if self._procs[i].is_alive()}
+                continue
+            if event["type"] == "stats":
+                self.stats[event["source"]] = event
+            elif event["type"] in ("done", "error"):
+                running.discard(event["source"])
+            yield event
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        for proc in self._procs:
+            proc.join(timeout)
+            if proc.is_alive():
+                proc.terminate()
+        self._procs = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="+", help="camera indices, video files or stream URLs")
+    parser.add_argument("--cores", help="comma separated core per source, e.g. 0,1,2")
+    parser.add_argument("--duration", type=float, default=0, help="stop after N seconds (0 = until sources end)")
+    parser.add_argument("--loop", action="store_true", help="rewind recorded sources at the end")
+    args = parser.parse_args()
+
+    cores = [int(c) for c in args.cores.split(",")] if args.cores else None
+    engine = MultiSourceEngine(args.sources, cores=cores, loop=args.loop).start()
+    started = time.time()
+    frames = 0
+    try:
+        for event in engine.events():
+            if event["type"] == "frame":
+                frames += 1
+            elif event["type"] == "stats":
+                print(f"[{event['source']}] {event['fps']:6.1f} FPS  p50 {event['p50_ms']:.1f} ms  "
+                      f"p95 {event['p95_ms']:.1f} ms  hand {event['hand_ratio']:.0%}  core {event['core']}")
+            elif event["type"] == "error":
+                print(f"[{event['source']}] {event['message']}")
+            if args.duration and time.time() - started >= args.duration:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.stop()
+    elapsed = time.time() - started
+    print(f"{frames} frames from {len(args.sources)} sources in {elapsed:.1f}s "
+          f"({frames / elapsed if elapsed else 0:.1f} FPS total)")
+
+
+if __name__ == "__main__":
+    main()
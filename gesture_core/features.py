@@ -0,0 +1,110 @@
+import numpy as np
+
+# MediaPipe hand landmark ids
+WRIST = 0
+THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP = 4, 8, 12, 16, 20
+MIDDLE_MCP = 9
+TIP_IDS = np.array([THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP])
+# joint each tip is compared with to decide whether the finger is extended
+PIP_IDS = np.array([3, 6, 10, 14, 18])
+FINGER_NAMES = ("thumb", "index", "middle", "ring", "pinky")
+# pixel limits (min/max pinch distance) are calibrated on a 640-wide frame
+REFERENCE_WIDTH = 640
+# default limits of the Streamlit apps and the daemon (milestone 3 uses 10 / 150)
+MIN_DIST, MAX_DIST = 25, 160
+
+
+# ----------------- CONVERSION -----------------
+def landmarks_to_array(hand_landmarks):
+    """Copy a MediaPipe NormalizedLandmarkList into a (21, 3) float32 array once."""
+    lms = hand_landmarks.landmark
+    flat = np.fromiter((v for lm in lms for v in (lm.x, lm.y, lm.z)), dtype=np.float32, count=3 * len(lms))
+    return flat.reshape(-1, 3)
+
+
+def write_landmarks(hand_landmarks, points):
+    """Copy a (21, 3) array back into a landmark list (e.g. after smoothing)."""
+    for lm, (x, y, z) in zip(hand_landmarks.landmark, points.tolist()):
+        lm.x, lm.y, lm.z = x, y, z
+
+
+# ----------------- FEATURES -----------------
+def compute_features(points, img_shape):
+    """Vectorised features for one (21, 3) hand or a batch shaped (N, 21, 3).
+
+    points are normalized landmark coordinates; img_shape gives the pixel
+    scale. Returns a dict of arrays whose leading dimensions match the batch:
+    px (21, 2) pixel coordinates, tip_distances (5, 5) pixel distances
+    between fingertips, extended (5,) finger states, open_count, palm_size
+    (wrist to middle-finger knuckle), pinch (thumb-index pixels) and
+    pinch_norm (pinch / palm_size, independent of distance to the camera).
+    """
+    h, w = img_shape[:2]
+    pts = np.asarray(points, dtype=np.float32)
+    px = pts[..., :2] * np.array([w, h], dtype=np.float32)
+
+    tips = px[..., TIP_IDS, :]
+    diff = tips[..., :, None, :] - tips[..., None, :, :]
+    tip_distances = np.sqrt((diff * diff).sum(axis=-1))
+
+    extended = np.empty(pts.shape[:-2] + (5,), dtype=bool)
+    # thumb opens sideways (mirrored frame), the other fingers upwards
+    extended[..., 0] = px[..., THUMB_TIP, 0] > px[..., PIP_IDS[0], 0]
+    extended[..., 1:] = px[..., TIP_IDS[1:], 1] < px[..., PIP_IDS[1:], 1]
+
+    palm_size = np.linalg.norm(px[..., MIDDLE_MCP, :] - px[..., WRIST, :], axis=-1)
+    pinch = tip_distances[..., 0, 1]
+    return {
+        "px": px,
+        "tip_distances": tip_distances,
+        "extended": extended,
+        "open_count": extended.sum(axis=-1),
+        "palm_size": palm_size,
+        "pinch": pinch,
+        "pinch_norm": pinch / np.maximum(palm_size, 1e-6),
+    }
+
+
+class HandFeatures:
+    """Features of a single detected hand, computed once per frame."""
+
+    __slots__ = ("points", "px", "tip_distances", "extended", "open_count", "palm_size", "pinch", "pinch_norm")
+
+    def __init__(self, points, img_shape):
+        self.points = points
+        feats = compute_features(points, img_shape)
+        self.px = feats["px"]
+        self.tip_distances = feats["tip_distances"]
+        self.extended = feats["extended"]
+        self.open_count = int(feats["open_count"])
+        self.palm_size = float(feats["palm_size"])
+        self.pinch = float(feats["pinch"])
+        self.pinch_norm = float(feats["pinch_norm"])
+
+    def xy(self, landmark_id):
+        """Integer pixel position of a landmark, ready for cv2 drawing calls."""
+        x, y = self.px[landmark_id]
+        return int(x), int(y)
+
+    def distance(self, a, b):
+        return float(np.hypot(*(self.px[a] - self.px[b])))
+
+
+def reference_pixels(distance, img_shape):
+    """Rescale a pixel distance to a REFERENCE_WIDTH-wide frame.
+
+    The capture resolution can change at runtime (gesture_core.profiles); the
+    same pinch then spans half the pixels at 320x240 and twice as many at
+    1280x720. Comparing the rescaled distance with the calibrated limits keeps
+    the gesture-to-volume mapping the same at every resolution.
+    """
+    return distance * REFERENCE_WIDTH / img_shape[1]
+
+
+def distance_to_percent(distance, min_dist=MIN_DIST, max_dist=MAX_DIST):
+    """Pinch distance (reference pixels) -> 0-100 %, clamped at the limits; every app maps volume with this."""
+    return float(np.interp(np.clip(distance, min_dist, max_dist), [min_dist, max_dist], [0, 100]))
+
+
+def hand_features(hand_landmarks, img_shape):
+    return HandFeatures(landmarks_to_array(hand_landmarks), img_shape)
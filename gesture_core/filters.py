@@ -0,0 +1,106 @@
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+
+# ----------------- ONE-EURO FILTER -----------------
+# Landmark smoothing shared by every loop. Landmarks are normalized (0-1), so a
+# moving hand's coordinates change by roughly 0.5-2 per second: beta 10 raises the
+# cutoff enough while it moves (a hand sweeping at 0.8 Hz: lag_ms ~40, one frame
+# at 30 FPS), and min_cutoff 1.5 holds a resting hand still. beta 0.05 barely
+# adapts on this scale and leaves ~150 ms of lag.
+LANDMARK_MIN_CUTOFF = 1.5
+LANDMARK_BETA = 10.0
+
+
+class OneEuroFilter:
+    """Adaptive low-pass filter (Casiez et al., "1 Euro Filter") over an array of values.
+
+    Every element is filtered independently, so one instance smooths all 21x3
+    landmark coordinates at once. Slow movements get a low cutoff (less
+    jitter); fast movements raise the cutoff through beta (less lag).
+    """
+
+    def __init__(self, min_cutoff=LANDMARK_MIN_CUTOFF, beta=LANDMARK_BETA, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.lag_ms = 0.0
+        self._x = None
+        self._dx = None
+        self._t = None
+
+    def reset(self):
+        self._x = self._dx = self._t = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, x, t=None):
+        t = time.perf_counter() if t is None else t
+        x = np.asarray(x, dtype=np.float32)
+        if self._x is None or self._x.shape != x.shape or t <= self._t:
+            self._x, self._dx, self._t = x.copy(), np.zeros_like(x), t
+            return self._x.copy()
+        dt = t - self._t
+        self._t = t
+
+        dx = (x - self._x) / dt
+        self._dx += self._alpha(self.d_cutoff, dt) * (dx - self._dx)
+        cutoff = self.min_cutoff + self.beta * np.abs(self._dx)
+        a = 1.0 / (1.0 + 1.0 / (2 * np.pi * cutoff * dt))
+        self._x += a * (x - self._x)
+        # time constant of the average cutoff ~ delay the filter adds right now
+        self.lag_ms = 1000.0 / (2 * math.pi * float(cutoff.mean()))
+        return self._x.copy()
+
+
+# ----------------- HYSTERESIS -----------------
+class Hysteresis:
+    """Holds the output until the input leaves a band around it."""
+
+    def __init__(self, band=3.0):
+        self.band = band
+        self.value = None
+
+    def reset(self):
+        self.value = None
+
+    def __call__(self, x):
+        if self.value is None or abs(x - self.value) > self.band:
+            self.value = x
+        return self.value
+
+
+# ----------------- WRITE RATE -----------------
+class WriteRateMeter:
+    """Counts how many volume writes a stream of levels would cause per second.
+
+    Uses the same rule as the actuator (change larger than min_change), so
+    feeding it raw and filtered levels side by side shows what the filter saves.
+    """
+
+    def __init__(self, min_change=2.0, window=5.0):
+        self.min_change = min_change
+        self.window = window
+        self.total = 0
+        self._last = None
+        self._times = deque()
+
+    def __call__(self, level, t=None):
+        t = time.perf_counter() if t is None else t
+        if self._last is None or abs(level - self._last) > self.min_change:
+            self._last = level
+            self.total += 1
+            self._times.append(t)
+        cutoff = t - self.window
+        while self._times and self._times[0] < cutoff:
+            self._times.popleft()
+
+    @property
+    def per_second(self):
+        return len(self._times) / self.window
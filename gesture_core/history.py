@@ -0,0 +1,65 @@
+import time
+
+import numpy as np
+
+
+# ----------------- RING BUFFER -----------------
+class HistoryBuffer:
+    """Preallocated ring of timestamped float samples for several named series.
+
+    append() writes in place (no per-frame allocation). ordered() returns the
+    samples oldest-first: a plain view while the ring has not wrapped, and a
+    copy of the two halves concatenated afterwards. Use views() to get the two
+    zero-copy halves when even that copy matters.
+    """
+
+    def __init__(self, capacity, fields=("distance", "volume"), dtype=np.float32):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = int(capacity)
+        self.fields = tuple(fields)
+        self._times = np.zeros(self.capacity, dtype=np.float64)
+        self._data = np.zeros((len(self.fields), self.capacity), dtype=dtype)
+        self._index = {name: i for i, name in enumerate(self.fields)}
+        self._head = 0  # next slot to write
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @classmethod
+    def for_duration(cls, seconds, fps=30, **kwargs):
+        return cls(int(seconds * fps), **kwargs)
+
+    def append(self, *values, timestamp=None):
+        head = self._head
+        self._times[head] = time.time() if timestamp is None else timestamp
+        self._data[:, head] = values
+        self._head = (head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    def last(self, field):
+        if not self._count:
+            return None
+        return self._data[self._index[field], self._head - 1].item()
+
+    def views(self, field=None):
+        """Return (older, newer) zero-copy slices of a field (or the timestamps)."""
+        series = self._times if field is None else self._data[self._index[field]]
+        if self._count < self.capacity:
+            return series[:0], series[:self._count]
+        return series[self._head:], series[:self._head]
+
+    def ordered(self, field=None):
+        older, newer = self.views(field)
+        if not older.size:
+            return newer
+        return np.concatenate((older, newer))
+
+    def times(self):
+        return self.ordered(None)
@@ -0,0 +1,145 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# latency buckets in milliseconds
+DEFAULT_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 20, 33, 50, 75, 100, 250, 500, 1000)
+
+
+# ----------------- METRIC TYPES -----------------
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name, self.help = name, help_text
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def samples(self):
+        return [(self.name, "", self.value)]
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name, help_text, fn=None):
+        self.name, self.help = name, help_text
+        self.fn = fn
+        self.value = 0.0
+
+    def set(self, value):
+        self.value = value
+
+    def samples(self):
+        return [(self.name, "", self.fn() if self.fn is not None else self.value)]
+
+
+class CallbackCounter(Gauge):
+    """Counter whose value is read from existing state at scrape time (no per-event cost)."""
+
+    kind = "counter"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS_MS):
+        self.name, self.help = name, help_text
+        self.bounds = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe((time.perf_counter() - start) * 1000)
+
+    def samples(self):
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        out, running = [], 0
+        for bound, c in zip(self.bounds, counts):
+            running += c
+            out.append((self.name + "_bucket", f'le="{bound}"', running))
+        out.append((self.name + "_bucket", 'le="+Inf"', count))
+        out.append((self.name + "_sum", "", total))
+        out.append((self.name + "_count", "", count))
+        return out
+
+
+# ----------------- REGISTRY -----------------
+class MetricsRegistry:
+    """Holds the app's metrics and renders them in Prometheus text format."""
+
+    def __init__(self, prefix="gesture_"):
+        self.prefix = prefix
+        self._metrics = {}
+        self._last_snapshot = 0.0
+
+    def _add(self, metric):
+        metric.name = self.prefix + metric.name
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, fn=None):
+        return self._add(CallbackCounter(name, help_text, fn) if fn else Counter(name, help_text))
+
+    def gauge(self, name, help_text, fn=None):
+        return self._add(Gauge(name, help_text, fn))
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS_MS):
+        return self._add(Histogram(name, help_text, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                label_text = "{" + labels + "}" if labels else ""
+                lines.append(f"{name}{label_text} {float(value):g}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        data = {}
+        for metric in self._metrics.values():
+            if isinstance(metric, Histogram):
+                data[metric.name] = {"count": metric.count, "sum": round(metric.sum, 3),
+                                     "buckets": dict(zip([*map(str, metric.bounds), "+Inf"], metric.counts))}
+            else:
+                data[metric.name] = metric.samples()[0][2]
+        return data
+
+    def write_snapshot(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"timestamp": time.time(), "metrics": self.snapshot()}, f, indent=2)
+        os.replace(tmp, path)
+
+    def maybe_write_snapshot(self, path, interval=5.0):
+        """Write the snapshot at most every interval seconds; cheap to call every frame."""
+        now = time.monotonic()
+        if now - self._last_snapshot >= interval:
+            self._last_snapshot = now
+            self.write_snapshot(path)
+            return True
+        return False
@@ -0,0 +1,128 @@
+import time
+from collections import deque
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+
+def _no_hands():
+    return SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+
+
+# ----------------- MOTION GATE -----------------
+class MotionGate:
+    """Skips hand inference on a static scene with no hand around.
+
+    Every frame is shrunk to a small grey thumbnail (size, INTER_AREA, which
+    also averages out sensor noise) and compared with the previous one; the
+    scene is moving when more than min_fraction of its pixels changed by
+    more than pixel_threshold levels. While a hand was seen in the last
+    hold seconds, or the scene moved in that time, every frame goes to the
+    detector. Otherwise the gate is idle and only runs a probe inference
+    every probe_interval seconds (a hand held perfectly still still gets
+    picked up); skipped frames get an empty result.
+
+    Wraps anything with process(rgb), including RoiHandTracker and
+    InferenceScheduler; reset(), frame_done(), metrics() and close() are
+    passed on.
+    """
+
+    def __init__(self, detector, size=(64, 48), pixel_threshold=12, min_fraction=0.01,
+                 hold=2.0, probe_interval=1.0):
+        self.detector = detector
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.min_fraction = min_fraction
+        self.hold = hold
+        self.probe_interval = probe_interval
+        self.frames = 0
+        self.inferred = 0
+        self.probes = 0
+        self.skipped = 0
+        self.wakeups = 0
+        self.motion_fraction = 0.0
+        self.gate_ms = 0.0
+        self.wake_latencies_ms = deque(maxlen=100)
+        self._prev = None
+        self._diff = None
+        self._last_active = None
+        self._last_probe = 0.0
+        self._woke_at = None
+
+    @property
+    def idle(self):
+        return self._last_active is None or time.perf_counter() - self._last_active > self.hold
+
+    def reset(self):
+        self._prev = None
+        self._last_active = None
+        self._woke_at = None
+        if hasattr(self.detector, "reset"):
+            self.detector.reset()
+
+    def frame_done(self):
+        if hasattr(self.detector, "frame_done"):
+            self.detector.frame_done()
+
+    def close(self):
+        if hasattr(self.detector, "close"):
+            self.detector.close()
+
+    def _moving(self, rgb):
+        small = cv2.resize(rgb, self.size, interpolation=cv2.INTER_AREA)
+        luma = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+        if self._prev is None:
+            self._prev = luma
+            self._diff = np.empty_like(luma)
+            return True
+        cv2.absdiff(luma, self._prev, self._diff)
+        self._prev = luma
+        self.motion_fraction = np.count_nonzero(self._diff > self.pixel_threshold) / self._diff.size
+        return self.motion_fraction > self.min_fraction
+
+    def process(self, rgb):
+        start = time.perf_counter()
+        self.frames += 1
+        was_idle = self.idle
+        moving = self._moving(rgb)
+        self.gate_ms = (time.perf_counter() - start) * 1000
+
+        if moving:
+            if was_idle:
+                self.wakeups += 1
+                self._woke_at = start
+            self._last_active = start
+        elif was_idle:
+            if start - self._last_probe < self.probe_interval:
+                self.skipped += 1
+                return _no_hands()
+            self.probes += 1
+        if was_idle:
+            self._last_probe = start
+
+        result = self.detector.process(rgb)
+        self.inferred += 1
+        if result.multi_hand_landmarks:
+            self._last_active = time.perf_counter()
+            if self._woke_at is not None:
+                # motion onset -> first frame with a detected hand
+                self.wake_latencies_ms.append((self._last_active - self._woke_at) * 1000)
+                self._woke_at = None
+        return result
+
+    def metrics(self):
+        inner = self.detector.metrics() if hasattr(self.detector, "metrics") else {}
+        wake = self.wake_latencies_ms
+        return dict(inner, gate={
+            "idle": self.idle,
+            "frames": self.frames,
+            "inferred": self.inferred,
+            "skipped": self.skipped,
+            "probes": self.probes,
+            "wakeups": self.wakeups,
+            "skip_ratio": round(self.skipped / self.frames, 3) if self.frames else 0.0,
+            "motion_fraction": round(self.motion_fraction, 4),
+            "gate_ms": round(self.gate_ms, 3),
+            "wake_latency_ms": round(float(np.median(wake)), 1) if wake else None,
+        })
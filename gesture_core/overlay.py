@@ -0,0 +1,117 @@
+"""Frame overlays that only touch their own regions of the frame.
+
+The darkened metrics panel scales just its rectangle in place instead of
+blending a full copy of the frame. The final project's bar image is
+rendered once per frame size, copied in with a slice assignment and
+rebuilt only when its fill height changes. Milestone 4's small outlined
+bar stays plain cv2 drawing. Text is still drawn with cv2.putText: rasterising strings once
+and compositing the cached masks measured slower than OpenCV's own text
+drawing for these few short labels (see benchmarks/overlay_bench.py).
+"""
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+# ----------------- LAYERS -----------------
+class DimmedPanel:
+    """Darkens a rectangle in place: the same result as blending a black box at alpha."""
+
+    def __init__(self, top_left, bottom_right, alpha=0.7):
+        self.top_left = top_left
+        self.bottom_right = bottom_right
+        self.keep = 1.0 - alpha
+
+    def draw(self, frame):
+        (x1, y1), (x2, y2) = self.top_left, self.bottom_right
+        roi = frame[y1:y2 + 1, x1:x2 + 1]
+        cv2.convertScaleAbs(roi, roi, alpha=self.keep)
+
+
+class TextLine:
+    """A putText call whose string is only formatted again when its value changes."""
+
+    def __init__(self, fmt, org, scale, color, thickness=2):
+        self.fmt = fmt
+        self.org = org
+        self.scale = scale
+        self.color = color
+        self.thickness = thickness
+        self._value = object()
+        self.text = ""
+        self.rebuilt = 0
+
+    def draw(self, frame, value, org=None):
+        if value != self._value:
+            self._value = value
+            self.text = self.fmt.format(value)
+            self.rebuilt += 1
+        cv2.putText(frame, self.text, org or self.org, FONT, self.scale, self.color, self.thickness)
+
+
+# ----------------- FINAL PROJECT OVERLAY -----------------
+class MetricsOverlay:
+    """The final project's metrics panel and right-hand volume bar."""
+
+    def __init__(self):
+        self.panel = DimmedPanel((10, 10), (260, 150), alpha=0.7)
+        self.lines = [
+            TextLine("Distance: {}px", (20, 35), 0.6, (102, 126, 234)),
+            TextLine("Volume: {}%", (20, 60), 0.6, (240, 147, 251)),
+            TextLine("FPS: {}", (20, 85), 0.6, (56, 239, 125)),
+            TextLine("Gesture: {}", (20, 110), 0.6, (255, 199, 0)),
+        ]
+        self.bar_text = TextLine("{}%", None, 0.5, (255, 255, 255))
+        self._shape = None
+        self._fill = None
+
+    def _layout(self, shape):
+        h, w = shape[:2]
+        self._shape = shape
+        self.bar_width, self.bar_height = 30, h - 80
+        self.bar_x, self.bar_y = w - 45, 80
+        # the part of the bar rectangle that lies inside the frame
+        rows = max(min(self.bar_height + 1, h - self.bar_y), 0)
+        cols = max(min(self.bar_width + 1, w - self.bar_x), 0)
+        self._bar = np.empty((rows, cols, 3), dtype=np.uint8)
+        self._fill = None
+
+    def _bar_image(self, fill_height):
+        # background + fill, rebuilt only when the fill height changes
+        if fill_height != self._fill:
+            self._bar[:] = (50, 50, 50)
+            self._bar[max(self.bar_height - fill_height, 0):] = (102, 126, 234)
+            self._fill = fill_height
+        return self._bar
+
+    def draw(self, frame, dist, pct, fps, gesture):
+        if frame.shape != self._shape:
+            self._layout(frame.shape)
+        self.panel.draw(frame)
+        for line, value in zip(self.lines, (dist, int(pct), int(fps), gesture)):
+            line.draw(frame, value)
+
+        fill_height = int((pct / 100) * self.bar_height)
+        x, y = self.bar_x, self.bar_y
+        bar = self._bar_image(fill_height)
+        frame[y:y + bar.shape[0], x:x + bar.shape[1]] = bar
+        self.bar_text.draw(frame, int(pct), (x + 35, y + self.bar_height - fill_height + 10))
+        return frame
+
+
+# ----------------- MILESTONE 4 VOLUME BAR -----------------
+def draw_volume_bar(frame, pct):
+    """Milestone 4's outlined volume bar with a percentage label beside the fill.
+
+    Plain cv2 calls: pre-rendered patches measured no real gain for two
+    rectangles (0.9x-1.26x in benchmarks/overlay_bench.py runs).
+    """
+    h, w, _ = frame.shape
+    bar_h = int((pct / 100.0) * (h - 40))
+    x1, x2 = w - 40, w - 20
+    y2, y1 = h - 20, h - 20 - bar_h
+    cv2.rectangle(frame, (x1, 20), (x2, y2), (50, 50, 50), 2)
+    cv2.rectangle(frame, (x1 + 2, y1 + 2), (x2 - 2, y2 - 2), (0, 255, 128), -1)
+    cv2.putText(frame, f"{int(pct)}%", (x1 - 60, y1 + 15), FONT, 0.7, (0, 255, 255), 2)
+    return frame
@@ -0,0 +1,376 @@
+"""Shared capture -> detect -> actuate loop that runs with or without a UI.
+
+    python -m gesture_core.pipeline                                  # headless, default camera
+    python -m gesture_core.pipeline --source kiosk.mp4 --loop --duration 60 --stats 5
+    python -m gesture_core.pipeline --preview                        # same loop plus an OpenCV window
+    python -m gesture_core.pipeline --adaptive --target-ms 25        # trade resolution / FPS for latency
+    python -m gesture_core.pipeline --hands 2 --right balance         # left hand volume, right hand balance
+    python -m gesture_core.pipeline --shm                            # camera read in its own process
+
+Headless, a frame is only read, flipped, converted to RGB, run through
+hands.process and turned into a volume request for the VolumeActuator.
+Nothing is drawn, shown or encoded. A UI attaches a listener; listeners
+get every FrameResult and do their own drawing on the frame.
+"""
+import argparse
+import json
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from gesture_core.features import (INDEX_TIP, MAX_DIST, MIN_DIST, THUMB_TIP, HandFeatures, distance_to_percent,
+                                   landmarks_to_array, reference_pixels, write_landmarks)
+from gesture_core.filters import Hysteresis, OneEuroFilter
+from gesture_core.profiles import AdaptiveCaptureController, format_event
+from gesture_core.sources import is_live, open_source
+from gesture_core.tracking import DualHandControl, HandTracker
+from gesture_core.volume import MemoryBackend, VolumeActuator, default_backend
+
+def build_hands(max_num_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.5, roi=False, budget_ms=0,
+                motion_gate=False):
+    """A MediaPipe Hands detector, optionally behind ROI tracking, the inference scheduler and a motion gate."""
+    import mediapipe as mp
+    from gesture_core.motion import MotionGate
+    from gesture_core.roi import RoiHandTracker
+    from gesture_core.scheduler import InferenceScheduler
+
+    detector = mp.solutions.hands.Hands(max_num_hands=max_num_hands,
+                                        min_detection_confidence=min_detection_confidence,
+                                        min_tracking_confidence=min_tracking_confidence)
+    if roi:
+        detector = RoiHandTracker(detector, min_confidence=min_detection_confidence)
+    if budget_ms:
+        detector = InferenceScheduler(detector, budget_ms=budget_ms)
+    if motion_gate:
+        detector = MotionGate(detector)
+    return detector
+
+
+class FrameResult:
+    """What one pass of the loop produced; frame is the flipped BGR image.
+
+    raw_points are the first hand's landmarks before smoothing (None without
+    a hand, or in two-hand mode); read_ms and detect_ms time cap.read() and
+    detector.process().
+    """
+
+    __slots__ = ("seq", "frame", "results", "features", "distance", "percent", "latency_ms", "hands", "control",
+                 "raw_points", "read_ms", "detect_ms")
+
+    def __init__(self, seq, frame, results, features, distance, percent, latency_ms, hands=None, control=None,
+                 raw_points=None, read_ms=0.0, detect_ms=0.0):
+        self.seq = seq
+        self.frame = frame
+        self.results = results
+        self.features = features
+        self.distance = distance
+        self.percent = percent
+        self.latency_ms = latency_ms
+        self.hands = hands
+        self.control = control
+        self.raw_points = raw_points
+        self.read_ms = read_ms
+        self.detect_ms = detect_ms
+
+
+# ----------------- PIPELINE -----------------
+class GesturePipeline:
+    """Reads frames from cap, detects the hand and requests volume changes.
+
+    detector is anything with process(rgb) -> MediaPipe-style results. With
+    smoothing, the landmarks go through a One-Euro filter (the shared
+    LANDMARK_MIN_CUTOFF / LANDMARK_BETA settings, added delay in stats()
+    as lag_ms) and the volume through a 3% dead band. Listeners are
+    optional; without them the loop never touches the frame after
+    inference. A failed read on a live source (webcam, stream, looping
+    recording) is retried every retry_delay seconds; only a finite source
+    that runs out ends run(). live=None asks sources.is_live. A capture controller (see
+    gesture_core.profiles) gets the latency of every frame. With a
+    DualHandControl every detected hand is tracked under a stable id and
+    drives the control its role gives it, instead of only the first hand.
+    """
+
+    def __init__(self, cap, detector, actuator=None, min_dist=MIN_DIST, max_dist=MAX_DIST,
+                 smoothing=True, flip=True, window=300, capture_controller=None, dual_control=None,
+                 live=None, retry_delay=0.05):
+        self.cap = cap
+        self.live = is_live(cap) if live is None else live
+        self.retry_delay = retry_delay
+        self.read_failures = 0
+        self.detector = detector
+        self.actuator = actuator
+        self.capture_controller = capture_controller
+        self.dual_control = dual_control
+        self.hand_tracker = None
+        if dual_control is not None:
+            self.hand_tracker = HandTracker(smoothing=smoothing)
+        self._mute_toggles = 0
+        self.min_dist = min_dist
+        self.max_dist = max_dist
+        self.smoothing = smoothing
+        self.flip = flip
+        self.landmark_filter = OneEuroFilter()
+        self.volume_hysteresis = Hysteresis(band=3.0)
+        self.listeners = []
+        self.frames = 0
+        self.hand_frames = 0
+        self.latencies = deque(maxlen=window)
+        self._stop = threading.Event()
+        self._window = (time.perf_counter(), time.process_time(), 0)
+        self._rates = {"fps": 0.0, "cpu_percent": 0.0}
+
+    @property
+    def headless(self):
+        return not self.listeners
+
+    def attach(self, listener):
+        """listener(result) is called after every frame."""
+        self.listeners.append(listener)
+        return listener
+
+    def detach(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def stop(self):
+        self._stop.set()
+
+    def step(self):
+        """Process one frame; returns None when no frame could be read."""
+        read_start = time.perf_counter()
+        ok, frame = self.cap.read()
+        start = time.perf_counter()
+        if not ok:
+            # on a finite source this is just the end, not a failure
+            if self.live:
+                self.read_failures += 1
+            return None
+        if self.flip:
+            frame = cv2.flip(frame, 1)
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        detect_start = time.perf_counter()
+        results = self.detector.process(rgb)
+        detect_ms = (time.perf_counter() - detect_start) * 1000
+        self.frames += 1
+
+        features, distance, percent, hands, control, raw_points = None, 0, None, None, None, None
+        if self.dual_control is not None:
+            hands = self.hand_tracker.update(results)
+            control = self.dual_control.update(hands, frame.shape, self.hand_tracker.tracks)
+            if hands:
+                self.hand_frames += 1
+            features, distance, percent = control.get("features"), control.get("distance", 0), control["volume"]
+            if percent is None:
+                self.volume_hysteresis.reset()
+            elif self.smoothing:
+                percent = self.volume_hysteresis(percent)
+            if self.actuator is not None:
+                if percent is not None:
+                    self.actuator.request(percent)
+                # only a toggle gesture touches the mute switch, never the first frame
+                if self.dual_control.toggles != self._mute_toggles:
+                    self._mute_toggles = self.dual_control.toggles
+                    self.actuator.request_mute(control["muted"])
+        elif results.multi_hand_landmarks:
+            self.hand_frames += 1
+            hand_landmarks = results.multi_hand_landmarks[0]
+            points = raw_points = landmarks_to_array(hand_landmarks)
+            if self.smoothing:
+                points = self.landmark_filter(points)
+                write_landmarks(hand_landmarks, points)
+            features = HandFeatures(points, frame.shape)
+            distance = int(reference_pixels(features.pinch, frame.shape))
+            percent = distance_to_percent(distance, self.min_dist, self.max_dist)
+            if self.smoothing:
+                percent = self.volume_hysteresis(percent)
+            if self.actuator is not None:
+                self.actuator.request(percent)
+        else:
+            # start fresh when the hand comes back instead of gliding from the old spot
+            self.landmark_filter.reset()
+            self.volume_hysteresis.reset()
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.latencies.append(latency_ms)
+        if self.capture_controller is not None:
+            self.capture_controller.observe(latency_ms)
+        result = FrameResult(self.frames, frame, results, features, distance, percent, latency_ms, hands, control,
+                             raw_points, (start - read_start) * 1000, detect_ms)
+        for listener in list(self.listeners):
+            listener(result)
+        # the scheduler / motion gate budget the whole frame, listeners' drawing included
+        frame_done = getattr(self.detector, "frame_done", None)
+        if frame_done:
+            frame_done()
+        return result
+
+    def run(self, duration=0, max_frames=0, stats_interval=0, on_stats=None):
+        """Loop until the source ends, stop() is called or a limit is reached."""
+        self._stop.clear()
+        started = last_stats = time.perf_counter()
+        self._window = (started, time.process_time(), self.frames)
+        while not self._stop.is_set():
+            if self.step() is None:
+                if not self.live:
+                    break
+                # a webcam hiccup, or no new frame yet: wait instead of ending the daemon
+                self._stop.wait(self.retry_delay)
+            now = time.perf_counter()
+            if (max_frames and self.frames >= max_frames) or (duration and now - started >= duration):
+                break
+            if stats_interval and on_stats and now - last_stats >= stats_interval:
+                last_stats = now
+                on_stats(self.stats())
+        return self.stats()
+
+    def stats(self):
+        """FPS and process CPU use since the previous call, plus latency percentiles."""
+        wall, cpu, frames = time.perf_counter(), time.process_time(), self.frames
+        wall0, cpu0, frames0 = self._window
+        if wall - wall0 > 0 and frames > frames0:
+            self._rates = {
+                "fps": round((frames - frames0) / (wall - wall0), 2),
+                # all threads of the process, so the actuator thread is included
+                "cpu_percent": round(100 * (cpu - cpu0) / (wall - wall0), 1),
+            }
+            self._window = (wall, cpu, frames)
+        lat = np.asarray(self.latencies) if self.latencies else np.zeros(1)
+        p50, p95 = np.percentile(lat, [50, 95])
+        report = dict(self._rates, frames=self.frames, hand_ratio=round(self.hand_frames / max(self.frames, 1), 3),
+                      p50_ms=round(float(p50), 2), p95_ms=round(float(p95), 2), headless=self.headless,
+                      read_failures=self.read_failures)
+        if self.smoothing:
+            lag = self.landmark_filter.lag_ms
+            if self.hand_tracker is not None:
+                lags = [t.filter.lag_ms for t in self.hand_tracker.tracks if t.filter is not None]
+                lag = max(lags) if lags else 0.0
+            report["lag_ms"] = round(lag, 1)
+        if self.actuator is not None:
+            report.update(volume=round(self.actuator.level, 1), writes=self.actuator.writes)
+        if hasattr(self.detector, "metrics"):
+            report["detector"] = self.detector.metrics()
+        if self.capture_controller is not None:
+            report["capture"] = self.capture_controller.metrics()
+        if self.hand_tracker is not None:
+            report["tracking"] = dict(self.hand_tracker.metrics(), muted=self.dual_control.muted,
+                                      mute_toggles=self.dual_control.toggles)
+        return report
+
+    def close(self):
+        self.cap.release()
+        if self.actuator is not None:
+            self.actuator.stop()
+        close = getattr(self.detector, "close", None)
+        if close:
+            close()
+
+
+# ----------------- METRICS -----------------
+def register_metrics(pipeline, registry):
+    """Adds the loop's metrics to a MetricsRegistry, under the names milestone 3 serves at /metrics.
+
+    Counters read the pipeline's own totals; the returned listener feeds
+    the per-frame histograms, so attach it: pipeline.attach(register_metrics(...)).
+    """
+    read_hist = registry.histogram("capture_read_ms", "cap.read() time")
+    detect_hist = registry.histogram("detect_ms", "Landmark detection per frame")
+    registry.counter("frames_processed_total", "Frames run through the pipeline", fn=lambda: pipeline.frames)
+    registry.counter("frames_with_hand_total", "Processed frames with a hand detected",
+                     fn=lambda: pipeline.hand_frames)
+    registry.counter("read_failures_total", "Failed camera reads", fn=lambda: pipeline.read_failures)
+    registry.gauge("hand_present_ratio", "Share of processed frames with a hand",
+                   fn=lambda: pipeline.hand_frames / pipeline.frames if pipeline.frames else 0.0)
+    if pipeline.capture_controller is not None:
+        registry.gauge("capture_profile_rung", "Current step on the capture ladder (0 = highest resolution)",
+                       fn=lambda: pipeline.capture_controller.index)
+
+    def observe(result):
+        read_hist.observe(result.read_ms)
+        detect_hist.observe(result.detect_ms)
+    return observe
+
+
+# ----------------- PREVIEW -----------------
+def preview_listener(pipeline, window="Gesture Volume Control"):
+    """An OpenCV window that draws the pinch line and volume; ESC stops the pipeline."""
+    def show(result):
+        frame = result.frame
+        if result.features is not None:
+            thumb, index = result.features.xy(THUMB_TIP), result.features.xy(INDEX_TIP)
+            cv2.line(frame, thumb, index, (0, 255, 0), 3)
+            cv2.putText(frame, f"Dist: {result.distance}px  Vol: {int(result.percent)}%", (10, 40),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 0, 0), 2)
+        cv2.imshow(window, frame)
+        if cv2.waitKey(1) & 0xFF == 27:
+            pipeline.stop()
+    return show
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", help="camera index, video file, image folder or glob (default: GESTURE_SOURCE or 0)")
+    parser.add_argument("--loop", action="store_true", help="rewind recorded sources at the end")
+    parser.add_argument("--duration", type=float, default=0, help="stop after N seconds (0 = run until stopped)")
+    parser.add_argument("--stats", type=float, default=5.0, help="print stats every N seconds (0 = only at the end)")
+    parser.add_argument("--roi", action="store_true", help="ROI-tracked inference")
+    parser.add_argument("--budget", type=float, default=0, help="inference scheduler frame budget in ms (0 = off)")
+    parser.add_argument("--motion-gate", action="store_true", help="skip inference on a static scene with no hand")
+    parser.add_argument("--shm", action="store_true", help="read the camera in a separate process, frames via shared memory")
+    parser.add_argument("--adaptive", action="store_true", help="step through capture profiles to hold --target-ms")
+    parser.add_argument("--target-ms", type=float, default=33.0, help="p90 frame latency the adaptive capture aims for")
+    parser.add_argument("--hands", type=int, default=1, help="hands to detect; 2+ tracks them and maps each to a control")
+    parser.add_argument("--right", choices=("mute", "balance"), default="mute", help="control of the right hand with --hands 2+")
+    parser.add_argument("--dry-run", action="store_true", help="drive an in-memory volume instead of the system's")
+    parser.add_argument("--preview", action="store_true", help="attach an OpenCV preview window")
+    parser.add_argument("--out", help="write the final stats to this JSON file")
+    args = parser.parse_args()
+
+    if args.hands > 1 and args.roi:
+        parser.error("--roi crops around a single hand; use it with --hands 1")
+    if args.shm and args.adaptive:
+        parser.error("--adaptive changes camera settings, which the --shm capture process owns")
+    if args.shm:
+        from gesture_core.shm_ring import open_ring_capture
+        cap = open_ring_capture(args.source, loop=args.loop)
+    else:
+        cap = open_source(args.source, loop=args.loop)
+    if not cap.isOpened():
+        parser.error(f"could not open source {args.source or 0}")
+    actuator = VolumeActuator(MemoryBackend() if args.dry_run else default_backend()).start()
+    controller = None
+    if args.adaptive:
+        controller = AdaptiveCaptureController(cap, target_ms=args.target_ms,
+                                               on_change=lambda event: print(format_event(event)))
+    dual_control = DualHandControl({"Left": "volume", "Right": args.right}) if args.hands > 1 else None
+    detector = build_hands(max_num_hands=args.hands, roi=args.roi, budget_ms=args.budget, motion_gate=args.motion_gate)
+    pipeline = GesturePipeline(cap, detector, actuator, capture_controller=controller, dual_control=dual_control)
+    if args.preview:
+        pipeline.attach(preview_listener(pipeline))
+
+    def report(stats):
+        gate = stats.get("detector", {}).get("gate")
+        print(f"{stats['fps']:6.1f} FPS  cpu {stats['cpu_percent']:5.1f}%  p50 {stats['p50_ms']:.1f} ms  "
+              f"p95 {stats['p95_ms']:.1f} ms  hand {stats['hand_ratio']:.0%}  volume {stats['volume']}%"
+              + (f"  {'idle' if gate['idle'] else 'active'}, {gate['skip_ratio']:.0%} skipped" if gate else ""))
+
+    try:
+        stats = pipeline.run(duration=args.duration, stats_interval=args.stats, on_stats=report)
+    except KeyboardInterrupt:
+        stats = pipeline.stats()
+    finally:
+        pipeline.close()
+        if args.preview:
+            cv2.destroyAllWindows()
+    report(stats)
+    if controller is not None:
+        stats["capture_events"] = controller.events
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(stats, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+class CaptureProfile:
+    """One rung of the capture ladder: resolution and frame rate requested from the camera."""
+
+    __slots__ = ("width", "height", "fps")
+
+    def __init__(self, width, height, fps):
+        self.width = width
+        self.height = height
+        self.fps = fps
+
+    @property
+    def name(self):
+        return f"{self.width}x{self.height}@{self.fps}"
+
+    def __repr__(self):
+        return f"CaptureProfile({self.name})"
+
+
+# best first; each rung is cheaper than the one above it
+DEFAULT_LADDER = (
+    CaptureProfile(1280, 720, 30),
+    CaptureProfile(960, 540, 30),
+    CaptureProfile(640, 480, 30),
+    CaptureProfile(640, 480, 15),
+    CaptureProfile(424, 240, 15),
+    CaptureProfile(320, 240, 10),
+)
+
+
+def apply_profile(cap, profile):
+    """Request a profile from a cv2.VideoCapture-like source; True if every property was accepted."""
+    results = [cap.set(cv2.CAP_PROP_FRAME_WIDTH, profile.width),
+               cap.set(cv2.CAP_PROP_FRAME_HEIGHT, profile.height),
+               cap.set(cv2.CAP_PROP_FPS, profile.fps)]
+    return all(results)
+
+
+def format_event(event):
+    stat = next(v for k, v in event.items() if k.startswith("p") and k.endswith("_ms"))
+    if event["from"] is None:
+        return f"capture profile {event['to']}"
+    return f"capture profile {event['from']} -> {event['to']} ({event['reason']}, {stat:.1f} ms)"
+
+
+# ----------------- ADAPTIVE CONTROLLER -----------------
+class AdaptiveCaptureController:
+    """Moves along a ladder of capture profiles to hold a per-frame latency target.
+
+    Feed it the pipeline latency of every frame with observe(). Every window
+    frames it takes the percentile of that window: above target_ms it steps
+    one rung down at once; below headroom * target_ms for up_after windows
+    in a row it steps one rung up. No change happens within cooldown seconds
+    of the previous one, so the camera has time to settle. Every change is
+    appended to events (and passed to on_change) as a dict.
+    """
+
+    def __init__(self, cap, ladder=DEFAULT_LADDER, target_ms=33.0, start=2, window=30, percentile=90,
+                 headroom=0.6, up_after=3, cooldown=2.0, on_change=None, clock=time.monotonic):
+        self.cap = cap
+        self.ladder = list(ladder)
+        self.target_ms = target_ms
+        self.window = window
+        self.percentile = percentile
+        self.headroom = headroom
+        self.up_after = up_after
+        self.cooldown = cooldown
+        self.on_change = on_change
+        self.clock = clock
+        self.index = min(start, len(self.ladder) - 1)
+        self.events = []
+        self.last_stat_ms = 0.0
+        self._samples = deque(maxlen=window)
+        self._good_windows = 0
+        self._last_change = None
+        self._change(self.index, "start", 0.0)
+
+    @property
+    def profile(self):
+        return self.ladder[self.index]
+
+    def _change(self, index, reason, stat_ms, now=None):
+        now = self.clock() if now is None else now
+        previous = self.profile.name if self.events else None
+        self.index = index
+        accepted = apply_profile(self.cap, self.profile)
+        event = {"t": round(now, 3), "from": previous, "to": self.profile.name, "reason": reason,
+                 f"p{self.percentile}_ms": round(stat_ms, 2), "accepted": accepted}
+        self.events.append(event)
+        self._last_change = now
+        self._samples.clear()
+        self._good_windows = 0
+        if self.on_change is not None:
+            self.on_change(event)
+        return event
+
+    def observe(self, latency_ms, now=None):
+        """Record one frame's latency; returns the change event when the profile changed."""
+        self._samples.append(latency_ms)
+        if len(self._samples) < self.window:
+            return None
+        now = self.clock() if now is None else now
+        stat = float(np.percentile(self._samples, self.percentile))
+        self.last_stat_ms = stat
+        self._samples.clear()
+        if now - self._last_change < self.cooldown:
+            return None
+
+        if stat > self.target_ms and self.index < len(self.ladder) - 1:
+            return self._change(self.index + 1, "over_target", stat, now)
+        if stat < self.headroom * self.target_ms and self.index > 0:
+            self._good_windows += 1
+            if self._good_windows >= self.up_after:
+                return self._change(self.index - 1, "headroom", stat, now)
+        else:
+            self._good_windows = 0
+        return None
+
+    def metrics(self):
+        return {"profile": self.profile.name, "rung": self.index, "changes": len(self.events) - 1,
+                "target_ms": self.target_ms, f"p{self.percentile}_ms": round(self.last_stat_ms, 2)}
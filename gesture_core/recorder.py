@@ -0,0 +1,133 @@
+"""Fixed-width binary recording of per-frame landmarks, read back with numpy.memmap.
+
+    python -m gesture_core.recorder sessions/2024-05-01.gvcrec
+
+File layout: a 64 byte header (magic, version, record size) followed by
+RECORD_DTYPE records. Records are buffered and written in chunks, so
+recording costs one write call per chunk rather than per frame; replay maps
+the file without loading it, so hours of sessions stay out of RAM.
+"""
+import argparse
+import os
+import struct
+import time
+
+import numpy as np
+
+MAGIC = b"GVCREC"
+VERSION = 1
+HEADER_SIZE = 64
+HANDEDNESS = {"Left": 0, "Right": 1}
+
+RECORD_DTYPE = np.dtype([
+    ("t", "<f8"),
+    ("landmarks", "<f4", (21, 3)),
+    ("distance", "<f4"),
+    ("volume", "<f4"),
+    ("handedness", "i1"),   # -1 no hand, 0 left, 1 right
+    ("hand", "?"),
+])
+
+
+def _header():
+    head = MAGIC + struct.pack("<HI", VERSION, RECORD_DTYPE.itemsize)
+    return head.ljust(HEADER_SIZE, b"\0")
+
+
+# ----------------- RECORDER -----------------
+class SessionRecorder:
+    """Appends one record per frame; records hit the disk every chunk_size frames."""
+
+    def __init__(self, path, chunk_size=256):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.frames = 0
+        self._chunk = np.zeros(chunk_size, dtype=RECORD_DTYPE)
+        self._n = 0
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new_file:
+            _check_header(path)
+        self._file = open(path, "ab")
+        if new_file:
+            self._file.write(_header())
+
+    def append(self, points=None, distance=0.0, volume=0.0, handedness=None, t=None):
+        rec = self._chunk[self._n]
+        rec["t"] = time.time() if t is None else t
+        if points is None:
+            rec["landmarks"] = 0
+            rec["hand"] = False
+            rec["handedness"] = -1
+        else:
+            rec["landmarks"] = points
+            rec["hand"] = True
+            rec["handedness"] = HANDEDNESS.get(handedness, -1)
+        rec["distance"] = distance
+        rec["volume"] = volume
+        self._n += 1
+        self.frames += 1
+        if self._n == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._n:
+            self._file.write(self._chunk[:self._n].tobytes())
+            self._file.flush()
+            self._n = 0
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ----------------- REPLAY -----------------
+def _check_header(path):
+    with open(path, "rb") as f:
+        head = f.read(HEADER_SIZE)
+    if not head.startswith(MAGIC):
+        raise ValueError(f"{path} is not a gesture session recording")
+    version, itemsize = struct.unpack_from("<HI", head, len(MAGIC))
+    if version != VERSION or itemsize != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path}: unsupported recording version {version} (record size {itemsize})")
+
+
+def open_session(path):
+    """Map a recording as a read-only structured array (a trailing partial record is ignored)."""
+    _check_header(path)
+    count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+
+
+def summarize(records):
+    if not len(records):
+        return {"frames": 0}
+    t = records["t"]
+    hand = records["hand"]
+    return {
+        "frames": int(len(records)),
+        "duration_s": round(float(t[-1] - t[0]), 2),
+        "hand_ratio": round(float(hand.mean()), 3),
+        "mean_distance": round(float(records["distance"][hand].mean()), 1) if hand.any() else 0.0,
+        "mean_volume": round(float(records["volume"][hand].mean()), 1) if hand.any() else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="recording files")
+    args = parser.parse_args()
+    for path in args.paths:
+        print(path, summarize(open_session(path)))
+
+
+if __name__ == "__main__":
+    main()
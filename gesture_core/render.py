@@ -0,0 +1,52 @@
+import time
+
+
+# ----------------- RENDER SCHEDULER -----------------
+class RenderScheduler:
+    """Throttles UI widget updates independently of the inference loop.
+
+    Each widget refreshes at most at its own rate (Hz; 0 means every frame)
+    and is skipped entirely when the value it would show has not changed
+    since its last render. Widgets without an explicit rate use default_hz.
+    """
+
+    def __init__(self, default_hz=5.0, **rates):
+        self.default_hz = default_hz
+        self.rates = rates
+        self.renders = {}
+        self.skipped = {}
+        self._last_time = {}
+        self._last_value = {}
+        self._rate_ema = {}
+
+    def set_rate(self, name, hz):
+        self.rates[name] = hz
+
+    def due(self, name, now=None):
+        """True when the widget's refresh interval has elapsed."""
+        hz = self.rates.get(name, self.default_hz)
+        if not hz:
+            return True
+        now = time.perf_counter() if now is None else now
+        # 10% slack so frame-time jitter does not push a widget to the next frame
+        return now - self._last_time.get(name, float("-inf")) >= 0.9 / hz
+
+    def update(self, name, value, render, now=None):
+        """Call render() if the widget is due and value changed (None always renders)."""
+        now = time.perf_counter() if now is None else now
+        if not self.due(name, now) or (value is not None and self._last_value.get(name) == value):
+            self.skipped[name] = self.skipped.get(name, 0) + 1
+            return False
+        render()
+        last = self._last_time.get(name)
+        if last is not None and now > last:
+            rate = 1.0 / (now - last)
+            self._rate_ema[name] = 0.9 * self._rate_ema.get(name, rate) + 0.1 * rate
+        self._last_time[name] = now
+        self._last_value[name] = value
+        self.renders[name] = self.renders.get(name, 0) + 1
+        return True
+
+    def rate(self, name):
+        """Measured refresh rate of a widget in Hz."""
+        return self._rate_ema.get(name, 0.0)
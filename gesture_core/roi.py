@@ -0,0 +1,131 @@
+import numpy as np
+
+from gesture_core.features import landmarks_to_array
+
+
+def crop_detector(min_confidence=0.6):
+    """A MediaPipe Hands instance for crops: static_image_mode, one hand."""
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=1,
+                                    min_detection_confidence=min_confidence)
+
+
+# ----------------- ROI HAND TRACKER -----------------
+class RoiHandTracker:
+    """Runs hand detection on a padded crop around the last seen hand.
+
+    The landmarks MediaPipe returns for the crop are rewritten in place to
+    full-frame normalized coordinates, so callers (and draw_landmarks) can use
+    the result exactly like a full-frame result. The whole frame is scanned
+    again when the crop loses the hand or its score drops below
+    min_confidence, and optionally every refresh_every frames.
+
+    Full frames go to hands, crops to crop_hands. They must be separate
+    instances: a video-mode Hands tracks the hand from its previous
+    landmarks, and those would be in the wrong coordinates after a switch
+    between crop and full frame. crop_hands defaults to a
+    static_image_mode instance (crop_detector). close() closes hands and
+    that default crop detector; a crop_hands passed in is left open.
+    """
+
+    def __init__(self, hands, crop_hands=None, padding=0.6, min_size=160, min_confidence=0.6, refresh_every=0):
+        self.hands = hands
+        self._owns_crop_hands = crop_hands is None
+        self.crop_hands = crop_detector(min_confidence) if crop_hands is None else crop_hands
+        self.padding = padding
+        self.min_size = min_size
+        self.min_confidence = min_confidence
+        self.refresh_every = refresh_every
+        self.roi = None  # (x0, y0, x1, y1) in pixels
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.redetections = 0
+        self.pixels_processed = 0
+        self.pixels_full = 0
+        self._since_full = 0
+
+    @property
+    def roi_ratio(self):
+        total = self.roi_frames + self.full_frames
+        return self.roi_frames / total if total else 0.0
+
+    @property
+    def pixel_ratio(self):
+        """Share of full-frame pixels actually sent to inference."""
+        return self.pixels_processed / self.pixels_full if self.pixels_full else 1.0
+
+    def reset(self):
+        self.roi = None
+        self._since_full = 0
+
+    def metrics(self):
+        return {"roi_ratio": round(self.roi_ratio, 3), "pixel_ratio": round(self.pixel_ratio, 3),
+                "redetections": self.redetections}
+
+    def close(self):
+        if hasattr(self.hands, "close"):
+            self.hands.close()
+        if self._owns_crop_hands:
+            self.crop_hands.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def process(self, rgb):
+        h, w = rgb.shape[:2]
+        self.pixels_full += h * w
+        use_roi = self.roi is not None and not (
+            self.refresh_every and self._since_full >= self.refresh_every)
+
+        if use_roi:
+            x0, y0, x1, y1 = self.roi
+            crop = np.ascontiguousarray(rgb[y0:y1, x0:x1])
+            result = self.crop_hands.process(crop)
+            self.pixels_processed += crop.shape[0] * crop.shape[1]
+            if self._confident(result):
+                self.roi_frames += 1
+                self._since_full += 1
+                self._to_frame_coords(result, x0, y0, x1 - x0, y1 - y0, w, h)
+                self.roi = self._roi_from(result, w, h)
+                return result
+            # lost the hand inside the crop: fall back to the full frame now
+            self.redetections += 1
+
+        result = self.hands.process(rgb)
+        self.pixels_processed += h * w
+        self.full_frames += 1
+        self._since_full = 0
+        self.roi = self._roi_from(result, w, h) if self._confident(result) else None
+        return result
+
+    def _confident(self, result):
+        if not result.multi_hand_landmarks:
+            return False
+        if not getattr(result, "multi_handedness", None):
+            return True
+        return result.multi_handedness[0].classification[0].score >= self.min_confidence
+
+    @staticmethod
+    def _to_frame_coords(result, x0, y0, cw, ch, w, h):
+        for hand_landmarks in result.multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = (lm.x * cw + x0) / w
+                lm.y = (lm.y * ch + y0) / h
+                # z is relative to the crop width; rescale to the frame width
+                lm.z = lm.z * cw / w
+
+    def _roi_from(self, result, w, h):
+        points = landmarks_to_array(result.multi_hand_landmarks[0])
+        (x_min, y_min), (x_max, y_max) = points[:, :2].min(axis=0), points[:, :2].max(axis=0)
+        cx, cy = (x_min + x_max) / 2 * w, (y_min + y_max) / 2 * h
+        side = max((x_max - x_min) * w, (y_max - y_min) * h)
+        side = max(side * (1 + 2 * self.padding), self.min_size)
+        half = side / 2
+        x0, x1 = int(max(cx - half, 0)), int(min(cx + half, w))
+        y0, y1 = int(max(cy - half, 0)), int(min(cy + half, h))
+        if x1 - x0 < 16 or y1 - y0 < 16:
+            return None
+        return x0, y0, x1, y1
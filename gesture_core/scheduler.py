@@ -0,0 +1,139 @@
+import copy
+import math
+import time
+
+import numpy as np
+
+from gesture_core.features import INDEX_TIP, THUMB_TIP, landmarks_to_array, write_landmarks
+
+
+# ----------------- INFERENCE SCHEDULER -----------------
+class InferenceScheduler:
+    """Keeps the per-frame cost inside a latency budget by skipping inference.
+
+    Every frame is passed to process(). Inference runs on every stride-th
+    frame; the frames in between get a copy of the last result whose
+    landmarks are extrapolated from the velocity of the last two inferences,
+    so distance mapping and overlays still update at the display rate.
+    stride adapts to the measured inference time and the rest of the frame
+    work (reported via frame_done()) so that, amortised, a frame fits in
+    budget_ms. When a real inference lands on a frame that would have been
+    predicted, the thumb/index prediction error is tracked as interp_error_px.
+    """
+
+    def __init__(self, detector, budget_ms=33.0, max_stride=4, smoothing=0.2):
+        self.detector = detector
+        self.budget_ms = budget_ms
+        self.max_stride = max_stride
+        self.smoothing = smoothing
+        self.stride = 1
+        self.infer_ms = 0.0
+        self.other_ms = 0.0
+        self.interp_error_px = 0.0
+        self.inferred_frames = 0
+        self.predicted_frames = 0
+        self._frame = 0
+        self._last_infer_frame = None
+        self._frame_start = None
+        self._frame_infer_ms = 0.0
+        self._last_result = None
+        self._points = None     # (frame index, 21x3 array) of the latest inference
+        self._velocity = None   # per-frame landmark velocity
+
+    def process(self, rgb):
+        self._frame += 1
+        self._frame_start = time.perf_counter()
+        due = self._last_result is None or self._frame - self._last_infer_frame >= self.stride
+        if due:
+            return self._infer(rgb)
+        self._frame_infer_ms = 0.0
+        self.predicted_frames += 1
+        return self._predict()
+
+    def reset(self):
+        """Forget the last result (e.g. when the camera restarts)."""
+        self._last_result = self._points = self._velocity = None
+        self._last_infer_frame = None
+        if hasattr(self.detector, "reset"):
+            self.detector.reset()
+
+    def frame_done(self):
+        """Call once the rest of the frame (drawing, encoding, ...) is finished."""
+        if self._frame_start is None:
+            return
+        total_ms = (time.perf_counter() - self._frame_start) * 1000
+        self.other_ms = self._ema(self.other_ms, max(total_ms - self._frame_infer_ms, 0.0))
+        self._frame_start = None
+
+    def close(self):
+        """Close the wrapped detector (and whatever it wraps)."""
+        if hasattr(self.detector, "close"):
+            self.detector.close()
+
+    def metrics(self):
+        return {
+            "stride": self.stride,
+            "infer_ms": round(self.infer_ms, 2),
+            "other_ms": round(self.other_ms, 2),
+            "interp_error_px": round(self.interp_error_px, 2),
+            "inferred_frames": self.inferred_frames,
+            "predicted_frames": self.predicted_frames,
+        }
+
+    def _ema(self, old, new):
+        return new if old == 0.0 else (1 - self.smoothing) * old + self.smoothing * new
+
+    def _infer(self, rgb):
+        start = time.perf_counter()
+        result = self.detector.process(rgb)
+        self._frame_infer_ms = (time.perf_counter() - start) * 1000
+        self.infer_ms = self._ema(self.infer_ms, self._frame_infer_ms)
+        self.inferred_frames += 1
+
+        points = _first_hand_points(result)
+        if points is not None and self._points is not None:
+            steps = self._frame - self._points[0]
+            if self._velocity is not None and steps > 1:
+                h, w = rgb.shape[:2]
+                guess = self._points[1] + self._velocity * steps
+                err = (guess - points)[[THUMB_TIP, INDEX_TIP], :2] * (w, h)
+                self.interp_error_px = self._ema(self.interp_error_px, float(np.hypot(err[:, 0], err[:, 1]).mean()))
+            self._velocity = (points - self._points[1]) / steps
+        else:
+            self._velocity = None
+        self._points = (self._frame, points) if points is not None else None
+        self._last_result = result
+        self._last_infer_frame = self._frame
+        self._adapt()
+        return result
+
+    def _predict(self):
+        if self._points is None:
+            return self._last_result
+        steps = min(self._frame - self._points[0], self.max_stride)
+        points = self._points[1]
+        if self._velocity is not None:
+            points = points + self._velocity * steps
+        result = copy.deepcopy(self._last_result)
+        write_landmarks(result.multi_hand_landmarks[0], points)
+        return result
+
+    def _adapt(self):
+        # amortised cost per frame is other_ms + infer_ms / stride
+        headroom = self.budget_ms - self.other_ms
+        if headroom <= 0:
+            needed = self.max_stride
+        else:
+            needed = math.ceil(self.infer_ms / headroom)
+        needed = min(max(needed, 1), self.max_stride)
+        if needed > self.stride:
+            self.stride = needed
+        elif needed < self.stride and self.other_ms + self.infer_ms / (self.stride - 1) < 0.8 * self.budget_ms:
+            # only step back down with some headroom to avoid flapping
+            self.stride -= 1
+
+
+def _first_hand_points(result):
+    if not result.multi_hand_landmarks:
+        return None
+    return landmarks_to_array(result.multi_hand_landmarks[0])
@@ -0,0 +1,194 @@
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+HEADER_SLOTS = 1  # [latest committed seq]
+WRITING = -1
+
+
+# ----------------- SHARED FRAME RING -----------------
+class SharedFrameRing:
+    """Fixed-size ring of frame slots in one multiprocessing.shared_memory block.
+
+    Layout: an int64 header (latest committed sequence number), one int64
+    sequence number per slot, then the slots as contiguous uint8 frames.
+    The capture process writes straight into slot views (cap.read(view))
+    and commits a sequence number; the inference process reads the newest
+    slot as a NumPy view without copying, and calls still_valid() after
+    using it to detect that the writer lapped it in the meantime.
+
+    Create it in one process and attach to it by name from the others.
+    """
+
+    def __init__(self, name=None, slots=4, shape=(480, 640, 3), create=True):
+        self.slots = slots
+        self.shape = tuple(shape)
+        frame_bytes = int(np.prod(self.shape))
+        header_bytes = 8 * (HEADER_SLOTS + slots)
+        size = header_bytes + slots * frame_bytes
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        self.owner = create
+        self.name = self.shm.name
+        self._header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=self.shm.buf)
+        self._slot_seq = np.ndarray((slots,), dtype=np.int64, buffer=self.shm.buf, offset=8 * HEADER_SLOTS)
+        self._frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf, offset=header_bytes)
+        if create:
+            self._header[:] = 0
+            self._slot_seq[:] = 0
+        self._next_seq = int(self._header[0]) + 1
+
+    @classmethod
+    def attach(cls, name, slots=4, shape=(480, 640, 3)):
+        return cls(name=name, slots=slots, shape=shape, create=False)
+
+    @property
+    def latest_seq(self):
+        return int(self._header[0])
+
+    # ---- writer side ----
+    def begin_write(self):
+        """Return (seq, view) of the slot the next frame should be written into."""
+        seq = self._next_seq
+        slot = seq % self.slots
+        self._slot_seq[slot] = WRITING
+        return seq, self._frames[slot]
+
+    def commit(self, seq):
+        self._slot_seq[seq % self.slots] = seq
+        self._header[0] = seq
+        self._next_seq = seq + 1
+
+    def write(self, frame):
+        """Copy a frame into the next slot (when the source cannot read in place)."""
+        seq, view = self.begin_write()
+        view[...] = frame
+        self.commit(seq)
+        return seq
+
+    # ---- reader side ----
+    def read_latest(self, last_seq=0):
+        """Return (seq, view) of the newest committed frame newer than last_seq, or None."""
+        seq = self.latest_seq
+        if seq <= last_seq:
+            return None
+        slot = seq % self.slots
+        if self._slot_seq[slot] != seq:
+            return None
+        return seq, self._frames[slot]
+
+    def wait_latest(self, last_seq=0, timeout=1.0, poll=0.0005):
+        deadline = time.perf_counter() + timeout
+        while True:
+            latest = self.read_latest(last_seq)
+            if latest is not None or time.perf_counter() >= deadline:
+                return latest
+            time.sleep(poll)
+
+    def still_valid(self, seq):
+        """True if the slot holding seq has not been reused since it was read."""
+        return self._slot_seq[seq % self.slots] == seq
+
+    def close(self):
+        # drop our views before closing the mapping
+        self._header = self._slot_seq = self._frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# ----------------- CAPTURE PROCESS -----------------
+def capture_to_ring(source, ring_name, slots, shape, stop, loop=False):
+    """Process target: read frames from source into ring slots until stop is set.
+
+    A cv2.VideoCapture decodes straight into the slot (read(image)); the
+    other sources open_source() returns (image folders, LoopingCapture)
+    only have read(), so their frames are copied into the slot once.
+    """
+    import cv2
+    from gesture_core.sources import open_source
+
+    ring = SharedFrameRing.attach(ring_name, slots=slots, shape=shape)
+    cap = open_source(source, loop=loop)
+    in_place = isinstance(cap, cv2.VideoCapture)
+    try:
+        while not stop.is_set():
+            seq, view = ring.begin_write()
+            ok, frame = cap.read(view) if in_place else cap.read()
+            if not ok:
+                time.sleep(0.01)
+                continue
+            if frame is not view and not np.shares_memory(frame, view):
+                # the source returned a different size/buffer; fall back to one copy
+                if frame.shape != view.shape:
+                    frame = cv2.resize(frame, (shape[1], shape[0]))
+                view[...] = frame
+            ring.commit(seq)
+    finally:
+        cap.release()
+        ring.close()
+
+
+# ----------------- INFERENCE SIDE -----------------
+class RingCapture:
+    """cv2.VideoCapture look-alike that reads the newest frame of a SharedFrameRing.
+
+    Lets the inference process run GesturePipeline (or any read() loop) on
+    frames a capture_to_ring process writes. read() returns the slot view
+    itself, without a copy; it stays valid until the writer laps the ring
+    (slots - 1 frames later), and GesturePipeline flips it into a new array
+    right away. Frames the reader was too slow for are skipped, not queued.
+    """
+
+    def __init__(self, ring, timeout=1.0, process=None, stop=None):
+        self.ring = ring
+        self.timeout = timeout
+        self.process = process
+        self.stop = stop
+        self.last_seq = 0
+        self.skipped = 0
+        self._open = True
+
+    def isOpened(self):
+        return self._open
+
+    def read(self):
+        if not self._open:
+            return False, None
+        latest = self.ring.wait_latest(self.last_seq, self.timeout)
+        if latest is None:
+            return False, None
+        seq, view = latest
+        if self.last_seq:
+            self.skipped += seq - self.last_seq - 1
+        self.last_seq = seq
+        return True, view
+
+    def set(self, prop, value):
+        # capture settings belong to the process that owns the camera
+        return False
+
+    def get(self, prop):
+        return 0.0
+
+    def release(self):
+        if not self._open:
+            return
+        self._open = False
+        if self.stop is not None:
+            self.stop.set()
+        if self.process is not None:
+            self.process.join(2.0)
+        self.ring.close()
+
+
+def open_ring_capture(source=None, loop=False, slots=4, shape=(480, 640, 3)):
+    """Start a capture_to_ring process for source and return a RingCapture on its ring."""
+    import multiprocessing
+
+    ring = SharedFrameRing(slots=slots, shape=shape)
+    stop = multiprocessing.Event()
+    process = multiprocessing.Process(target=capture_to_ring, args=(source, ring.name, slots, shape, stop, loop),
+                                      name="capture", daemon=True)
+    process.start()
+    return RingCapture(ring, process=process, stop=stop)
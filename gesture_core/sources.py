@@ -0,0 +1,159 @@
+import glob
+import os
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+# ----------------- IMAGE SEQUENCE -----------------
+class ImageSequenceCapture:
+    """cv2.VideoCapture look-alike that reads frames from a list of image files."""
+
+    def __init__(self, paths, loop=False):
+        self.paths = list(paths)
+        self.loop = loop
+        self.pos = 0
+        self._open = bool(self.paths)
+
+    def isOpened(self):
+        return self._open
+
+    def read(self):
+        if not self._open:
+            return False, None
+        if self.pos >= len(self.paths):
+            if not self.loop:
+                return False, None
+            self.pos = 0
+        frame = cv2.imread(self.paths[self.pos])
+        self.pos += 1
+        return frame is not None, frame
+
+    def set(self, prop, value):
+        # resolution / fps requests have no meaning for recorded frames
+        return False
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.paths))
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.pos)
+        return 0.0
+
+    def release(self):
+        self._open = False
+
+
+class LoopingCapture:
+    """Wraps a video file capture and rewinds it when the end is reached."""
+
+    def __init__(self, cap):
+        self.cap = cap
+
+    def read(self):
+        ok, frame = self.cap.read()
+        if not ok:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.cap.read()
+        return ok, frame
+
+    def __getattr__(self, name):
+        return getattr(self.cap, name)
+
+
+class SimulatedCamera:
+    """cv2.VideoCapture look-alike that honours width / height / FPS requests.
+
+    Frames are a gradient with a moving bar at the requested size, so code
+    that changes capture settings can be replayed without a webcam. Like a
+    real camera, a new size only shows up from the next read on.
+    """
+
+    def __init__(self, width=640, height=480, fps=30, frames=0):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frames = frames
+        self.pos = 0
+        self.sets = 0
+        self._open = True
+        self._base = None
+
+    def isOpened(self):
+        return self._open
+
+    def read(self):
+        if not self._open or (self.frames and self.pos >= self.frames):
+            return False, None
+        if self._base is None or self._base.shape[:2] != (self.height, self.width):
+            ramp = np.linspace(40, 200, self.width, dtype=np.float32).astype(np.uint8)
+            self._base = np.repeat(np.repeat(ramp[None, :, None], self.height, 0), 3, 2)
+        frame = self._base.copy()
+        x = (self.pos * 8) % self.width
+        frame[:, x:x + max(self.width // 20, 1)] = 255
+        self.pos += 1
+        return True, frame
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            self.width = int(value)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            self.height = int(value)
+        elif prop == cv2.CAP_PROP_FPS:
+            self.fps = float(value)
+        else:
+            return False
+        self.sets += 1
+        return True
+
+    def get(self, prop):
+        return float({cv2.CAP_PROP_FRAME_WIDTH: self.width, cv2.CAP_PROP_FRAME_HEIGHT: self.height,
+                      cv2.CAP_PROP_FPS: self.fps, cv2.CAP_PROP_FRAME_COUNT: self.frames,
+                      cv2.CAP_PROP_POS_FRAMES: self.pos}.get(prop, 0))
+
+    def release(self):
+        self._open = False
+
+
+def is_live(cap):
+    """True when a failed read is a hiccup to retry, False when the source can run out.
+
+    Webcams, streams and looping sources are live. A video file or an image
+    sequence without loop has a frame count and ends.
+    """
+    if isinstance(cap, (ImageSequenceCapture, LoopingCapture)):
+        return getattr(cap, "loop", True)
+    return cap.get(cv2.CAP_PROP_FRAME_COUNT) <= 0
+
+
+# ----------------- SOURCE FACTORY -----------------
+def _image_paths(source):
+    if os.path.isdir(source):
+        names = sorted(os.listdir(source))
+        return [os.path.join(source, n) for n in names if n.lower().endswith(IMAGE_EXTENSIONS)]
+    if any(ch in source for ch in "*?["):
+        return sorted(glob.glob(source))
+    return None
+
+
+def open_source(source=None, loop=False):
+    """Open a webcam index, video file/URL, image folder or glob pattern.
+
+    When source is None the GESTURE_SOURCE environment variable is used, so
+    every script can be pointed at a recording without code changes; it
+    falls back to the default webcam (index 0).
+    """
+    if source is None:
+        source = os.environ.get("GESTURE_SOURCE", "0")
+        loop = loop or os.environ.get("GESTURE_SOURCE_LOOP", "") == "1"
+    if isinstance(source, int) or str(source).isdigit():
+        return cv2.VideoCapture(int(source))
+
+    paths = _image_paths(str(source))
+    if paths is not None:
+        return ImageSequenceCapture(paths, loop=loop)
+
+    cap = cv2.VideoCapture(str(source))
+    return LoopingCapture(cap) if loop else cap
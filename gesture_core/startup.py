@@ -0,0 +1,98 @@
+import importlib
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+
+# ----------------- STARTUP REPORT -----------------
+class StartupReport:
+    """Records how long each import and each component init took."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.imports = {}
+        self.inits = {}
+
+    @contextmanager
+    def measure(self, kind, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            target = self.imports if kind == "import" else self.inits
+            target[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    def timed_import(self, name):
+        with self.measure("import", name):
+            return importlib.import_module(name)
+
+    def as_dict(self):
+        return {
+            "imports_ms": dict(self.imports),
+            "inits_ms": dict(self.inits),
+            "uptime_s": round(time.perf_counter() - self.started, 3),
+        }
+
+    def format(self):
+        lines = ["startup timing:"]
+        for title, items in (("import", self.imports), ("init", self.inits)):
+            for name, ms in items.items():
+                lines.append(f"  {title:<7}{name:<20}{ms:>9.1f} ms")
+        return "\n".join(lines)
+
+
+# ----------------- LAZY RESOURCE -----------------
+class LazyResource:
+    """Creates a heavy object on first get(), once, even with concurrent callers."""
+
+    def __init__(self, name, factory, report=None):
+        self.name = name
+        self.factory = factory
+        self.report = report
+        self._value = None
+        self._ready = False
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self._ready
+
+    def get(self):
+        if self._ready:
+            return self._value
+        with self._lock:
+            if not self._ready:
+                if self.report is not None:
+                    with self.report.measure("init", self.name):
+                        self._value = self.factory()
+                else:
+                    self._value = self.factory()
+                self._ready = True
+        return self._value
+
+    def peek(self, default=None):
+        """The object if it already exists, without creating it."""
+        return self._value if self._ready else default
+
+
+def warm_up(*resources, report=None, on_done=None):
+    """Initialise resources on a background thread so the first request is fast.
+
+    With a report, the whole warm-up is recorded as the "warm-up" init, and
+    so is each resource that has no report of its own.
+    """
+    def run():
+        with (report.measure("init", "warm-up") if report is not None else nullcontext()):
+            for resource in resources:
+                own = report is not None and resource.report is None
+                try:
+                    with (report.measure("init", resource.name) if own else nullcontext()):
+                        resource.get()
+                except Exception as e:
+                    print(f"warm-up of {resource.name} failed:", e)
+        if on_done is not None:
+            on_done()
+
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread
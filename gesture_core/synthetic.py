@@ -0,0 +1,87 @@
+"""Synthetic MediaPipe-style hand landmarks for benchmarks and default templates.
+
+Hands are built from a canonical skeleton (wrist at the origin, middle
+finger knuckle one palm length above it), posed per gesture, then randomly
+rotated, scaled, moved and jittered before being converted to normalized
+image coordinates like hands.process() returns. Everything is seeded, so a
+given (n, seed) always produces the same dataset.
+"""
+import numpy as np
+
+GESTURES = ("open", "closed", "pinched")
+
+# knuckle positions in palm units (x right, y up); thumb on the +x side as in the mirrored frame
+_BASES = np.array([
+    [0.35, 0.25],    # thumb CMC (1)
+    [0.30, 0.95],    # index MCP (5)
+    [0.00, 1.00],    # middle MCP (9)
+    [-0.25, 0.95],   # ring MCP (13)
+    [-0.45, 0.85],   # pinky MCP (17)
+])
+_SEGMENTS = np.array([
+    [0.40, 0.35, 0.30],
+    [0.45, 0.30, 0.25],
+    [0.50, 0.33, 0.27],
+    [0.45, 0.30, 0.25],
+    [0.35, 0.25, 0.22],
+])
+# where each joint of a curled finger projects, as a fraction of the finger's length
+_CURLED = np.array([0.55, 0.45, 0.15])
+
+
+def canonical_hands(gesture, n, rng):
+    """(n, 21, 2) landmark positions in palm units for one gesture, before any pose change."""
+    pts = np.zeros((n, 21, 2))
+    extended = np.ones((n, 5), dtype=bool)
+    if gesture == "closed":
+        extended[:] = False
+    elif gesture == "pinched":
+        extended[:, 1] = False
+        extended[:, 2:] = rng.random((n, 3)) < 0.5
+
+    for f in range(5):
+        first = 1 + 4 * f
+        base = _BASES[f]
+        lengths = _SEGMENTS[f] * rng.uniform(0.9, 1.1, (n, 1))
+        direction = np.array([0.8, 0.6]) if f == 0 else base * 0.3 + np.array([0.0, 0.7])
+        direction = direction / np.linalg.norm(direction)
+        reach = np.where(extended[:, f:f + 1], np.cumsum(lengths, axis=1), _CURLED * lengths.sum(axis=1, keepdims=True))
+        pts[:, first] = base
+        pts[:, first + 1:first + 4] = base + reach[..., None] * direction
+        if f == 0:
+            # a folded thumb crosses the palm instead
+            folded = base + (np.array([-0.1, 0.55]) - base) * np.array([[0.45], [0.75], [1.0]])
+            pts[~extended[:, 0], 2:5] = folded
+
+    if gesture == "pinched":
+        # thumb and index tips meet above the palm
+        meet = np.array([0.45, 1.15]) + rng.normal(0, 0.05, (n, 2))
+        for first in (1, 5):
+            base = pts[:, first:first + 1]
+            pts[:, first + 1:first + 4] = base + (meet[:, None] - base) * np.array([[0.4], [0.7], [1.0]])
+    return pts
+
+
+def synthetic_hands(n, seed=0, gestures=GESTURES, img_shape=(480, 640), noise=0.03):
+    """n random hands as (points (n, 21, 3) float32, labels (n,) int indices into gestures)."""
+    rng = np.random.default_rng(seed)
+    h, w = img_shape[:2]
+    labels = rng.integers(0, len(gestures), n)
+    pts = np.zeros((n, 21, 2))
+    for i, gesture in enumerate(gestures):
+        mask = labels == i
+        pts[mask] = canonical_hands(gesture, int(mask.sum()), rng)
+    pts += rng.normal(0, noise, pts.shape)
+
+    theta = rng.uniform(-0.5, 0.5, n)
+    cos, sin = np.cos(theta)[:, None], np.sin(theta)[:, None]
+    palm_px = rng.uniform(40, 140, (n, 1))
+    centre = rng.uniform([0.25 * w, 0.35 * h], [0.75 * w, 0.8 * h], (n, 2))
+    x = (pts[..., 0] * cos - pts[..., 1] * sin) * palm_px + centre[:, :1]
+    y = -(pts[..., 0] * sin + pts[..., 1] * cos) * palm_px + centre[:, 1:]  # palm units point up, image y down
+
+    points = np.empty((n, 21, 3), dtype=np.float32)
+    points[..., 0] = x / w
+    points[..., 1] = y / h
+    points[..., 2] = rng.normal(0, 0.02, (n, 21))
+    return points, labels
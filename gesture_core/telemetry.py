@@ -0,0 +1,63 @@
+import json
+import threading
+import time
+
+
+# ----------------- TELEMETRY HUB -----------------
+class TelemetryHub:
+    """Latest-value store for live stats that clients can stream as server-sent events.
+
+    publish() merges new values into the snapshot and only wakes clients when
+    something actually changed. Each client stream is rate-limited on its own
+    and always sends the newest snapshot, so changes that happen between two
+    sends are coalesced instead of queued.
+    """
+
+    def __init__(self):
+        self._state = {}
+        self._version = 0
+        self._cond = threading.Condition()
+        self.clients = 0
+        self.events_sent = 0
+
+    def publish(self, **values):
+        with self._cond:
+            changed = {k: v for k, v in values.items() if self._state.get(k) != v}
+            if not changed:
+                return False
+            self._state.update(changed)
+            self._version += 1
+            self._cond.notify_all()
+            return True
+
+    def snapshot(self):
+        with self._cond:
+            return dict(self._state)
+
+    def stream(self, max_rate=20.0, keepalive=15.0):
+        """Yield SSE-formatted messages, at most max_rate per second."""
+        min_interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        last_version, last_sent = 0, 0.0
+        with self._cond:
+            self.clients += 1
+        try:
+            while True:
+                wait = min_interval - (time.monotonic() - last_sent)
+                if wait > 0:
+                    time.sleep(wait)
+                with self._cond:
+                    if not self._cond.wait_for(lambda: self._version != last_version, keepalive):
+                        message = None
+                    else:
+                        last_version = self._version
+                        message = dict(self._state, timestamp=time.time())
+                if message is None:
+                    # comment line keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                last_sent = time.monotonic()
+                self.events_sent += 1
+                yield f"data: {json.dumps(message)}\n\n"
+        finally:
+            with self._cond:
+                self.clients -= 1
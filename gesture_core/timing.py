@@ -0,0 +1,47 @@
+import json
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+
+# ----------------- STAGE TIMER -----------------
+class StageTimer:
+    """Collects wall-clock durations per pipeline stage (in milliseconds)."""
+
+    def __init__(self):
+        self.samples = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def add(self, name, duration_ms):
+        self.samples.setdefault(name, []).append(duration_ms)
+
+    def summary(self):
+        """Return count, mean and p50/p95/p99 for every stage."""
+        report = {}
+        for name, values in self.samples.items():
+            arr = np.asarray(values, dtype=np.float64)
+            p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+            report[name] = {
+                "count": int(arr.size),
+                "mean_ms": round(float(arr.mean()), 4),
+                "p50_ms": round(float(p50), 4),
+                "p95_ms": round(float(p95), 4),
+                "p99_ms": round(float(p99), 4),
+                "max_ms": round(float(arr.max()), 4),
+            }
+        return report
+
+    def save_json(self, path, **extra):
+        data = dict(extra)
+        data["stages"] = self.summary()
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+        return data
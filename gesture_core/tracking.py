@@ -0,0 +1,220 @@
+import time
+
+import numpy as np
+
+from gesture_core.features import HandFeatures, distance_to_percent, landmarks_to_array, reference_pixels, write_landmarks
+from gesture_core.filters import LANDMARK_BETA, LANDMARK_MIN_CUTOFF, OneEuroFilter
+
+
+class TrackedHand:
+    """One hand followed across frames; id stays the same while it is tracked."""
+
+    __slots__ = ("id", "handedness", "score", "points", "landmarks", "centroid", "seen", "missed", "filter")
+
+    def __init__(self, hand_id, handedness, filter=None):
+        self.id = hand_id
+        self.handedness = handedness
+        self.score = 0.0
+        self.points = None
+        self.landmarks = None
+        self.centroid = None
+        self.seen = 0
+        self.missed = 0
+        self.filter = filter
+
+    @property
+    def visible(self):
+        return self.missed == 0
+
+    def __repr__(self):
+        return f"TrackedHand({self.id}, {self.handedness}, seen={self.seen})"
+
+
+def _detections(results):
+    """(points (n, 21, 3), labels, scores, landmark lists) from MediaPipe results."""
+    hands = results.multi_hand_landmarks or []
+    handedness = getattr(results, "multi_handedness", None) or []
+    points = np.stack([landmarks_to_array(h) for h in hands]) if hands else np.zeros((0, 21, 3), np.float32)
+    labels, scores = [], []
+    for i in range(len(hands)):
+        if i < len(handedness):
+            cls = handedness[i].classification[0]
+            labels.append(cls.label)
+            scores.append(cls.score)
+        else:
+            labels.append(None)
+            scores.append(0.0)
+    return points, labels, scores, hands
+
+
+# ----------------- HAND TRACKER -----------------
+class HandTracker:
+    """Gives every detected hand a stable id across frames.
+
+    MediaPipe returns hands in no particular order, so each frame the
+    detections are matched to the live tracks by the distance between
+    landmark centroids (normalized frame coordinates), plus
+    handedness_penalty when the Left/Right label disagrees with the track.
+    Pairs are taken greedily from the cheapest; pairs further apart than
+    max_distance are not matched. Unmatched detections start new tracks,
+    and a track is dropped after max_missed frames without a match. With
+    smoothing, every track has its own One-Euro filter, so two hands never
+    share (and jump between) filter state.
+    """
+
+    def __init__(self, max_distance=0.25, handedness_penalty=0.1, max_missed=5, smoothing=True,
+                 min_cutoff=LANDMARK_MIN_CUTOFF, beta=LANDMARK_BETA):
+        self.max_distance = max_distance
+        self.handedness_penalty = handedness_penalty
+        self.max_missed = max_missed
+        self.smoothing = smoothing
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.tracks = []
+        self.next_id = 1
+        self.frames = 0
+        self.created = 0
+        self.track_ms = 0.0
+
+    def reset(self):
+        self.tracks = []
+
+    def visible(self):
+        return [t for t in self.tracks if t.visible]
+
+    def _match(self, centroids, labels):
+        """Greedy (track index, detection index) pairs by ascending cost."""
+        if not self.tracks or not len(centroids):
+            return []
+        track_xy = np.array([t.centroid for t in self.tracks], dtype=np.float32)
+        cost = np.linalg.norm(track_xy[:, None, :] - centroids[None, :, :], axis=-1)
+        track_labels = np.array([t.handedness or "" for t in self.tracks])
+        det_labels = np.array([label or "" for label in labels])
+        mismatch = (track_labels[:, None] != det_labels[None, :]) & (track_labels[:, None] != "") & (det_labels[None, :] != "")
+        cost = cost + self.handedness_penalty * mismatch
+
+        pairs, used_t, used_d = [], set(), set()
+        for flat in np.argsort(cost, axis=None):
+            ti, di = divmod(int(flat), cost.shape[1])
+            if cost[ti, di] > self.max_distance:
+                break
+            if ti in used_t or di in used_d:
+                continue
+            pairs.append((ti, di))
+            used_t.add(ti)
+            used_d.add(di)
+        return pairs
+
+    def update(self, results, now=None):
+        """Match this frame's detections to tracks; returns the visible tracks sorted by id."""
+        start = time.perf_counter()
+        now = start if now is None else now
+        self.frames += 1
+        points, labels, scores, landmark_lists = _detections(results)
+        centroids = points[:, :, :2].mean(axis=1) if len(points) else np.zeros((0, 2), np.float32)
+
+        matched = dict((di, self.tracks[ti]) for ti, di in self._match(centroids, labels))
+        for track in self.tracks:
+            track.missed += 1
+        for di in range(len(points)):
+            track = matched.get(di)
+            if track is None:
+                track = TrackedHand(self.next_id, labels[di],
+                                    OneEuroFilter(self.min_cutoff, self.beta) if self.smoothing else None)
+                self.next_id += 1
+                self.created += 1
+                self.tracks.append(track)
+            pts = points[di]
+            if track.filter is not None:
+                pts = track.filter(pts, now)
+                write_landmarks(landmark_lists[di], pts)
+            track.points = pts
+            track.landmarks = landmark_lists[di]
+            track.centroid = centroids[di]
+            track.score = scores[di]
+            # keep the first confident label; a single flipped frame doesn't rename the hand
+            if track.handedness is None:
+                track.handedness = labels[di]
+            track.seen += 1
+            track.missed = 0
+        self.tracks = [t for t in self.tracks if t.missed <= self.max_missed]
+        self.track_ms = (time.perf_counter() - start) * 1000
+        return sorted(self.visible(), key=lambda t: t.id)
+
+    def metrics(self):
+        return {"tracks": len(self.tracks), "visible": len(self.visible()), "ids_created": self.created,
+                "track_ms": round(self.track_ms, 3)}
+
+
+# ----------------- DUAL-HAND CONTROL -----------------
+DEFAULT_ROLES = {"Left": "volume", "Right": "mute"}
+
+
+class DualHandControl:
+    """Turns tracked hands into control values, one control per hand.
+
+    roles maps a handedness label to a control; a track keeps the role it
+    got when first seen. Controls:
+      volume   pinch distance (pixels on a 640-wide frame) -> 0-100 %, as in
+               the one-hand loops
+      mute     a pinch (thumb-index under mute_pinch palm lengths) toggles
+               mute; the fingers must open past release_pinch before the
+               next toggle
+      balance  the hand's horizontal position -> -1 (left) .. 1 (right)
+    update() returns {"volume": pct or None, "muted": bool, "balance":
+    float or None, "roles": {hand id: role}}, plus "distance" and the
+    HandFeatures ("features") of the volume hand while it is visible.
+    Pass the tracker's tracks as well: a hand keeps its role and pinch
+    state while its track is alive, even if it was missed for a frame.
+    """
+
+    def __init__(self, roles=None, min_dist=25, max_dist=160, mute_pinch=0.25, release_pinch=0.45):
+        self.roles = dict(DEFAULT_ROLES if roles is None else roles)
+        self.min_dist = min_dist
+        self.max_dist = max_dist
+        self.mute_pinch = mute_pinch
+        self.release_pinch = release_pinch
+        self.muted = False
+        self.toggles = 0
+        self._assigned = {}
+        self._pinched = {}
+
+    def role_of(self, track):
+        if track.id not in self._assigned:
+            role = self.roles.get(track.handedness)
+            # two hands with the same label: the second one gets no control
+            self._assigned[track.id] = None if role in self._assigned.values() else role
+        return self._assigned[track.id]
+
+    def update(self, hands, img_shape, tracks=None):
+        """hands: the visible tracks; tracks: all tracks HandTracker still holds (default: hands)."""
+        live = set(t.id for t in (hands if tracks is None else tracks))
+        for hand_id in [i for i in self._assigned if i not in live]:
+            del self._assigned[hand_id]
+            self._pinched.pop(hand_id, None)
+
+        out = {"volume": None, "muted": self.muted, "balance": None, "roles": {}}
+        for hand in hands:
+            role = self.role_of(hand)
+            out["roles"][hand.id] = role
+            if role is None:
+                continue
+            features = HandFeatures(hand.points, img_shape)
+            if role == "volume":
+                pinch = reference_pixels(features.pinch, img_shape)
+                out["volume"] = distance_to_percent(pinch, self.min_dist, self.max_dist)
+                out["distance"] = int(pinch)
+                out["features"] = features
+            elif role == "mute":
+                pinch = features.pinch_norm
+                was = self._pinched.get(hand.id, False)
+                if not was and pinch < self.mute_pinch:
+                    self._pinched[hand.id] = True
+                    self.muted = not self.muted
+                    self.toggles += 1
+                elif was and pinch > self.release_pinch:
+                    self._pinched[hand.id] = False
+                out["muted"] = self.muted
+            elif role == "balance":
+                out["balance"] = float(np.clip(hand.centroid[0] * 2 - 1, -1.0, 1.0))
+        return out
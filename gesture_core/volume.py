@@ -0,0 +1,335 @@
+import math
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+
+# ----------------- BACKENDS -----------------
+class VolumeBackend:
+    """Reads and writes the master volume as a 0-100 percentage."""
+
+    name = "base"
+
+    def get_percent(self):
+        raise NotImplementedError
+
+    def set_percent(self, pct):
+        raise NotImplementedError
+
+    def set_mute(self, muted):
+        raise NotImplementedError
+
+    def get_mute(self):
+        """True / False, or None when the backend cannot tell."""
+        return None
+
+    def sync(self):
+        """Make the backend's view of the device exact; backends that read the device need nothing."""
+
+
+class MemoryBackend(VolumeBackend):
+    """In-memory stand-in used on hosts without an audio device (and in replays)."""
+
+    name = "memory"
+
+    def __init__(self, level=50.0, write_delay=0.0):
+        self.level = float(level)
+        self.write_delay = write_delay
+        self.writes = 0
+        self.muted = False
+
+    def get_percent(self):
+        return self.level
+
+    def set_percent(self, pct):
+        if self.write_delay:
+            time.sleep(self.write_delay)
+        self.level = float(pct)
+        self.writes += 1
+
+    def set_mute(self, muted):
+        self.muted = bool(muted)
+
+    def get_mute(self):
+        return self.muted
+
+
+class PycawBackend(VolumeBackend):
+    """Windows endpoint volume through pycaw (imported on first use)."""
+
+    name = "pycaw"
+
+    def __init__(self):
+        from ctypes import cast, POINTER
+        from comtypes import CLSCTX_ALL
+        from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+
+        # FIX: use _iid_ attribute
+        devices = AudioUtilities.GetSpeakers()
+        interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+        self.volume_ctrl = cast(interface, POINTER(IAudioEndpointVolume))
+        self.min_db, self.max_db = self.volume_ctrl.GetVolumeRange()[:2]
+
+    def get_percent(self):
+        db = self.volume_ctrl.GetMasterVolumeLevel()
+        return _interp(db, self.min_db, self.max_db, 0.0, 100.0)
+
+    def set_percent(self, pct):
+        db = _interp(pct, 0.0, 100.0, self.min_db, self.max_db)
+        self.volume_ctrl.SetMasterVolumeLevel(db, None)
+
+    def set_mute(self, muted):
+        self.volume_ctrl.SetMute(int(bool(muted)), None)
+
+    def get_mute(self):
+        return bool(self.volume_ctrl.GetMute())
+
+
+class PulseAudioBackend(VolumeBackend):
+    """Default PulseAudio/PipeWire sink driven through pactl."""
+
+    name = "pulseaudio"
+    sink = "@DEFAULT_SINK@"
+
+    def get_percent(self):
+        out = subprocess.run(["pactl", "get-sink-volume", self.sink],
+                             capture_output=True, text=True, check=True).stdout
+        # "Volume: front-left: 32768 /  50% / -18.06 dB,   front-right: ..."
+        levels = [int(part.strip().rstrip("%")) for part in out.split("/") if part.strip().endswith("%")]
+        return float(sum(levels) / len(levels)) if levels else 0.0
+
+    def set_percent(self, pct):
+        subprocess.run(["pactl", "set-sink-volume", self.sink, f"{int(round(pct))}%"], check=True)
+
+    def set_mute(self, muted):
+        subprocess.run(["pactl", "set-sink-mute", self.sink, "1" if muted else "0"], check=True)
+
+    def get_mute(self):
+        out = subprocess.run(["pactl", "get-sink-mute", self.sink],
+                             capture_output=True, text=True, check=True).stdout
+        # "Mute: no"
+        return out.strip().endswith("yes")
+
+
+def pyautogui_keys(key, presses):
+    """Press a media key presses times in one call, without pyautogui's per-call PAUSE."""
+    import pyautogui  # slow to import; only needed once a key is sent
+    pyautogui.press(key, presses=presses, interval=0.0, _pause=False)
+
+
+class KeyStepBackend(VolumeBackend):
+    """Volume through the volumeup/volumedown media keys, step percent per press.
+
+    Key presses cannot read the level back, so the level is an estimate that
+    follows the keys sent. sync() makes it exact: volumedown until the real
+    level must be 0, then volumeup back to level. The mute key only
+    toggles, so muted is None (unknown) until sync(); its volumeup presses
+    unmute on Windows, GNOME and KDE, after which muted is False.
+    VolumeActuator.start() calls sync(). presses counts every key sent;
+    gesture_presses leaves out the ones sync() used. send_keys(key,
+    presses) defaults to pyautogui; tests and benchmarks pass a fake.
+    """
+
+    name = "keys"
+
+    def __init__(self, send_keys=None, step=2.0, level=50.0):
+        self.send_keys = send_keys or pyautogui_keys
+        self.step = step
+        self.level = float(level)
+        self.presses = 0
+        self.sync_presses = 0
+        self.batches = 0
+        self.muted = None
+
+    @property
+    def gesture_presses(self):
+        """Presses sent for volume / mute changes, start-up sync excluded."""
+        return self.presses - self.sync_presses
+
+    def get_percent(self):
+        return self.level
+
+    def get_mute(self):
+        return self.muted
+
+    def set_percent(self, pct):
+        steps = int(round((pct - self.level) / self.step))
+        if not steps:
+            return
+        # all the steps for one target go out as a single batch
+        self.send_keys("volumeup" if steps > 0 else "volumedown", abs(steps))
+        self.level = min(max(self.level + steps * self.step, 0.0), 100.0)
+        self.presses += abs(steps)
+        self.batches += 1
+
+    def set_mute(self, muted):
+        # the mute key toggles, so only press it when the state has to change (always when unknown)
+        if bool(muted) != self.muted:
+            self.send_keys("volumemute", 1)
+            self.muted = bool(muted)
+            self.presses += 1
+            self.batches += 1
+
+    def sync(self):
+        target = int(round(self.level / self.step))
+        # at least one volumeup, so the output ends up unmuted even for level 0
+        batches = [("volumedown", int(math.ceil(100 / self.step))), ("volumeup", max(target, 1))]
+        if target == 0:
+            batches.append(("volumedown", 1))
+        for key, presses in batches:
+            self.send_keys(key, presses)
+            self.presses += presses
+            self.sync_presses += presses
+            self.batches += 1
+        self.level = min(target * self.step, 100.0)
+        self.muted = False
+
+
+def _interp(x, x0, x1, y0, y1):
+    x = min(max(x, x0), x1)
+    return y0 + (x - x0) * (y1 - y0) / (x1 - x0)
+
+
+def default_backend():
+    """pycaw on Windows, pactl when available, otherwise the in-memory stand-in."""
+    if sys.platform == "win32":
+        try:
+            return PycawBackend()
+        except Exception as e:
+            print("pycaw unavailable, using in-memory volume:", e)
+    elif shutil.which("pactl"):
+        return PulseAudioBackend()
+    return MemoryBackend()
+
+
+# ----------------- ACTUATOR -----------------
+class VolumeActuator:
+    """Applies volume targets on a background thread.
+
+    request() only records the newest target, so a burst of requests between
+    two device writes is coalesced into one write of the latest value.
+    level is served from a cache that is updated after every write and
+    refreshed from the device every refresh_interval seconds when idle, so
+    readers (routes, overlays) never touch the device themselves.
+    request_mute() works the same way for the mute switch; muted mirrors
+    the device where the backend can read it and is None while unknown.
+    The thread first calls backend.sync(), so a backend that only
+    estimates the level (KeyStepBackend) starts from a known state;
+    synced is set once that is done.
+    """
+
+    def __init__(self, backend, min_change=2.0, refresh_interval=1.0, on_write=None):
+        self.backend = backend
+        self.on_write = on_write  # called with the device write time in ms
+        self.min_change = min_change
+        self.refresh_interval = refresh_interval
+        self.requests = 0
+        self.writes = 0
+        self.errors = 0
+        self._level = 0.0
+        self._target = None
+        self.muted = None
+        self._mute_target = None
+        self.synced = threading.Event()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    @property
+    def level(self):
+        return self._level
+
+    @property
+    def coalesced(self):
+        """Requests that never reached the device."""
+        return self.requests - self.writes
+
+    def start(self):
+        if self._running:
+            return self
+        self._refresh()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="volume-actuator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def request(self, pct):
+        with self._cond:
+            self._target = min(max(float(pct), 0.0), 100.0)
+            self.requests += 1
+            self._cond.notify()
+
+    def request_mute(self, muted):
+        with self._cond:
+            self._mute_target = bool(muted)
+            self._cond.notify()
+
+    def _apply_mute(self, muted):
+        if muted == self.muted:
+            return
+        try:
+            self.backend.set_mute(muted)
+            self.muted = muted
+        except Exception as e:
+            self.errors += 1
+            print("Mute error:", e)
+
+    def _refresh(self):
+        try:
+            self._level = float(self.backend.get_percent())
+            muted = self.backend.get_mute()
+            if muted is not None:
+                self.muted = muted
+        except Exception:
+            self.errors += 1
+
+    def _sync(self):
+        try:
+            self.backend.sync()
+        except Exception as e:
+            self.errors += 1
+            print("Volume sync error:", e)
+        self._refresh()
+        self.synced.set()
+
+    def _run(self):
+        self._sync()
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._target is not None or self._mute_target is not None
+                                    or not self._running, self.refresh_interval)
+                if not self._running:
+                    return
+                target, self._target = self._target, None
+                mute, self._mute_target = self._mute_target, None
+            if mute is not None:
+                self._apply_mute(mute)
+                if target is None:
+                    continue
+            if target is None:
+                # idle: pick up changes made outside the app (keyboard, mixer)
+                self._refresh()
+                continue
+            if abs(target - self._level) <= self.min_change:
+                continue
+            try:
+                start = time.perf_counter()
+                self.backend.set_percent(target)
+                self.writes += 1
+                self._level = target
+                if self.on_write is not None:
+                    self.on_write((time.perf_counter() - start) * 1000)
+            except Exception as e:
+                # ignore volume set failures (permission / device issues)
+                self.errors += 1
+                print("Volume set error:", e)
@@ -1,145 +1,306 @@
-import cv2
-import mediapipe as mp
-import numpy as np
-from flask import Flask, Response, render_template_string, jsonify
 import threading
 import time
 import webbrowser
-from ctypes import cast, POINTER
-from comtypes import CLSCTX_ALL
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+from gesture_core.startup import LazyResource, StartupReport, warm_up
+
+# Heavy modules are timed; mediapipe, the camera and the audio device are only
+# created on first use (or by the background warm-up) so "/" answers right away.
+startup = StartupReport()
+with startup.measure("import", "cv2"):
+    import cv2
+with startup.measure("import", "flask"):
+    from flask import Flask, Response, render_template_string, jsonify, request
+with startup.measure("import", "gesture_core"):
+    from gesture_core.broadcast import FrameBroadcaster
+    from gesture_core.capture import CaptureThread
+    from gesture_core.encoding import EncodedFrame, EncodeStats
+    from gesture_core.features import INDEX_TIP, THUMB_TIP, HandFeatures, distance_to_percent, reference_pixels
+    from gesture_core.filters import WriteRateMeter
+    from gesture_core.metrics import MetricsRegistry
+    from gesture_core.motion import MotionGate
+    from gesture_core.pipeline import GesturePipeline
+    from gesture_core.profiles import AdaptiveCaptureController, format_event
+    from gesture_core.roi import RoiHandTracker
+    from gesture_core.scheduler import InferenceScheduler
+    from gesture_core.sources import open_source
+    from gesture_core.telemetry import TelemetryHub
+    from gesture_core.volume import VolumeActuator, default_backend
 
 # ----------------- SETUP -----------------
 app = Flask(__name__)
+WARMUP = True
+
+# Prometheus-style metrics served as text at /metrics (latencies in ms)
+metrics = MetricsRegistry()
+latency_hist = metrics.histogram("capture_to_processed_ms", "Time from camera read to processed frame")
+detect_hist = metrics.histogram("detect_ms", "Landmark detection per frame, scheduler-skipped frames included")
+actuator_hist = metrics.histogram("actuator_write_ms", "Audio device write time")
+encode_hist = metrics.histogram("encode_ms", "JPEG encode time per requested variant")
+encode_bytes = metrics.counter("encode_bytes_total", "JPEG bytes produced")
+frames_processed = metrics.counter("frames_processed_total", "Frames run through the pipeline")
+frames_with_hand = metrics.counter("frames_with_hand_total", "Processed frames with a hand detected")
+metrics.counter("frames_captured_total", "Frames read from the camera",
+                fn=lambda: capture.frames_read if capture is not None else 0)
+metrics.counter("frames_dropped_total", "Frames overwritten before they were processed",
+                fn=lambda: capture.buffer.dropped if capture is not None else 0)
+metrics.counter("read_failures_total", "Failed camera reads",
+                fn=lambda: capture.read_failures if capture is not None else 0)
+metrics.gauge("hand_present_ratio", "Share of processed frames with a hand",
+              fn=lambda: frames_with_hand.value / frames_processed.value if frames_processed.value else 0.0)
+metrics.counter("volume_writes_total", "Volume levels written to the device",
+                fn=lambda: volume.peek().writes if volume.ready else 0)
+metrics.gauge("stream_clients", "Connected /video_feed viewers", fn=lambda: broadcaster.subscriber_count)
+metrics.gauge("event_clients", "Connected /events listeners", fn=lambda: telemetry.clients)
+metrics.counter("inference_gated_total", "Frames the motion gate kept away from the detector",
+                fn=lambda: detector.peek().skipped if MOTION_GATE and detector.ready else 0)
+metrics.gauge("motion_gate_idle", "1 while the scene is static with no hand (probe-only inference)",
+              fn=lambda: float(detector.peek().idle) if MOTION_GATE and detector.ready else 0.0)
+metrics.gauge("capture_profile_rung", "Current step on the capture ladder (0 = highest resolution)",
+              fn=lambda: capture_profiles.index if capture_profiles is not None else 0)
+metrics.counter("capture_profile_changes_total", "Adaptive capture profile switches",
+                fn=lambda: len(capture_profiles.events) - 1 if capture_profiles is not None else 0)
+
+def record_encode(encode_ms, size):
+    encode_hist.observe(encode_ms)
+    encode_bytes.inc(size)
 
 # Mediapipe
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-hands = mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.7)
-
-# Webcam
-cap = cv2.VideoCapture(0)
-cap.set(3, 640)
-cap.set(4, 480)
-
-# System volume (Pycaw) - FIX: use _iid_ attribute
-devices = AudioUtilities.GetSpeakers()
-interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-volume_ctrl = cast(interface, POINTER(IAudioEndpointVolume))
-vol_range = volume_ctrl.GetVolumeRange()
-min_vol, max_vol = vol_range[0], vol_range[1]
+mp_hands = mp_drawing = None
+# crop around the last hand and only rescan the full frame when it is lost. Off by
+# default: the static_image_mode crop detector redoes palm detection on every crop,
+# so turn it on only where `replay_bench --roi-compare` shows a speed-up
+ROI_TRACKING = False
+# skip inference on some frames (extrapolating landmarks) when a frame exceeds the budget
+FRAME_BUDGET_MS = 33
+# no inference on a static scene without a hand, just a probe once a second
+MOTION_GATE = True
+
+def build_detector():
+    global mp_hands, mp_drawing
+    with startup.measure("import", "mediapipe"):
+        import mediapipe as mp
+    mp_hands = mp.solutions.hands
+    mp_drawing = mp.solutions.drawing_utils
+    hands = mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.7)
+    hand_tracker = RoiHandTracker(hands, min_confidence=0.7) if ROI_TRACKING else hands
+    scheduler = InferenceScheduler(hand_tracker, budget_ms=FRAME_BUDGET_MS)
+    return MotionGate(scheduler) if MOTION_GATE else scheduler
+
+detector = LazyResource("hands", build_detector, startup)
+
+# Webcam. With ADAPTIVE_CAPTURE the resolution / FPS walks down a ladder of profiles when
+# the p90 of what a viewer waits for (capture to processed, plus the JPEG encode of the
+# slowest variant being watched) goes over the target and back up when there is headroom
+ADAPTIVE_CAPTURE = True
+CAPTURE_TARGET_MS = 50
+
+def open_camera():
+    with startup.measure("init", "camera"):
+        cam = open_source()
+        if not ADAPTIVE_CAPTURE:
+            cam.set(3, 640)
+            cam.set(4, 480)
+    return cam
+
+cap = None
+capture = None
+capture_profiles = None
+
+# System volume (pycaw on Windows, pactl or in-memory elsewhere). Writes happen on
+# the actuator thread; everything else reads its cached level.
+volume = LazyResource("volume", lambda: VolumeActuator(default_backend(), min_change=2,
+                                                       on_write=actuator_hist.observe).start(), startup)
+
+# GesturePipeline's One-Euro smoothing on the landmarks plus a 3% dead band on the
+# volume output, so hand jitter does not turn into a stream of volume writes
+SMOOTHING = True
+raw_writes, filtered_writes = WriteRateMeter(min_change=2), WriteRateMeter(min_change=2)
 
 # Globals
 MAX_DIST = 150
 MIN_DIST = 10
 current_volume = 0
-camera_running = True
-
-# ----------------- FRAME GENERATOR -----------------
-def generate_frames():
-    global current_volume, camera_running, cap
-    while camera_running:
-        success, frame = cap.read()
-        if not success:
-            # small sleep to avoid busy loop if camera fails
-            time.sleep(0.01)
-            continue
-
-        frame = cv2.flip(frame, 1)
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = hands.process(rgb)
-
-        # Read current system volume from Windows (0–100)
-        try:
-            sys_vol_db = volume_ctrl.GetMasterVolumeLevel()
-            sys_vol_percent = int(np.interp(sys_vol_db, [min_vol, max_vol], [0, 100]))
-        except Exception:
-            sys_vol_percent = 0
-
-        if result.multi_hand_landmarks:
-            for hand_landmarks in result.multi_hand_landmarks:
-                mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-
-                h, w, _ = frame.shape
-                thumb_tip = hand_landmarks.landmark[mp_hands.HandLandmark.THUMB_TIP]
-                index_tip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
-                thumb_x, thumb_y = int(thumb_tip.x * w), int(thumb_tip.y * h)
-                index_x, index_y = int(index_tip.x * w), int(index_tip.y * h)
-
-                cv2.circle(frame, (thumb_x, thumb_y), 8, (255, 0, 0), -1)
-                cv2.circle(frame, (index_x, index_y), 8, (0, 255, 0), -1)
-                cv2.line(frame, (thumb_x, thumb_y), (index_x, index_y), (0, 0, 255), 3)
-
-                # Calculate distance
-                distance = int(((index_x - thumb_x) ** 2 + (index_y - thumb_y) ** 2) ** 0.5)
-                cv2.putText(frame, f"Dist: {distance}px", (thumb_x, thumb_y - 25),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-
-                # Map distance to volume
-                distance_clamped = np.clip(distance, MIN_DIST, MAX_DIST)
-                vol_percent = np.interp(distance_clamped, [MIN_DIST, MAX_DIST], [0, 100])
-                vol_db = float(np.interp(vol_percent, [0, 100], [min_vol, max_vol]))
-
-                # Only update if large change (for smoothness)
-                if abs(vol_percent - sys_vol_percent) > 2:
-                    try:
-                        volume_ctrl.SetMasterVolumeLevel(vol_db, None)
-                    except Exception as e:
-                        # ignore volume set failures (permission / device issues)
-                        print("Volume set error:", e)
-
-                # read back current volume
-                try:
-                    current_volume = int(np.interp(volume_ctrl.GetMasterVolumeLevel(),
-                                                   [min_vol, max_vol], [0, 100]))
-                except Exception:
-                    current_volume = int(vol_percent)
-
-                # Draw volume bar
-                bar_x, bar_y = 40, 100
-                bar_width, bar_height = 25, 300
-                cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), (255, 255, 255), 2)
-                fill_height = int((current_volume / 100) * bar_height)
-                cv2.rectangle(frame, (bar_x, bar_y + bar_height - fill_height),
-                              (bar_x + bar_width, bar_y + bar_height), (0, 255, 0), -1)
-                cv2.putText(frame, f"{current_volume}%", (bar_x - 5, bar_y + bar_height + 35),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-
-        # Encode frame
-        ret, buffer = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), 90])
-        if not ret:
-            continue
-        frame_bytes = buffer.tobytes()
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-
-    # cleanup
+frame_latency_ms = 0.0
+fps, prev_frame_time = 0.0, time.time()
+# volume / distance / fps / gesture pushed to the dashboard over /events
+telemetry = TelemetryHub()
+# JPEG cost / size per (width, quality) variant that viewers asked for
+encode_stats = EncodeStats(on_record=record_encode)
+# one GesturePipeline per camera session (read, detect, smooth, request volume)
+pipeline = None
+
+# ----------------- CAPTURE THREAD -----------------
+def start_capture():
+    """Start the background reader that keeps only the newest camera frame"""
+    global cap, capture, capture_profiles, pipeline
+    if capture is not None and capture.running:
+        return capture
+    if cap is None or not cap.isOpened():
+        cap = open_camera()
+    capture = CaptureThread(cap, buffer_size=2)
+    if ADAPTIVE_CAPTURE:
+        # settings go through the capture thread, which applies them between reads
+        capture_profiles = AdaptiveCaptureController(capture, target_ms=CAPTURE_TARGET_MS,
+                                                     on_change=lambda event: print(format_event(event)))
+    capture.start()
+    # the capture thread stands in for the camera: every read is the newest frame
+    pipeline = GesturePipeline(capture, detector.get(), volume.get(), MIN_DIST, MAX_DIST, smoothing=SMOOTHING,
+                               live=True)
+    pipeline.attach(draw_and_publish)
+    return capture
+
+def stop_capture():
+    global capture, pipeline
+    pipeline = None
+    if detector.ready:
+        detector.get().reset()
+    if capture is not None:
+        capture.stop()
+        capture = None
     try:
-        cap.release()
+        if cap is not None:
+            cap.release()
     except Exception:
         pass
 
+# ----------------- FRAME PIPELINE -----------------
+def draw_and_publish(result):
+    """GesturePipeline listener: draw on the frame and update metrics / telemetry"""
+    global current_volume, frame_latency_ms, fps, prev_frame_time
+    frame = result.frame
+    detect_hist.observe(result.detect_ms)
+    frames_processed.inc()
+
+    gesture = "none"
+    if result.features is not None:
+        gesture = "hand"
+        frames_with_hand.inc()
+        # the pipeline has already written the smoothed landmarks back into the results
+        mp_drawing.draw_landmarks(frame, result.results.multi_hand_landmarks[0], mp_hands.HAND_CONNECTIONS)
+        thumb_x, thumb_y = result.features.xy(THUMB_TIP)
+        index_x, index_y = result.features.xy(INDEX_TIP)
+
+        cv2.circle(frame, (thumb_x, thumb_y), 8, (255, 0, 0), -1)
+        cv2.circle(frame, (index_x, index_y), 8, (0, 255, 0), -1)
+        cv2.line(frame, (thumb_x, thumb_y), (index_x, index_y), (0, 0, 255), 3)
+        # in 640-wide pixels, so MIN/MAX_DIST hold whatever profile the camera is on
+        cv2.putText(frame, f"Dist: {result.distance}px", (thumb_x, thumb_y - 25),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+
+        # what the unfiltered landmarks would have written, for comparison
+        raw_writes(distance_to_percent(reference_pixels(HandFeatures(result.raw_points, frame.shape).pinch,
+                                                        frame.shape), MIN_DIST, MAX_DIST))
+        filtered_writes(result.percent)
+        current_volume = int(pipeline.actuator.level)
+
+        # Draw volume bar
+        bar_x, bar_y = 40, 100
+        bar_width, bar_height = 25, 300
+        cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), (255, 255, 255), 2)
+        fill_height = int((current_volume / 100) * bar_height)
+        cv2.rectangle(frame, (bar_x, bar_y + bar_height - fill_height),
+                      (bar_x + bar_width, bar_y + bar_height), (0, 255, 0), -1)
+        cv2.putText(frame, f"{current_volume}%", (bar_x - 5, bar_y + bar_height + 35),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+
+    now = time.time()
+    frame_latency_ms = (now - pipeline.cap.captured_at) * 1000
+    latency_hist.observe(frame_latency_ms)
+    if capture_profiles is not None:
+        # frames are encoded after this returns, so add the recent encode cost; it grows with resolution too
+        capture_profiles.observe(frame_latency_ms + encode_stats.slowest_ms())
+    fps = 0.9 * fps + 0.1 * (1 / (now - prev_frame_time)) if (now - prev_frame_time) > 0 else fps
+    prev_frame_time = now
+    telemetry.publish(volume=int(pipeline.actuator.level), distance=result.distance, fps=int(fps), gesture=gesture)
+
+def process_next_frame():
+    """Detect and set the volume on the newest frame once for all viewers"""
+    active = pipeline
+    if active is None:
+        time.sleep(0.01)
+        return None
+    # always the freshest frame; older ones are dropped, not queued
+    result = active.step()
+    if result is None:
+        return None
+    # encoded lazily, once per (size, quality) that some viewer actually wants
+    return EncodedFrame(result.frame, encode_stats)
+
+# one producer runs the pipeline; every /video_feed request just subscribes to it
+broadcaster = FrameBroadcaster(process_next_frame, on_start=start_capture, on_stop=stop_capture)
+
+def generate_frames(subscription, width=None, quality=None):
+    try:
+        for encoded in subscription:
+            frame_bytes = encoded.jpeg(width, quality)
+            yield (b'--frame\r\n'
+                   b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+    finally:
+        # tab closed: drop this viewer only
+        subscription.close()
+
 # ----------------- ROUTES -----------------
 @app.route("/video_feed")
 def video_feed():
-    global camera_running
-    camera_running = True
-    return Response(generate_frames(), mimetype="multipart/x-mixed-replace; boundary=frame")
+    # e.g. /video_feed?w=320&q=60 for remote monitoring screens
+    client_id = request.args.get("client")
+    width = request.args.get("w", type=int)
+    quality = request.args.get("q", type=int)
+    try:
+        subscription = broadcaster.subscribe(client_id)
+    except ValueError as e:
+        # the id is how /stop_camera finds this stream, so a second stream can't share it
+        return jsonify(error=str(e)), 409
+    response = Response(generate_frames(subscription, width, quality),
+                        mimetype="multipart/x-mixed-replace; boundary=frame")
+    # assigned when no ?client= was given; also closes the subscription if the stream never starts
+    response.headers["X-Client-Id"] = subscription.client_id
+    response.call_on_close(subscription.close)
+    return response
 
 @app.route("/stop_camera")
 def stop_camera():
-    global camera_running
-    camera_running = False
-    return jsonify(status="Camera stopped")
+    # only detach this viewer; the camera stops once nobody is watching
+    client_id = request.args.get("client")
+    if client_id:
+        broadcaster.unsubscribe(client_id)
+    return jsonify(status="Camera stopped", viewers=broadcaster.subscriber_count)
 
 @app.route("/volume_data")
 def volume_data():
-    try:
-        sys_vol_db = volume_ctrl.GetMasterVolumeLevel()
-        sys_vol_percent = int(np.interp(sys_vol_db, [min_vol, max_vol], [0, 100]))
-    except Exception:
-        sys_vol_percent = current_volume
-    return jsonify(volume=sys_vol_percent, timestamp=time.time())
+    # cached by the actuator thread; never queries the audio device here
+    volume_actuator = volume.peek()
+    active = pipeline
+    sys_vol_percent = int(volume_actuator.level) if volume_actuator else current_volume
+    scheduler = detector.peek()
+    dropped = capture.buffer.dropped if capture is not None else 0
+    return jsonify(volume=sys_vol_percent, timestamp=time.time(),
+                   dropped_frames=dropped, latency_ms=round(frame_latency_ms, 1),
+                   viewers=broadcaster.subscriber_count, inference=scheduler.metrics() if scheduler else {},
+                   volume_writes=volume_actuator.writes if volume_actuator else 0,
+                   volume_coalesced=volume_actuator.coalesced if volume_actuator else 0,
+                   encoding=encode_stats.as_dict(),
+                   capture=capture_profiles.metrics() if capture_profiles is not None else {},
+                   smoothing={"enabled": SMOOTHING, "raw_writes_per_s": raw_writes.per_second,
+                              "filtered_writes_per_s": filtered_writes.per_second,
+                              "added_latency_ms": round(active.landmark_filter.lag_ms, 1)
+                              if SMOOTHING and active is not None else 0.0})
+
+@app.route("/metrics")
+def metrics_route():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+@app.route("/startup")
+def startup_report():
+    ready = {"hands": detector.ready, "volume": volume.ready, "camera": cap is not None}
+    return jsonify(dict(startup.as_dict(), ready=ready))
+
+@app.route("/events")
+def events():
+    # server-sent events; each client may ask for its own max update rate
+    rate = request.args.get("rate", default=20.0, type=float)
+    return Response(telemetry.stream(max_rate=rate), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @app.route("/")
 def index():
@@ -166,40 +327,44 @@ def index():
         <h2>✋ Hand Gesture Volume Control (Windows Synced)</h2>
         <div class="container">
             <div>
-                <img id="videoFeed" src="/video_feed">
+                <img id="videoFeed">
                 <br><button onclick="stopCamera()">🛑 Stop Camera</button>
             </div>
             <div>
                 <canvas id="volumeChart"></canvas>
+                <p id="stats">Distance: -- | FPS: -- | Gesture: --</p>
             </div>
         </div>
 
         <script>
+        const clientId = Math.random().toString(36).slice(2);
+        document.getElementById('videoFeed').src = '/video_feed?client=' + clientId;
+
         const ctx = document.getElementById('volumeChart').getContext('2d');
         const data = { labels: [], datasets: [{ label: 'System Volume %', data: [], borderColor: '#00ffcc', fill: true, backgroundColor: 'rgba(0,255,204,0.2)', tension: 0.4 } ]};
         const chart = new Chart(ctx, { type: 'line', data: data, options: { animation: { duration: 0 }, scales: { y: { min: 0, max: 100, ticks: { color: '#ccc' }}, x: { ticks: { color: '#ccc' }}}}});
 
-        async function updateChart() {
-            try {
-                const res = await fetch('/volume_data');
-                const v = await res.json();
-                const label = new Date(v.timestamp * 1000).toLocaleTimeString();
-                data.labels.push(label);
-                data.datasets[0].data.push(v.volume);
-                if (data.labels.length > 30) { data.labels.shift(); data.datasets[0].data.shift(); }
-                chart.update();
-            } catch (e) {
-                // ignore fetch errors
-            }
-        }
+        // pushed by the server whenever volume, distance, fps or gesture change
+        let lastVolume = null;
+        const events = new EventSource('/events?rate=20');
+        events.onmessage = (e) => {
+            const v = JSON.parse(e.data);
+            document.getElementById('stats').textContent =
+                `Distance: ${v.distance}px | FPS: ${v.fps} | Gesture: ${v.gesture}`;
+            if (v.volume === lastVolume) return;
+            lastVolume = v.volume;
+            const label = new Date(v.timestamp * 1000).toLocaleTimeString();
+            data.labels.push(label);
+            data.datasets[0].data.push(v.volume);
+            if (data.labels.length > 100) { data.labels.shift(); data.datasets[0].data.shift(); }
+            chart.update();
+        };
 
         async function stopCamera() {
-            await fetch('/stop_camera');
+            await fetch('/stop_camera?client=' + clientId);
             document.getElementById('videoFeed').src = '';
             alert("Camera stopped!");
         }
-
-        setInterval(updateChart, 200);
         </script>
     </body>
     </html>
@@ -216,5 +381,8 @@ def open_browser():
 
 if __name__ == "__main__":
     threading.Thread(target=open_browser, daemon=True).start()
+    if WARMUP:
+        # load the model and audio device while the browser opens
+        warm_up(detector, volume, report=startup, on_done=lambda: print(startup.format()))
     # run Flask
     app.run(host="0.0.0.0", port=5000, threaded=True)
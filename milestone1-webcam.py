@@ -1,8 +1,9 @@
 import cv2
 import mediapipe as mp
+from gesture_core.sources import open_source
 
 # ---- Webcam input ----
-webcam = cv2.VideoCapture(0)  # open default webcam
+webcam = open_source()  # default webcam, or GESTURE_SOURCE recording
 
 # ---- Hand detection model ----
 my_hands = mp.solutions.hands.Hands()
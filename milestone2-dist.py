@@ -1,14 +1,15 @@
 import cv2
 import mediapipe as mp
-import math
+from gesture_core.features import INDEX_TIP, THUMB_TIP, hand_features
+from gesture_core.sources import open_source
 
 # Initialize MediaPipe Hands
 mp_hands = mp.solutions.hands
 hands = mp_hands.Hands()
 mp_drawing = mp.solutions.drawing_utils
 
-# Webcam
-cap = cv2.VideoCapture(0)
+# Webcam (or the recording named by GESTURE_SOURCE)
+cap = open_source()
 
 while True:
     ret, frame = cap.read()
@@ -17,7 +18,6 @@ while True:
 
         # Flip for mirror effect
     frame = cv2.flip(frame, 1)
-    h, w, _ = frame.shape
 
     # Convert BGR to RGB for MediaPipe
     rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -29,11 +29,9 @@ while True:
                                       mp_hands.HAND_CONNECTIONS)
 
             # Get coordinates of Thumb tip (id=4) and Index tip (id=8)
-            thumb = hand_landmarks.landmark[4]
-            index = hand_landmarks.landmark[8]
-
-            x1, y1 = int(thumb.x * w), int(thumb.y * h)
-            x2, y2 = int(index.x * w), int(index.y * h)
+            features = hand_features(hand_landmarks, frame.shape)
+            x1, y1 = features.xy(THUMB_TIP)
+            x2, y2 = features.xy(INDEX_TIP)
 
             # Draw circles on thumb & index tip
             cv2.circle(frame, (x1, y1), 8, (0, 0, 255), -1)
@@ -43,7 +41,7 @@ while True:
             cv2.line(frame, (x1, y1), (x2, y2), (0, 255, 0), 3)
 
             # Calculate distance
-            dist = math.hypot(x2 - x1, y2 - y1)
+            dist = features.pinch
             cv2.putText(frame, f"Dist: {int(dist)}", (10, 40),
                         cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
 
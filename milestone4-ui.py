@@ -1,9 +1,16 @@
 import cv2
 import mediapipe as mp
-import pyautogui
 import streamlit as st
-import numpy as np
+import os
 import time
+from gesture_core.classifier import app_classifier
+from gesture_core.features import INDEX_TIP, THUMB_TIP
+from gesture_core.metrics import MetricsRegistry
+from gesture_core.overlay import draw_volume_bar
+from gesture_core.pipeline import GesturePipeline, register_metrics
+from gesture_core.profiles import AdaptiveCaptureController, format_event
+from gesture_core.sources import open_source
+from gesture_core.volume import KeyStepBackend, VolumeActuator
 
 # ---------------- Streamlit Config ----------------
 st.set_page_config(page_title="Gesture Volume Control", layout="wide")
@@ -63,72 +70,39 @@ VALID_USERS = {"siri": "password123", "admin": "admin123"}
 
 # ---------------- Session State ----------------
 for key, default in {
-    "logged_in": False, "username": "", "cap": None,
-    "running": False, "last_volume_action": 0.0
+    "logged_in": False, "username": "", "cap": None, "capture_profiles": None,
+    "running": False, "key_actuator": None
 }.items():
     if key not in st.session_state:
         st.session_state[key] = default
 
+if "classifier" not in st.session_state:
+    # finger counting until GESTURE_TEMPLATES names a file saved by `python -m gesture_core.classifier`
+    st.session_state.classifier = app_classifier(os.environ.get("GESTURE_TEMPLATES"), rule="fingers")
+
+GESTURE_LABELS = {"open": "🖐️ Open", "closed": "✊ Closed", "pinched": "🤏 Pinched"}
+
 # ---------------- Utility Functions ----------------
-def get_hand_state(hand_landmarks, img_shape):
-    h, w, _ = img_shape
-    tips_ids = [8, 12, 16, 20]  # Index, Middle, Ring, Pinky
-    pip_ids = [6, 10, 14, 18]   # Their lower joints
-    open_count = 0
-
-    # Count fingers that are open
-    for tip, pip in zip(tips_ids, pip_ids):
-        if hand_landmarks.landmark[tip].y * h < hand_landmarks.landmark[pip].y * h:
-            open_count += 1
-
-    # Check thumb position
-    thumb_tip_x = hand_landmarks.landmark[4].x * w
-    thumb_ip_x = hand_landmarks.landmark[3].x * w
-    if thumb_tip_x > thumb_ip_x:
-        open_count += 1
-
-    if open_count >= 5:
-        return "🖐️ Open"
-    elif open_count <= 1:
-        return "✊ Closed"
-    else:
-        return "🤏 Pinched"
-
-def draw_volume_bar_on_frame(frame, pct):
-    h, w, _ = frame.shape
-    bar_h = int((pct / 100.0) * (h - 40))
-    x1, x2 = w - 40, w - 20
-    y2, y1 = h - 20, h - 20 - bar_h
-    cv2.rectangle(frame, (x1, 20), (x2, y2), (50, 50, 50), 2)
-    cv2.rectangle(frame, (x1 + 2, y1 + 2), (x2 - 2, y2 - 2), (0, 255, 128), -1)
-    cv2.putText(frame, f"{int(pct)}%", (x1 - 60, y1 + 15),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-    return frame
+def get_hand_state(features, img_shape):
+    # open fingers, or nearest templates on wrist-relative, palm-scaled landmarks with GESTURE_TEMPLATES
+    gesture = st.session_state.classifier.classify_one(features.points, img_shape)
+    return GESTURE_LABELS.get(gesture, gesture.title())
 
 def open_camera():
-    cap = cv2.VideoCapture(0)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    cap = open_source()
     if cap.isOpened():
         st.session_state.cap = cap
+        # resolution / FPS step down the ladder when the loop gets slower than CAPTURE_TARGET_MS
+        st.session_state.capture_profiles = AdaptiveCaptureController(
+            cap, target_ms=CAPTURE_TARGET_MS, on_change=lambda event: print(format_event(event)))
         return True
     return False
 
-def maybe_send_volume_action(dist, min_dist, max_dist):
-    now = time.time()
-    if dist < min_dist:
-        action = "volumedown"
-    elif dist > max_dist:
-        action = "volumeup"
-    else:
-        action = None
-
-    if action and (now - st.session_state.last_volume_action) > 0.12:
-        try:
-            pyautogui.press(action)
-        except:
-            pass
-        st.session_state.last_volume_action = now
+def key_actuator():
+    # key presses (and pyautogui's pause) happen on the actuator thread, not in the camera loop
+    if st.session_state.key_actuator is None:
+        st.session_state.key_actuator = VolumeActuator(KeyStepBackend(step=2.0), min_change=2.0).start()
+    return st.session_state.key_actuator
 
 def do_login(username, password):
     if username in VALID_USERS and VALID_USERS[username] == password:
@@ -145,6 +119,9 @@ def do_logout():
     if st.session_state.cap:
         st.session_state.cap.release()
     st.session_state.cap = None
+    if st.session_state.key_actuator is not None:
+        st.session_state.key_actuator.stop()
+        st.session_state.key_actuator = None
 
 # ---------------- Login Page ----------------
 if not st.session_state.logged_in:
@@ -176,6 +153,10 @@ info_box = info_col.empty()
 mp_hands = mp.solutions.hands
 mp_draw = mp.solutions.drawing_utils
 MIN_DIST, MAX_DIST = 25, 160
+# p90 per-frame time (flip to volume request, drawing excluded) the capture profile ladder aims for
+CAPTURE_TARGET_MS = 33
+# same metrics file as the final project, rewritten every 5 s while the camera runs
+METRICS_SNAPSHOT = os.environ.get("GESTURE_METRICS_SNAPSHOT", "metrics_snapshot.json")
 
 # Start Camera
 if start_btn:
@@ -193,59 +174,62 @@ if stop_btn:
     info_box.markdown("<div class='status-box'>Camera stopped. Click <b>🎥 Start Camera</b> to resume.</div>", unsafe_allow_html=True)
 
 # ---------------- Camera Loop ----------------
+def show_frame(result):
+    # GesturePipeline has read, detected and requested the volume; this only draws
+    frame = result.frame
+    dist, pct = result.distance, result.percent or 0
+    status = "🎚 Stable"
+    hand_state = "—"
+
+    if result.features is not None:
+        mp_draw.draw_landmarks(frame, result.results.multi_hand_landmarks[0], mp_hands.HAND_CONNECTIONS)
+        (tx, ty), (ix, iy) = result.features.xy(THUMB_TIP), result.features.xy(INDEX_TIP)
+        cv2.line(frame, (tx, ty), (ix, iy), (0, 255, 255), 2)
+
+        # where the key actuator is still heading: the hand's target vs the level it has reached
+        delta = pct - pipeline.actuator.level
+        if delta < -pipeline.actuator.min_change:
+            status = "🔉 Decreasing"
+        elif delta > pipeline.actuator.min_change:
+            status = "🔊 Increasing"
+
+        hand_state = get_hand_state(result.features, frame.shape)
+
+        cv2.putText(frame, f"{dist}px", (min(tx, ix) + 6, min(ty, iy) - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+
+    frame = draw_volume_bar(frame, pct)
+    now = time.time()
+    fps = loop_clock["fps"]
+    fps = 0.9 * fps + 0.1 * (1 / (now - loop_clock["prev"])) if (now - loop_clock["prev"]) > 0 else fps
+    loop_clock.update(prev=now, fps=fps)
+
+    video_placeholder.image(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), use_container_width=True)
+    info_box.markdown(f"""
+    <div class='status-box'>
+    <span class='metric-label'>Distance:</span> <span class='metric-value'>{dist}px</span><br>
+    <span class='metric-label'>Volume:</span> <span class='metric-value'>{int(pct)}%</span><br>
+    <span class='metric-label'>Status:</span> <span class='metric-value'>{status}</span><br>
+    <span class='metric-label'>Hand Gesture:</span> <span class='metric-value'>{hand_state}</span><br>
+    <span class='metric-label'>FPS:</span> <span class='metric-value'>{int(fps)}</span>
+    </div>
+    """, unsafe_allow_html=True)
+
+
 if st.session_state.running and st.session_state.cap:
     cap = st.session_state.cap
     with mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.6, min_tracking_confidence=0.5) as hands:
-        prev_time, fps = time.time(), 0.0
+        # raw landmarks as before (no smoothing); the actuator's 2% step is the only dead band
+        pipeline = GesturePipeline(cap, hands, key_actuator(), MIN_DIST, MAX_DIST, smoothing=False,
+                                   capture_controller=st.session_state.capture_profiles)
+        metrics = MetricsRegistry()
+        pipeline.attach(register_metrics(pipeline, metrics))
+        metrics.counter("volume_writes_total", "Volume key presses sent",
+                        fn=lambda: pipeline.actuator.backend.gesture_presses)
+        pipeline.attach(show_frame)
+        loop_clock = {"prev": time.time(), "fps": 0.0}
         while st.session_state.running:
-            ok, frame = cap.read()
-            if not ok:
+            if pipeline.step() is None:
                 info_box.markdown("<div class='status-box'>⚠️ Waiting for camera feed...</div>", unsafe_allow_html=True)
                 time.sleep(0.1)
-                continue
-
-            frame = cv2.flip(frame, 1)
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = hands.process(rgb)
-
-            dist, pct = 0, 0
-            status = "🎚 Stable"
-            hand_state = "—"
-
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                    thumb = hand_landmarks.landmark[mp_hands.HandLandmark.THUMB_TIP]
-                    index = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
-                    h, w, _ = frame.shape
-                    tx, ty, ix, iy = int(thumb.x * w), int(thumb.y * h), int(index.x * w), int(index.y * h)
-                    cv2.line(frame, (tx, ty), (ix, iy), (0, 255, 255), 2)
-                    dist = int(np.hypot(ix - tx, iy - ty))
-                    pct = np.clip((dist - MIN_DIST) / (MAX_DIST - MIN_DIST) * 100, 0, 100)
-                    maybe_send_volume_action(dist, MIN_DIST, MAX_DIST)
-
-                    if dist < MIN_DIST:
-                        status = "🔉 Decreasing"
-                    elif dist > MAX_DIST:
-                        status = "🔊 Increasing"
-
-                    hand_state = get_hand_state(hand_landmarks, frame.shape)
-
-                    cv2.putText(frame, f"{dist}px", (min(tx, ix) + 6, min(ty, iy) - 10),
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-
-            frame = draw_volume_bar_on_frame(frame, pct)
-            now = time.time()
-            fps = 0.9 * fps + 0.1 * (1 / (now - prev_time)) if (now - prev_time) > 0 else fps
-            prev_time = now
-
-            video_placeholder.image(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), use_container_width=True)
-            info_box.markdown(f"""
-            <div class='status-box'>
-            <span class='metric-label'>Distance:</span> <span class='metric-value'>{dist}px</span><br>
-            <span class='metric-label'>Volume:</span> <span class='metric-value'>{int(pct)}%</span><br>
-            <span class='metric-label'>Status:</span> <span class='metric-value'>{status}</span><br>
-            <span class='metric-label'>Hand Gesture:</span> <span class='metric-value'>{hand_state}</span><br>
-            <span class='metric-label'>FPS:</span> <span class='metric-value'>{int(fps)}</span>
-            </div>
-            """, unsafe_allow_html=True)
+            metrics.maybe_write_snapshot(METRICS_SNAPSHOT, interval=5.0)
@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from gesture_core.broadcast import AUTO_ID_PREFIX, FrameBroadcaster
+
+
+def make_broadcaster():
+    def produce():
+        time.sleep(0.001)
+        return b"frame"
+    return FrameBroadcaster(produce)
+
+
+def test_duplicate_client_id_is_rejected():
+    broadcaster = make_broadcaster()
+    try:
+        sub = broadcaster.subscribe("tab-1")
+        with pytest.raises(ValueError):
+            broadcaster.subscribe("tab-1")
+        assert broadcaster.subscriber_count == 1
+        # the id still stops the original stream
+        assert broadcaster.unsubscribe("tab-1") and sub.closed
+        # and is free again afterwards
+        assert broadcaster.subscribe("tab-1").client_id == "tab-1"
+    finally:
+        broadcaster.stop_all()
+
+
+def test_assigned_ids_are_unique_and_usable():
+    broadcaster = make_broadcaster()
+    try:
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+        assert first.client_id != second.client_id
+        assert broadcaster.unsubscribe(second.client_id)
+        assert broadcaster.subscriber_count == 1 and not first.closed
+    finally:
+        broadcaster.stop_all()
+
+
+def test_assigned_ids_cannot_be_claimed_by_callers():
+    broadcaster = make_broadcaster()
+    try:
+        auto = broadcaster.subscribe()
+        with pytest.raises(ValueError):
+            broadcaster.subscribe(auto.client_id)
+        with pytest.raises(ValueError):
+            broadcaster.subscribe(AUTO_ID_PREFIX + "99")
+        assert broadcaster.subscribe("client-1").client_id == "client-1"
+    finally:
+        broadcaster.stop_all()
+
+
+def test_producer_error_ends_the_streams_and_runs_on_stop():
+    stopped = threading.Event()
+
+    def produce():
+        raise RuntimeError("camera gone")
+    broadcaster = FrameBroadcaster(produce, on_stop=stopped.set)
+    sub = broadcaster.subscribe("tab-1", timeout=0.05)
+    assert list(sub) == []
+    assert stopped.wait(1.0)
+    assert isinstance(broadcaster.last_error, RuntimeError) and broadcaster.subscriber_count == 0
+    assert not broadcaster.running
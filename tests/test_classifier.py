@@ -0,0 +1,42 @@
+import numpy as np
+
+from gesture_core.classifier import (GestureClassifier, HeuristicClassifier, app_classifier, default_classifier,
+                                     threshold_rule)
+from gesture_core.synthetic import GESTURES, synthetic_hands
+
+
+def test_classify_one_names_each_gesture():
+    clf = default_classifier()
+    points, labels = synthetic_hands(30, seed=7)
+    for pts, label in zip(points, labels):
+        assert clf.classify_one(pts) == GESTURES[label]
+
+
+def test_centroid_and_knn_agree():
+    points, _ = synthetic_hands(600, seed=3, noise=0.05)
+    knn, centroid = default_classifier("knn"), default_classifier("centroid")
+    assert (knn.classify(points) == centroid.classify(points)).mean() > 0.95
+
+
+def test_saved_templates_load_back(tmp_path):
+    clf = default_classifier(n=90)
+    path = str(tmp_path / "templates.npz")
+    clf.save(path)
+    loaded = GestureClassifier.load(path)
+    assert loaded.classes == clf.classes and loaded.img_shape == clf.img_shape and len(loaded) == 90
+    points, _ = synthetic_hands(50, seed=5)
+    assert (loaded.classify(points) == clf.classify(points)).all()
+
+
+def test_apps_keep_the_heuristic_without_templates(tmp_path):
+    assert isinstance(app_classifier(), HeuristicClassifier)
+    assert app_classifier(rule="fingers").rule == "fingers"
+    path = str(tmp_path / "templates.npz")
+    default_classifier(n=30).save(path)
+    assert isinstance(app_classifier(path), GestureClassifier)
+
+
+def test_threshold_rule_is_resolution_independent():
+    points, _ = synthetic_hands(200, seed=2)
+    assert (threshold_rule(points, (480, 640)) == threshold_rule(points, (960, 1280))).all()
+    assert HeuristicClassifier().classify_one(points[0]) in GESTURES
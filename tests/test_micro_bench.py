@@ -0,0 +1,37 @@
+from benchmarks.micro_bench import compare
+
+
+def result(name, relative, noise=0.02, peak=1000):
+    return {"name": name, "ops_per_s": relative * 1000, "relative": relative, "noise": noise, "peak_bytes": peak}
+
+
+def test_slowdown_within_threshold_and_noise_passes():
+    baseline = {"results": [result("a", 1.0), result("b", 1.0, noise=0.1)]}
+    # b is 25% slower, but its noise allows 3 * hypot(0.1, 0.1) = 42%
+    assert compare([result("a", 0.9), result("b", 0.75, noise=0.1)], baseline, 0.15) == []
+
+
+def test_slowdown_beyond_threshold_is_a_regression():
+    baseline = {"results": [result("a", 1.0)]}
+    regressions = compare([result("a", 0.5)], baseline, 0.15)
+    assert len(regressions) == 1 and regressions[0].startswith("a:")
+
+
+def test_machine_wide_slowdown_is_judged_on_relative_speed():
+    baseline = {"results": [result("a", 1.0)]}
+    slower_machine = dict(result("a", 1.0), ops_per_s=500.0)
+    assert compare([slower_machine], baseline, 0.15) == []
+
+
+def test_case_skipped_now_but_in_the_baseline_is_reported():
+    baseline = {"results": [result("chart", 1.0), {"name": "other", "skipped": "missing dependency: plotly"}]}
+    results = [{"name": "chart", "skipped": "missing dependency: plotly"},
+               {"name": "other", "skipped": "missing dependency: plotly"}]
+    regressions = compare(results, baseline, 0.15)
+    assert regressions == ["chart: measured in the baseline, missing dependency: plotly now"]
+
+
+def test_peak_allocation_growth_is_a_regression():
+    baseline = {"results": [result("a", 1.0, peak=10000)]}
+    assert compare([result("a", 1.0, peak=20000)], baseline, 0.15)
+    assert compare([result("a", 1.0, peak=10500)], baseline, 0.15) == []
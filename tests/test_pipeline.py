@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from gesture_core.pipeline import GesturePipeline, register_metrics
+from gesture_core.sources import ImageSequenceCapture, LoopingCapture, SimulatedCamera, is_live
+
+
+class NoHands:
+    def process(self, rgb):
+        return SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+
+
+class FlakyCamera(SimulatedCamera):
+    """A webcam whose reads fail at the given read numbers, like a USB hiccup."""
+
+    def __init__(self, fail_at, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_at = set(fail_at)
+        self.reads = 0
+
+    def read(self):
+        self.reads += 1
+        if self.reads in self.fail_at:
+            return False, None
+        return super().read()
+
+
+def test_live_source_survives_failed_reads():
+    cam = FlakyCamera(fail_at=(2, 3, 7))
+    pipeline = GesturePipeline(cam, NoHands(), retry_delay=0)
+    assert pipeline.live
+    stats = pipeline.run(max_frames=10)
+    assert stats["frames"] == 10
+    assert stats["read_failures"] == 3
+
+
+def test_finite_source_ends_the_run():
+    pipeline = GesturePipeline(SimulatedCamera(frames=4), NoHands(), retry_delay=0)
+    assert not pipeline.live
+    stats = pipeline.run()
+    assert stats["frames"] == 4
+    assert stats["read_failures"] == 0
+
+
+def test_is_live(tmp_path):
+    path = str(tmp_path / "f.png")
+    cv2.imwrite(path, np.zeros((8, 8, 3), np.uint8))
+    assert not is_live(ImageSequenceCapture([path]))
+    assert is_live(ImageSequenceCapture([path], loop=True))
+    assert is_live(LoopingCapture(cv2.VideoCapture(str(tmp_path / "missing.mp4"))))
+    assert is_live(SimulatedCamera())
+
+
+class CountingDetector(NoHands):
+    def __init__(self):
+        self.done = 0
+        self.closed = False
+
+    def frame_done(self):
+        self.done += 1
+
+    def close(self):
+        self.closed = True
+
+
+def test_detector_hears_about_every_finished_frame():
+    detector = CountingDetector()
+    pipeline = GesturePipeline(SimulatedCamera(frames=3), detector, retry_delay=0)
+    pipeline.attach(lambda result: None)
+    pipeline.run()
+    assert detector.done == 3
+
+
+def test_close_reaches_the_innermost_detector():
+    from gesture_core.motion import MotionGate
+    from gesture_core.scheduler import InferenceScheduler
+    detector = CountingDetector()
+    pipeline = GesturePipeline(SimulatedCamera(frames=1), MotionGate(InferenceScheduler(detector)))
+    pipeline.close()
+    assert detector.closed
+
+
+def test_capture_thread_stands_in_for_the_camera():
+    from gesture_core.capture import CaptureThread
+    capture = CaptureThread(SimulatedCamera()).start()
+    try:
+        pipeline = GesturePipeline(capture, NoHands(), live=True, retry_delay=0)
+        stats = pipeline.run(max_frames=3)
+        assert stats["frames"] == 3 and capture.captured_at is not None
+    finally:
+        capture.release()
+
+
+def test_registered_metrics_follow_the_pipeline():
+    from gesture_core.metrics import MetricsRegistry
+    pipeline = GesturePipeline(FlakyCamera(fail_at=(2,)), NoHands(), retry_delay=0)
+    registry = MetricsRegistry()
+    pipeline.attach(register_metrics(pipeline, registry))
+    pipeline.run(max_frames=4)
+    snapshot = registry.snapshot()
+    assert snapshot["gesture_frames_processed_total"] == 4
+    assert snapshot["gesture_read_failures_total"] == 1
+    assert snapshot["gesture_detect_ms"]["count"] == 4
@@ -0,0 +1,129 @@
+import numpy as np
+
+from gesture_core.classifier import GestureClassifier
+from gesture_core.encoding import EncodeStats
+from gesture_core.features import HandFeatures, reference_pixels
+from gesture_core.pipeline import distance_to_percent
+from gesture_core.profiles import DEFAULT_LADDER, AdaptiveCaptureController
+from gesture_core.sources import SimulatedCamera
+from gesture_core.synthetic import synthetic_hands
+
+
+class Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def make_controller(**kwargs):
+    cam, clock = SimulatedCamera(), Clock()
+    events = []
+    kwargs.setdefault("window", 5)
+    controller = AdaptiveCaptureController(cam, target_ms=33.0, cooldown=2.0, on_change=events.append,
+                                           clock=clock, **kwargs)
+    return cam, clock, controller, events
+
+
+def feed(controller, latency_ms, frames):
+    changes = [controller.observe(latency_ms) for _ in range(frames)]
+    return [event for event in changes if event is not None]
+
+
+def test_start_profile_is_applied_to_the_camera():
+    cam, _, controller, events = make_controller()
+    assert controller.profile is DEFAULT_LADDER[2]
+    assert (cam.width, cam.height, cam.fps) == (640, 480, 30)
+    assert events[0]["reason"] == "start" and events[0]["from"] is None
+    ok, frame = cam.read()
+    assert ok and frame.shape == (480, 640, 3)
+
+
+def test_steps_down_under_load_and_waits_for_the_cooldown():
+    cam, clock, controller, events = make_controller()
+    clock.t = 3.0
+    changed = feed(controller, 50.0, 5)
+    assert [(e["from"], e["to"], e["reason"]) for e in changed] == [("640x480@30", "640x480@15", "over_target")]
+    assert changed[0]["p90_ms"] == 50.0 and changed[0]["accepted"]
+    assert (cam.width, cam.height, cam.fps) == (640, 480, 15)
+
+    # still over target, but within the cooldown: no change
+    clock.t = 4.0
+    assert feed(controller, 50.0, 5) == []
+
+    clock.t = 5.5
+    changed = feed(controller, 50.0, 5)
+    assert [e["to"] for e in changed] == ["424x240@15"]
+    assert cam.read()[1].shape == (240, 424, 3)
+    assert len(events) == 3
+
+
+def test_never_steps_below_the_last_rung():
+    _, clock, controller, _ = make_controller(start=len(DEFAULT_LADDER) - 1)
+    clock.t = 10.0
+    assert feed(controller, 500.0, 20) == []
+    assert controller.profile is DEFAULT_LADDER[-1]
+
+
+def test_steps_up_only_after_several_windows_of_headroom():
+    cam, clock, controller, _ = make_controller(up_after=3)
+    clock.t = 3.0
+    assert feed(controller, 10.0, 10) == []  # two quiet windows
+    # a window between headroom and target restarts the count
+    assert feed(controller, 25.0, 5) == []
+    assert feed(controller, 10.0, 10) == []
+    changed = feed(controller, 10.0, 5)
+    assert [(e["to"], e["reason"]) for e in changed] == [("960x540@30", "headroom")]
+    assert cam.read()[1].shape == (540, 960, 3)
+
+
+def test_replay_holds_the_target_through_a_load_spike():
+    cam, clock, controller, events = make_controller(window=30)
+    over = []
+    while clock.t < 60.0:
+        ok, frame = cam.read()
+        load = 2.5 if 20.0 <= clock.t < 40.0 else 1.0
+        latency = (6.0 + 25.0 * frame.shape[0] * frame.shape[1] / 1e6) * load
+        clock.t += max(1 / cam.fps, latency / 1000)
+        controller.observe(latency)
+        if 32.0 < clock.t < 40.0:
+            over.append(latency > 33.0)
+    reasons = [e["reason"] for e in events]
+    assert "over_target" in reasons and reasons.index("over_target") < len(reasons) - 1
+    assert reasons[-1] == "headroom"
+    # once the controller settled, the spike no longer pushes frames over target
+    assert not any(over)
+
+
+def test_pinch_maps_to_the_same_volume_at_every_rung():
+    points, _ = synthetic_hands(1, seed=4)
+    percents = set()
+    for profile in DEFAULT_LADDER:
+        shape = (profile.height, profile.width)
+        pinch = HandFeatures(points[0], shape).pinch
+        percents.add(round(distance_to_percent(reference_pixels(pinch, shape)), 1))
+    # same field of view, same hand: only rounding differences between 4:3 and 16:9
+    assert max(percents) - min(percents) < 1.0
+
+
+def test_classifier_uses_the_frame_shape_of_the_hand():
+    classifier = GestureClassifier(img_shape=(480, 640))
+    points, labels = synthetic_hands(300, seed=0)
+    classifier.add_templates(points, labels)
+    # the same hands seen on a 16:9 frame: normalized x shrinks by 4:3 / 16:9
+    test, test_labels = synthetic_hands(200, seed=1)
+    wide = test.copy()
+    wide[..., 0] = 0.5 + (wide[..., 0] - 0.5) * (640 / 480) / (1280 / 720)
+    assert classifier.accuracy(test, test_labels) > 0.95
+    assert np.mean(classifier.classify(wide, (720, 1280)) == test_labels) > 0.95
+
+
+def test_slowest_encode_only_counts_variants_still_watched():
+    stats = EncodeStats(active_for=60)
+    assert stats.slowest_ms() == 0.0
+    stats.record((None, 90), 8.0, 1000)
+    stats.record((320, 60), 2.0, 300)
+    assert stats.slowest_ms() == 8.0
+    stats.active_for = -1
+    assert stats.slowest_ms() == 0.0
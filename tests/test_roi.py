@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from gesture_core.roi import RoiHandTracker
+
+
+class FakeHands:
+    """Finds one hand whose landmarks fill the middle of whatever image it gets."""
+
+    def __init__(self):
+        self.shapes = []
+        self.closed = False
+
+    def process(self, rgb):
+        self.shapes.append(rgb.shape[:2])
+        xs = np.linspace(0.4, 0.6, 21)
+        landmarks = [SimpleNamespace(x=float(x), y=float(x), z=0.0) for x in xs]
+        handedness = SimpleNamespace(classification=[SimpleNamespace(label="Right", score=0.9)])
+        return SimpleNamespace(multi_hand_landmarks=[SimpleNamespace(landmark=landmarks)],
+                               multi_handedness=[handedness])
+
+    def close(self):
+        self.closed = True
+
+
+def test_crops_and_full_frames_use_separate_detectors():
+    full, crop = FakeHands(), FakeHands()
+    tracker = RoiHandTracker(full, crop, min_size=32)
+    frame = np.zeros((480, 640, 3), np.uint8)
+    for _ in range(4):
+        tracker.process(frame)
+    assert full.shapes == [(480, 640)]
+    assert len(crop.shapes) == 3 and all(shape != (480, 640) for shape in crop.shapes)
+    assert tracker.metrics()["roi_ratio"] == 0.75
+
+
+def test_crop_landmarks_come_back_in_frame_coordinates():
+    tracker = RoiHandTracker(FakeHands(), FakeHands(), min_size=32)
+    frame = np.zeros((480, 640, 3), np.uint8)
+    tracker.process(frame)
+    x0, y0, x1, y1 = tracker.roi
+    result = tracker.process(frame)
+    lm = result.multi_hand_landmarks[0].landmark[0]
+    assert abs(lm.x - (x0 + 0.4 * (x1 - x0)) / 640) < 1e-6
+    assert abs(lm.y - (y0 + 0.4 * (y1 - y0)) / 480) < 1e-6
+
+
+def test_close_leaves_a_passed_in_crop_detector_open():
+    crop = FakeHands()
+    with RoiHandTracker(FakeHands(), crop):
+        pass
+    assert not crop.closed
+
+
+def test_close_passes_through_to_hands_and_an_owned_crop_detector(monkeypatch):
+    import gesture_core.roi as roi
+    crop = FakeHands()
+    monkeypatch.setattr(roi, "crop_detector", lambda min_confidence: crop)
+    hands = FakeHands()
+    RoiHandTracker(hands).close()
+    assert hands.closed and crop.closed
@@ -0,0 +1,31 @@
+import time
+
+from gesture_core.startup import LazyResource, StartupReport, warm_up
+
+
+def slow(value, seconds=0.01):
+    def factory():
+        time.sleep(seconds)
+        return value
+    return factory
+
+
+def test_warm_up_records_into_the_report():
+    report = StartupReport()
+    timed = LazyResource("camera", slow("cam"), report)
+    untimed = LazyResource("volume", slow("vol"))
+    warm_up(timed, untimed, report=report).join(1.0)
+    assert timed.peek() == "cam" and untimed.peek() == "vol"
+    assert set(report.inits) == {"camera", "volume", "warm-up"}
+    assert report.inits["warm-up"] >= report.inits["camera"] + report.inits["volume"] - 0.2
+
+
+def test_failed_resource_does_not_stop_the_warm_up():
+    def broken():
+        raise RuntimeError("no device")
+
+    report, done = StartupReport(), []
+    ok = LazyResource("hands", slow("hands"))
+    warm_up(LazyResource("volume", broken), ok, report=report, on_done=lambda: done.append(True)).join(1.0)
+    assert ok.ready and done == [True]
+    assert "volume" in report.inits and "warm-up" in report.inits
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from gesture_core.synthetic import synthetic_hands
+from gesture_core.tracking import DualHandControl, HandTracker
+
+SHAPE = (480, 640)
+
+
+def results(*hands):
+    """MediaPipe-style results from (points, label) pairs."""
+    landmarks = [SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in points.tolist()])
+                 for points, _ in hands]
+    handedness = [SimpleNamespace(classification=[SimpleNamespace(label=label, score=0.95)]) for _, label in hands]
+    return SimpleNamespace(multi_hand_landmarks=landmarks or None, multi_handedness=handedness or None)
+
+
+def hand(label, gesture, x):
+    """A synthetic hand (0 open, 2 pinched) centred at normalized x."""
+    points, labels = synthetic_hands(60, seed=3)
+    pts = points[list(labels).index(gesture)].copy()
+    pts[:, 0] += x - pts[:, 0].mean()
+    return pts.astype(np.float32), label
+
+
+def step(tracker, control, *hands):
+    visible = tracker.update(results(*hands))
+    return control.update(visible, SHAPE, tracker.tracks)
+
+
+def test_a_missed_frame_keeps_the_pinch_and_does_not_toggle_again():
+    tracker, control = HandTracker(smoothing=False), DualHandControl()
+    left, right = hand("Left", 0, 0.3), hand("Right", 2, 0.7)
+    out = step(tracker, control, left, right)
+    assert out["muted"] and control.toggles == 1
+
+    # the right hand drops out for one frame while still pinching
+    out = step(tracker, control, left)
+    assert sorted(out["roles"].values()) == ["volume"]
+    out = step(tracker, control, left, right)
+    assert control.toggles == 1 and out["muted"]
+    assert sorted(out["roles"].values()) == ["mute", "volume"]
+
+    # releasing and pinching again is a real toggle
+    step(tracker, control, left, hand("Right", 0, 0.7))
+    out = step(tracker, control, left, right)
+    assert control.toggles == 2 and not out["muted"]
+
+
+def test_state_is_dropped_once_the_track_is_gone():
+    tracker, control = HandTracker(smoothing=False, max_missed=2), DualHandControl()
+    right = hand("Right", 2, 0.7)
+    step(tracker, control, right)
+    for _ in range(3):
+        step(tracker, control)
+    assert tracker.tracks == [] and control._assigned == {} and control._pinched == {}
+    # a new hand pinching is a new toggle
+    step(tracker, control, right)
+    assert control.toggles == 2
@@ -0,0 +1,96 @@
+import time
+
+from gesture_core.volume import KeyStepBackend, MemoryBackend, VolumeActuator
+
+
+class FakeKeys:
+    """Records every send_keys(key, presses) call instead of pressing anything."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, key, presses=1):
+        self.calls.append((key, presses))
+
+
+def synced_backend(level=50.0):
+    keys = FakeKeys()
+    backend = KeyStepBackend(send_keys=keys, step=2.0, level=level)
+    backend.sync()
+    keys.calls.clear()
+    return backend, keys
+
+
+def test_sync_goes_to_zero_then_back_to_the_start_level():
+    keys = FakeKeys()
+    backend = KeyStepBackend(send_keys=keys, step=2.0, level=50.0)
+    assert backend.get_mute() is None
+    backend.sync()
+    assert keys.calls == [("volumedown", 50), ("volumeup", 25)]
+    assert backend.level == 50.0 and backend.get_mute() is False
+
+
+def test_sync_to_zero_still_unmutes():
+    keys = FakeKeys()
+    backend = KeyStepBackend(send_keys=keys, step=2.0, level=0.0)
+    backend.sync()
+    assert keys.calls == [("volumedown", 50), ("volumeup", 1), ("volumedown", 1)]
+    assert backend.level == 0.0 and backend.presses == 52
+
+
+def test_set_percent_sends_one_batch_in_the_right_direction():
+    backend, keys = synced_backend()
+    backend.set_percent(60)
+    backend.set_percent(40)
+    backend.set_percent(40.5)  # under half a step: nothing to press
+    assert keys.calls == [("volumeup", 5), ("volumedown", 10)]
+    assert backend.level == 40.0
+
+
+def test_level_estimate_is_clamped_at_the_ends():
+    backend, keys = synced_backend(level=96.0)
+    backend.set_percent(100)
+    backend.set_percent(100)
+    assert keys.calls == [("volumeup", 2)]
+    assert backend.level == 100.0
+
+
+def test_mute_key_is_only_pressed_on_a_change():
+    backend, keys = synced_backend()
+    backend.set_mute(True)
+    backend.set_mute(True)
+    backend.set_mute(False)
+    assert keys.calls == [("volumemute", 1), ("volumemute", 1)]
+
+
+def test_actuator_syncs_before_the_first_request():
+    keys = FakeKeys()
+    actuator = VolumeActuator(KeyStepBackend(send_keys=keys, step=2.0), min_change=2.0).start()
+    try:
+        actuator.request(80)
+        deadline = time.monotonic() + 1.0
+        while actuator.writes < 1 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert actuator.synced.is_set() and actuator.muted is False
+    finally:
+        actuator.stop()
+    assert keys.calls == [("volumedown", 50), ("volumeup", 25), ("volumeup", 15)]
+
+
+def test_actuator_reads_mute_from_backends_that_can():
+    backend = MemoryBackend()
+    backend.muted = True
+    actuator = VolumeActuator(backend).start()
+    try:
+        assert actuator.synced.wait(1.0)
+        assert actuator.muted is True
+    finally:
+        actuator.stop()
+
+
+def test_gesture_presses_leave_out_the_sync():
+    backend = KeyStepBackend(send_keys=FakeKeys(), step=2.0, level=50.0)
+    backend.sync()
+    backend.set_percent(60)
+    backend.set_mute(True)
+    assert backend.presses == 75 + 6 and backend.gesture_presses == 6